@@ -5,6 +5,14 @@ Validator for PowerPoint presentation XML files against XSD schemas.
 import re
 
 from .base import BaseSchemaValidator
+from .rules import (
+    ContentTypeRule,
+    NamespaceRule,
+    RelationshipIdRule,
+    UniqueIdRule,
+    ValidationRule,
+    WellFormedRule,
+)
 
 
 class PPTXSchemaValidator(BaseSchemaValidator):
@@ -27,288 +35,306 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate(self):
         """Run all validation checks and return True if all pass."""
+        # Every check except 4 and 7 is fed by one parse and walk of each part
+        rules = [
+            WellFormedRule(self),
+            NamespaceRule(self),
+            UniqueIdRule(self),
+            UuidIdRule(self),
+            SlideLayoutIdRule(self),
+            ContentTypeRule(self),
+            NotesSlideReferenceRule(self),
+            RelationshipIdRule(self),
+            DuplicateSlideLayoutRule(self),
+        ]
+        self.walk_parts(rules)
+        (
+            well_formed,
+            namespaces,
+            unique_ids,
+            uuid_ids,
+            slide_layout_ids,
+            content_types,
+            notes_slide_references,
+            relationship_ids,
+            duplicate_slide_layouts,
+        ) = rules
+
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not well_formed.report():
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not namespaces.report():
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not unique_ids.report():
             all_valid = False
 
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
+        if not uuid_ids.report():
             all_valid = False
 
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self.run_check("file_references", self.validate_file_references):
             all_valid = False
 
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
+        if not slide_layout_ids.report():
             all_valid = False
 
         # Test 6: Content type declarations
-        if not self.validate_content_types():
+        if not content_types.report():
             all_valid = False
 
         # Test 7: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self.run_check("xsd", self.validate_against_xsd):
             all_valid = False
 
         # Test 8: Notes slide reference validation
-        if not self.validate_notes_slide_references():
+        if not notes_slide_references.report():
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not relationship_ids.report():
             all_valid = False
 
         # Test 10: Duplicate slide layout references validation
-        if not self.validate_no_duplicate_slide_layouts():
+        if not duplicate_slide_layouts.report():
             all_valid = False
 
         return all_valid
 
     def validate_uuid_ids(self):
         """Validate that ID attributes that look like UUIDs contain only hex values."""
-        import lxml.etree
-
-        errors = []
-        # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
-        uuid_pattern = re.compile(
-            r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
-        )
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Check all elements for ID attributes
-                for elem in root.iter():
-                    for attr, value in elem.attrib.items():
-                        # Check if this is an ID attribute
-                        attr_name = attr.split("}")[-1].lower()
-                        if attr_name == "id" or attr_name.endswith("id"):
-                            # Check if value looks like a UUID (has the right length and pattern structure)
-                            if self._looks_like_uuid(value):
-                                # Validate that it contains only hex characters in the right positions
-                                if not uuid_pattern.match(value):
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters"
-                                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        return self.run_rule(UuidIdRule(self))
 
-        if errors:
-            print(f"FAILED - Found {len(errors)} UUID ID validation errors:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All UUID-like IDs contain valid hex values")
-            return True
+    def validate_slide_layout_ids(self):
+        """Validate that sldLayoutId elements in slide masters reference valid slide layouts."""
+        return self.run_rule(SlideLayoutIdRule(self))
+
+    def validate_no_duplicate_slide_layouts(self):
+        """Validate that each slide has exactly one slideLayout reference."""
+        return self.run_rule(DuplicateSlideLayoutRule(self))
+
+    def validate_notes_slide_references(self):
+        """Validate that each notesSlide file is referenced by only one slide."""
+        return self.run_rule(NotesSlideReferenceRule(self))
+
+
+class UuidIdRule(ValidationRule):
+    """ID attributes that look like UUIDs contain only hex values."""
+
+    name = "uuid_ids"
+    attributes = True
 
-    def _looks_like_uuid(self, value):
+    # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
+    UUID_PATTERN = re.compile(
+        r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
+    )
+
+    def visit_attribute(self, part, elem, name, value):
+        # Check if this is an ID attribute whose value looks like a UUID
+        if name.endswith("id") and self._looks_like_uuid(value):
+            # Validate that it contains only hex characters in the right positions
+            if not self.UUID_PATTERN.match(value):
+                self.errors.append(
+                    f"  {self.relative(part.path)}: "
+                    f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters"
+                )
+
+    @staticmethod
+    def _looks_like_uuid(value):
         """Check if a value has the general structure of a UUID."""
         # Remove common UUID delimiters
         clean_value = value.strip("{}()").replace("-", "")
         # Check if it's 32 hex-like characters (could include invalid hex chars)
         return len(clean_value) == 32 and all(c.isalnum() for c in clean_value)
 
-    def validate_slide_layout_ids(self):
-        """Validate that sldLayoutId elements in slide masters reference valid slide layouts."""
-        import lxml.etree
-
-        errors = []
+    def report(self):
+        if self.errors:
+            print(f"FAILED - Found {len(self.errors)} UUID ID validation errors:")
+            self.print_errors()
+            return False
+        if self.validator.verbose:
+            print("PASSED - All UUID-like IDs contain valid hex values")
+        return True
+
+
+class SlideLayoutIdRule(ValidationRule):
+    """sldLayoutId elements in slide masters reference valid slide layouts."""
+
+    name = "slide_layout_ids"
+    tags = frozenset({"sldlayoutid"})
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.masters_dir = validator.unpacked_dir / "ppt" / "slideMasters"
+        self.sld_layout_id = f"{{{validator.PRESENTATIONML_NAMESPACE}}}sldLayoutId"
+        self.r_id = f"{{{validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+        self.relationship = f"{{{validator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        self.master_count = 0
+
+    def wants_part(self, path):
+        return path.parent == self.masters_dir and path.suffix == ".xml"
+
+    def start_part(self, part):
+        self.master_count += 1
+        self.valid_layout_rids = None
+
+        # Find the corresponding _rels file for this slide master
+        rels_file = part.path.parent / "_rels" / f"{part.path.name}.rels"
+        if not rels_file.exists():
+            self.errors.append(
+                f"  {self.relative(part.path)}: "
+                f"Missing relationships file: {self.relative(rels_file)}"
+            )
+            return
+
+        # Build a set of valid relationship IDs that point to slide layouts
+        self.valid_layout_rids = set()
+        for rel in self.validator.parse_part(rels_file).iter(self.relationship):
+            if "slideLayout" in rel.get("Type", ""):
+                self.valid_layout_rids.add(rel.get("Id"))
+
+    def visit_element(self, part, elem, tag):
+        if self.valid_layout_rids is None or elem.tag != self.sld_layout_id:
+            return
+        r_id = elem.get(self.r_id)
+        layout_id = elem.get("id")
+
+        if r_id and r_id not in self.valid_layout_rids:
+            self.errors.append(
+                f"  {self.relative(part.path)}: "
+                f"Line {elem.sourceline}: sldLayoutId with id='{layout_id}' "
+                f"references r:id='{r_id}' which is not found in slide layout relationships"
+            )
 
-        # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+    def parse_failed(self, path, error):
+        self.master_count += 1
+        self.part_failed(path, error)
 
-        if not slide_masters:
-            if self.verbose:
+    def report(self):
+        if not self.master_count:
+            if self.validator.verbose:
                 print("PASSED - No slide masters found")
             return True
 
-        for slide_master in slide_masters:
-            try:
-                # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
-
-                # Find the corresponding _rels file for this slide master
-                rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
-
-                if not rels_file.exists():
-                    errors.append(
-                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                        f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
-                    )
-                    continue
-
-                # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Build a set of valid relationship IDs that point to slide layouts
-                valid_layout_rids = set()
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "slideLayout" in rel_type:
-                        valid_layout_rids.add(rel.get("Id"))
-
-                # Find all sldLayoutId elements in the slide master
-                for sld_layout_id in root.findall(
-                    f".//{{{self.PRESENTATIONML_NAMESPACE}}}sldLayoutId"
-                ):
-                    r_id = sld_layout_id.get(
-                        f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
-                    )
-                    layout_id = sld_layout_id.get("id")
-
-                    if r_id and r_id not in valid_layout_rids:
-                        errors.append(
-                            f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                            f"Line {sld_layout_id.sourceline}: sldLayoutId with id='{layout_id}' "
-                            f"references r:id='{r_id}' which is not found in slide layout relationships"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {slide_master.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} slide layout ID validation errors:")
-            for error in errors:
-                print(error)
+        if self.errors:
+            print(f"FAILED - Found {len(self.errors)} slide layout ID validation errors:")
+            self.print_errors()
             print(
                 "Remove invalid references or add missing slide layouts to the relationships file."
             )
             return False
-        else:
-            if self.verbose:
-                print("PASSED - All slide layout IDs reference valid slide layouts")
-            return True
+        if self.validator.verbose:
+            print("PASSED - All slide layout IDs reference valid slide layouts")
+        return True
 
-    def validate_no_duplicate_slide_layouts(self):
-        """Validate that each slide has exactly one slideLayout reference."""
-        import lxml.etree
-
-        errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
-
-        for rels_file in slide_rels_files:
-            try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Find all slideLayout relationships
-                layout_rels = [
-                    rel
-                    for rel in root.findall(
-                        f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                    )
-                    if "slideLayout" in rel.get("Type", "")
-                ]
-
-                if len(layout_rels) > 1:
-                    errors.append(
-                        f"  {rels_file.relative_to(self.unpacked_dir)}: has {len(layout_rels)} slideLayout references"
-                    )
-
-            except Exception as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
 
-        if errors:
-            print("FAILED - Found slides with duplicate slideLayout references:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All slides have exactly one slideLayout reference")
-            return True
+class SlideRelationshipRule(ValidationRule):
+    """Base for rules that check the relationships of each slide."""
 
-    def validate_notes_slide_references(self):
-        """Validate that each notesSlide file is referenced by only one slide."""
-        import lxml.etree
+    tags = frozenset({"relationship"})
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.slide_rels_dir = validator.unpacked_dir / "ppt" / "slides" / "_rels"
+        self.relationship = f"{{{validator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        self.file_count = 0
+
+    def wants_part(self, path):
+        return path.parent == self.slide_rels_dir and path.name.endswith(".xml.rels")
+
+    def start_part(self, part):
+        self.file_count += 1
+
+    def parse_failed(self, path, error):
+        self.file_count += 1
+        self.part_failed(path, error)
+
+
+class NotesSlideReferenceRule(SlideRelationshipRule):
+    """Each notesSlide file is referenced by only one slide."""
+
+    name = "notes_slide_references"
 
-        errors = []
-        notes_slide_references = {}  # Track which slides reference each notesSlide
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.notes_slide_references = {}  # Track which slides reference each notesSlide
 
-        # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+    def visit_element(self, part, elem, tag):
+        if elem.tag != self.relationship or "notesSlide" not in elem.get("Type", ""):
+            return
+        target = elem.get("Target", "")
+        if target:
+            # Normalize the target path to handle relative paths
+            normalized_target = target.replace("../", "")
 
-        if not slide_rels_files:
-            if self.verbose:
+            # Track which slide references this notesSlide
+            slide_name = part.path.stem.replace(".xml", "")  # e.g., "slide1"
+            self.notes_slide_references.setdefault(normalized_target, []).append(
+                (slide_name, part.path)
+            )
+
+    def report(self):
+        if not self.file_count:
+            if self.validator.verbose:
                 print("PASSED - No slide relationship files found")
             return True
 
-        for rels_file in slide_rels_files:
-            try:
-                # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Find all notesSlide relationships
-                for rel in root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "notesSlide" in rel_type:
-                        target = rel.get("Target", "")
-                        if target:
-                            # Normalize the target path to handle relative paths
-                            normalized_target = target.replace("../", "")
-
-                            # Track which slide references this notesSlide
-                            slide_name = rels_file.stem.replace(
-                                ".xml", ""
-                            )  # e.g., "slide1"
-
-                            if normalized_target not in notes_slide_references:
-                                notes_slide_references[normalized_target] = []
-                            notes_slide_references[normalized_target].append(
-                                (slide_name, rels_file)
-                            )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
+        errors = self.errors
         # Check for duplicate references
-        for target, references in notes_slide_references.items():
+        for target, references in self.notes_slide_references.items():
             if len(references) > 1:
                 slide_names = [ref[0] for ref in references]
                 errors.append(
                     f"  Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}"
                 )
                 for slide_name, rels_file in references:
-                    errors.append(f"    - {rels_file.relative_to(self.unpacked_dir)}")
+                    errors.append(f"    - {self.relative(rels_file)}")
 
         if errors:
             print(
                 f"FAILED - Found {len([e for e in errors if not e.startswith('    ')])} notes slide reference validation errors:"
             )
-            for error in errors:
-                print(error)
+            self.print_errors()
             print("Each slide may optionally have its own slide file.")
             return False
-        else:
-            if self.verbose:
-                print("PASSED - All notes slide references are unique")
-            return True
+        if self.validator.verbose:
+            print("PASSED - All notes slide references are unique")
+        return True
+
+
+class DuplicateSlideLayoutRule(SlideRelationshipRule):
+    """Each slide has exactly one slideLayout reference."""
+
+    name = "duplicate_slide_layouts"
+
+    def start_part(self, part):
+        super().start_part(part)
+        self.layout_rels = 0
+
+    def visit_element(self, part, elem, tag):
+        if elem.tag == self.relationship and "slideLayout" in elem.get("Type", ""):
+            self.layout_rels += 1
+
+    def end_part(self, part):
+        if self.layout_rels > 1:
+            self.errors.append(
+                f"  {self.relative(part.path)}: has {self.layout_rels} slideLayout references"
+            )
+
+    def report(self):
+        if self.errors:
+            print("FAILED - Found slides with duplicate slideLayout references:")
+            self.print_errors()
+            return False
+        if self.validator.verbose:
+            print("PASSED - All slides have exactly one slideLayout reference")
+        return True
 
 
 if __name__ == "__main__":
@@ -0,0 +1,400 @@
+"""
+Validation rules fed by a single traversal of every XML part.
+
+Instead of each check re-parsing and re-walking every file, a rule declares
+which parts, elements and attributes it needs, and the validator parses each
+part once and hands it to all rules together (see
+BaseSchemaValidator.walk_parts).
+"""
+
+from collections import namedtuple
+
+import lxml.etree
+
+# A parsed XML part as handed to rules
+XmlPart = namedtuple("XmlPart", ["path", "root"])
+
+
+class ValidationRule:
+    """A check that receives parts and elements from the shared traversal.
+
+    Subclasses set `tags` to the lowercase local element names that should be
+    passed to visit_element, or `all_elements` to receive every element, and
+    set `attributes` to receive every attribute via visit_attribute. If a hook
+    raises, part_failed records the error and the rule skips the rest of that
+    part. report() prints the outcome and returns True if the check passed.
+    """
+
+    name = "rule"
+    tags = frozenset()
+    all_elements = False
+    attributes = False
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+        self.elapsed = 0.0
+
+    def relative(self, path):
+        return path.relative_to(self.validator.unpacked_dir)
+
+    def wants_part(self, path):
+        """Return True if this rule should see the part at path."""
+        return True
+
+    def start_part(self, part):
+        pass
+
+    def visit_element(self, part, elem, tag):
+        pass
+
+    def visit_attribute(self, part, elem, name, value):
+        pass
+
+    def end_part(self, part):
+        pass
+
+    def part_failed(self, path, error):
+        self.errors.append(f"  {self.relative(path)}: Error: {error}")
+
+    def parse_failed(self, path, error):
+        self.part_failed(path, error)
+
+    def report(self):
+        raise NotImplementedError("Subclasses must implement the report method")
+
+    def print_errors(self):
+        for error in self.errors:
+            print(error)
+
+
+class WellFormedRule(ValidationRule):
+    """All XML files are well-formed."""
+
+    name = "xml"
+
+    def parse_failed(self, path, error):
+        if isinstance(error, lxml.etree.XMLSyntaxError):
+            self.errors.append(
+                f"  {self.relative(path)}: Line {error.lineno}: {error.msg}"
+            )
+        else:
+            self.errors.append(
+                f"  {self.relative(path)}: Unexpected error: {str(error)}"
+            )
+
+    def report(self):
+        if self.errors:
+            print(f"FAILED - Found {len(self.errors)} XML violations:")
+            self.print_errors()
+            return False
+        if self.validator.verbose:
+            print("PASSED - All XML files are well-formed")
+        return True
+
+
+class NamespaceRule(ValidationRule):
+    """Namespace prefixes in Ignorable attributes are declared."""
+
+    name = "namespaces"
+
+    def start_part(self, part):
+        declared = set(part.root.nsmap.keys()) - {None}  # Exclude default namespace
+        for attr_val in [
+            v for k, v in part.root.attrib.items() if k.endswith("Ignorable")
+        ]:
+            undeclared = set(attr_val.split()) - declared
+            self.errors.extend(
+                f"  {self.relative(part.path)}: "
+                f"Namespace '{ns}' in Ignorable but not declared"
+                for ns in undeclared
+            )
+
+    def parse_failed(self, path, error):
+        pass
+
+    def report(self):
+        if self.errors:
+            print(f"FAILED - {len(self.errors)} namespace issues:")
+            self.print_errors()
+            return False
+        if self.validator.verbose:
+            print("PASSED - All namespace prefixes properly declared")
+        return True
+
+
+class UniqueIdRule(ValidationRule):
+    """IDs are unique according to OOXML requirements."""
+
+    name = "unique_ids"
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.requirements = validator.UNIQUE_ID_REQUIREMENTS
+        self.tags = frozenset(self.requirements)
+        self.alternate_content = f"{{{validator.MC_NAMESPACE}}}AlternateContent"
+        self.global_ids = {}  # Track globally unique IDs across all files
+
+    def start_part(self, part):
+        self.file_ids = {}  # Track IDs that must be unique within this file
+        # IDs inside mc:AlternateContent are ignored
+        self.has_alternate_content = (
+            part.root.find(f".//{self.alternate_content}") is not None
+        )
+
+    def visit_element(self, part, elem, tag):
+        if self.has_alternate_content and any(
+            True for _ in elem.iterancestors(self.alternate_content)
+        ):
+            return
+
+        attr_name, scope = self.requirements[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.items():
+            if attr.rpartition("}")[2].lower() == attr_name:
+                id_value = value
+                break
+        if id_value is None:
+            return
+
+        rel_path = self.relative(part.path)
+        if scope == "global":
+            # Check global uniqueness
+            if id_value in self.global_ids:
+                prev_file, prev_line, prev_tag = self.global_ids[id_value]
+                self.errors.append(
+                    f"  {rel_path}: "
+                    f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
+                    f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                )
+            else:
+                self.global_ids[id_value] = (rel_path, elem.sourceline, tag)
+        elif scope == "file":
+            # Check file-level uniqueness
+            ids = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in ids:
+                self.errors.append(
+                    f"  {rel_path}: "
+                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {ids[id_value]})"
+                )
+            else:
+                ids[id_value] = elem.sourceline
+
+    def report(self):
+        if self.errors:
+            print(f"FAILED - Found {len(self.errors)} ID uniqueness violations:")
+            self.print_errors()
+            return False
+        if self.validator.verbose:
+            print("PASSED - All required IDs are unique")
+        return True
+
+
+class RelationshipIdRule(ValidationRule):
+    """r:id attributes reference existing relationships of the right type."""
+
+    name = "relationship_ids"
+    all_elements = True
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.r_id = f"{{{validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+        self.relationship = f"{{{validator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+
+    @staticmethod
+    def rels_file(path):
+        # For dir/file.xml, it's dir/_rels/file.xml.rels
+        return path.parent / "_rels" / f"{path.name}.rels"
+
+    def wants_part(self, path):
+        # Skip .rels files themselves and parts without relationships
+        return path.suffix != ".rels" and self.rels_file(path).exists()
+
+    def start_part(self, part):
+        rels_file = self.rels_file(part.path)
+        rels_root = self.validator.parse_part(rels_file)
+        self.rid_to_type = {}
+
+        for rel in rels_root.iter(self.relationship):
+            rid = rel.get("Id")
+            rel_type = rel.get("Type", "")
+            if rid:
+                # Check for duplicate rIds
+                if rid in self.rid_to_type:
+                    self.errors.append(
+                        f"  {self.relative(rels_file)}: Line {rel.sourceline}: "
+                        f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                    )
+                # Extract just the type name from the full URL
+                self.rid_to_type[rid] = rel_type.split("/")[-1]
+
+    def visit_element(self, part, elem, tag):
+        rid_attr = elem.get(self.r_id)
+        if not rid_attr:
+            return
+
+        xml_rel_path = self.relative(part.path)
+        elem_name = elem.tag.rpartition("}")[2]
+        rid_to_type = self.rid_to_type
+
+        # Check if the ID exists
+        if rid_attr not in rid_to_type:
+            self.errors.append(
+                f"  {xml_rel_path}: Line {elem.sourceline}: "
+                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+            )
+        # Check if we have type expectations for this element
+        elif self.validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = self.validator._get_expected_relationship_type(elem_name)
+            if expected_type:
+                actual_type = rid_to_type[rid_attr]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.errors.append(
+                        f"  {xml_rel_path}: Line {elem.sourceline}: "
+                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                        f"but should point to a '{expected_type}' relationship"
+                    )
+
+    def part_failed(self, path, error):
+        self.errors.append(f"  Error processing {self.relative(path)}: {error}")
+
+    def report(self):
+        if self.errors:
+            print(f"FAILED - Found {len(self.errors)} relationship ID reference errors:")
+            self.print_errors()
+            print("\nThese ID mismatches will cause the document to appear corrupt!")
+            return False
+        if self.validator.verbose:
+            print("PASSED - All relationship ID references are valid")
+        return True
+
+
+class ContentTypeRule(ValidationRule):
+    """Content files are declared in [Content_Types].xml."""
+
+    name = "content_types"
+
+    # Root elements that require content type declaration
+    DECLARABLE_ROOTS = {
+        "sld",
+        "sldLayout",
+        "sldMaster",
+        "presentation",  # PowerPoint
+        "document",  # Word
+        "workbook",
+        "worksheet",  # Excel
+        "theme",  # Common
+    }
+
+    # Common media file extensions that should be declared
+    MEDIA_EXTENSIONS = {
+        "png": "image/png",
+        "jpg": "image/jpeg",
+        "jpeg": "image/jpeg",
+        "gif": "image/gif",
+        "bmp": "image/bmp",
+        "tiff": "image/tiff",
+        "wmf": "image/x-wmf",
+        "emf": "image/x-emf",
+    }
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.root_names = []  # (path, root element name) of content parts
+
+    def _path_str(self, path):
+        return str(self.relative(path)).replace("\\", "/")
+
+    def wants_part(self, path):
+        # Skip non-content files
+        path_str = self._path_str(path)
+        return not any(
+            skip in path_str
+            for skip in [".rels", "[Content_Types]", "docProps/", "_rels/"]
+        )
+
+    def start_part(self, part):
+        root_tag = part.root.tag
+        root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
+        self.root_names.append((self._path_str(part.path), root_name))
+
+    def part_failed(self, path, error):
+        pass  # Skip unparseable files
+
+    def report(self):
+        validator = self.validator
+        errors = self.errors
+
+        # Find [Content_Types].xml file
+        content_types_file = validator.unpacked_dir / "[Content_Types].xml"
+        if not content_types_file.exists():
+            print("FAILED - [Content_Types].xml file not found")
+            return False
+
+        try:
+            # Parse and get all declared parts and extensions
+            root = lxml.etree.parse(str(content_types_file)).getroot()
+            declared_parts = set()
+            declared_extensions = set()
+
+            # Get Override declarations (specific files)
+            for override in root.findall(
+                f".//{{{validator.CONTENT_TYPES_NAMESPACE}}}Override"
+            ):
+                part_name = override.get("PartName")
+                if part_name is not None:
+                    declared_parts.add(part_name.lstrip("/"))
+
+            # Get Default declarations (by extension)
+            for default in root.findall(
+                f".//{{{validator.CONTENT_TYPES_NAMESPACE}}}Default"
+            ):
+                extension = default.get("Extension")
+                if extension is not None:
+                    declared_extensions.add(extension.lower())
+
+            # Check all XML files for Override declarations
+            for path_str, root_name in self.root_names:
+                if root_name in self.DECLARABLE_ROOTS and path_str not in declared_parts:
+                    errors.append(
+                        f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                    )
+
+            # Check all non-XML files for Default extension declarations
+            for file_path in validator.unpacked_dir.rglob("*"):
+                if not file_path.is_file():
+                    continue
+                # Skip XML files and metadata files (already checked above)
+                if file_path.suffix.lower() in {".xml", ".rels"}:
+                    continue
+                if file_path.name == "[Content_Types].xml":
+                    continue
+                if "_rels" in file_path.parts or "docProps" in file_path.parts:
+                    continue
+
+                extension = file_path.suffix.lstrip(".").lower()
+                if extension and extension not in declared_extensions:
+                    # Check if it's a known media extension that should be declared
+                    if extension in self.MEDIA_EXTENSIONS:
+                        relative_path = file_path.relative_to(validator.unpacked_dir)
+                        errors.append(
+                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{self.MEDIA_EXTENSIONS[extension]}"/>'
+                        )
+
+        except Exception as e:
+            errors.append(f"  Error parsing [Content_Types].xml: {e}")
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} content type declaration errors:")
+            self.print_errors()
+            return False
+        if validator.verbose:
+            print(
+                "PASSED - All content files are properly declared in [Content_Types].xml"
+            )
+        return True
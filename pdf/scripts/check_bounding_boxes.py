@@ -14,34 +14,91 @@ class RectAndField:
     field: dict
 
 
+# Boxes covering more grid cells than this are checked against every box on their page instead.
+MAX_CELLS_PER_BOX = 1024
+
+
+def rects_intersect(r1, r2):
+    disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+    disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+    return not (disjoint_horizontal or disjoint_vertical)
+
+
+# Uniform grid over the rectangles of one page, with cells the size of a typical box,
+# so finding the boxes that may intersect a box only looks at its neighbours.
+class PageGrid:
+    def __init__(self, indexed_rects):
+        # Cells are sized from the median box, so most boxes cover only a few cells
+        widths = sorted(abs(rect[2] - rect[0]) for _, rect in indexed_rects)
+        heights = sorted(abs(rect[3] - rect[1]) for _, rect in indexed_rects)
+        self.cell_width = widths[len(widths) // 2] or 1
+        self.cell_height = heights[len(heights) // 2] or 1
+        self.indexes = [i for i, _ in indexed_rects]
+        self.cells = {}
+        self.box_cells = {}
+        self.oversized = set()
+        for i, rect in indexed_rects:
+            cells = self.box_cells[i] = self.cell_range(rect)
+            if cells is None:
+                self.oversized.add(i)
+                continue
+            for cell in cells:
+                self.cells.setdefault(cell, []).append(i)
+
+    # Cells covered by `rect`, or None if it covers too many. Boxes whose coordinates
+    # are given in the wrong order are treated as their normalized span, which always
+    # contains any intersection found by `rects_intersect`.
+    def cell_range(self, rect):
+        x0 = int(min(rect[0], rect[2]) // self.cell_width)
+        x1 = int(max(rect[0], rect[2]) // self.cell_width)
+        y0 = int(min(rect[1], rect[3]) // self.cell_height)
+        y1 = int(max(rect[1], rect[3]) // self.cell_height)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > MAX_CELLS_PER_BOX:
+            return None
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    # Sorted indexes greater than `i` of the boxes that may intersect box `i`.
+    def candidates_after(self, i):
+        if i in self.oversized:
+            return [j for j in self.indexes if j > i]
+        candidates = {j for j in self.oversized if j > i}
+        for cell in self.box_cells[i]:
+            candidates.update(j for j in self.cells[cell] if j > i)
+        return sorted(candidates)
+
+
 # Returns a list of messages that are printed to stdout for Claude to read.
-def get_bounding_box_messages(fields_json_stream) -> list[str]:
+# At most `max_messages` messages are reported before aborting; pass None to report all.
+def get_bounding_box_messages(fields_json_stream, max_messages=20) -> list[str]:
     messages = []
     fields = json.load(fields_json_stream)
     messages.append(f"Read {len(fields['form_fields'])} fields")
 
-    def rects_intersect(r1, r2):
-        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
-        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
-        return not (disjoint_horizontal or disjoint_vertical)
-
     rects_and_fields = []
     for f in fields["form_fields"]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
 
+    # Only boxes on the same page can intersect, so each page gets its own grid
+    rects_by_page = {}
+    for i, r in enumerate(rects_and_fields):
+        rects_by_page.setdefault(r.field["page_number"], []).append((i, r.rect))
+    grids = {page: PageGrid(indexed_rects) for page, indexed_rects in rects_by_page.items()}
+
+    # Boxes are visited in the same order as a pairwise comparison of all boxes would,
+    # so the messages (and where they are cut off) don't depend on the grid.
     has_error = False
     for i, ri in enumerate(rects_and_fields):
-        # This is O(N^2); we can optimize if it becomes a problem.
-        for j in range(i + 1, len(rects_and_fields)):
+        grid = grids[ri.field["page_number"]]
+        for j in grid.candidates_after(i):
             rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
+            if rects_intersect(ri.rect, rj.rect):
                 has_error = True
                 if ri.field is rj.field:
                     messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
                 else:
                     messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
+                if max_messages is not None and len(messages) >= max_messages:
                     messages.append("Aborting further checks; fix bounding boxes and try again")
                     return messages
         if ri.rect_type == "entry":
@@ -51,7 +108,7 @@ def get_bounding_box_messages(fields_json_stream) -> list[str]:
                 if entry_height < font_size:
                     has_error = True
                     messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
-                    if len(messages) >= 20:
+                    if max_messages is not None and len(messages) >= max_messages:
                         messages.append("Aborting further checks; fix bounding boxes and try again")
                         return messages
 
@@ -60,11 +117,15 @@ def get_bounding_box_messages(fields_json_stream) -> list[str]:
     return messages
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: check_bounding_boxes.py [fields.json]")
+    args = sys.argv[1:]
+    report_all = "--all" in args
+    if report_all:
+        args.remove("--all")
+    if len(args) != 1:
+        print("Usage: check_bounding_boxes.py [--all] [fields.json]")
         sys.exit(1)
     # Input file should be in the `fields.json` format described in forms.md.
-    with open(sys.argv[1]) as f:
-        messages = get_bounding_box_messages(f)
+    with open(args[0]) as f:
+        messages = get_bounding_box_messages(f, max_messages=None if report_all else 20)
     for msg in messages:
         print(msg)
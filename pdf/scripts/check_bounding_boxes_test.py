@@ -1,6 +1,8 @@
 import unittest
 import json
 import io
+import random
+import time
 from check_bounding_boxes import get_bounding_box_messages
 
 
@@ -220,7 +222,134 @@ class TestGetBoundingBoxMessages(unittest.TestCase):
         messages = get_bounding_box_messages(stream)
         self.assertTrue(any("SUCCESS" in msg for msg in messages))
         self.assertFalse(any("FAILURE" in msg for msg in messages))
-    
+
+    def test_report_all_intersections(self):
+        """Test that all intersections are reported when no limit is given"""
+        fields = []
+        for i in range(25):
+            fields.append({
+                "description": f"Field{i}",
+                "page_number": 1,
+                "label_bounding_box": [10, 10, 50, 30],
+                "entry_bounding_box": [20, 15, 60, 35]
+            })
+
+        stream = self.create_json_stream({"form_fields": fields})
+        messages = get_bounding_box_messages(stream, max_messages=None)
+        self.assertFalse(any("Aborting" in msg for msg in messages))
+        # Every pair of the 50 boxes intersects
+        failure_count = sum(1 for msg in messages if "FAILURE" in msg)
+        self.assertEqual(failure_count, 50 * 49 // 2)
+
+
+def brute_force_messages(fields, max_messages=20):
+    """The original pairwise check, used as a reference for the grid-based one"""
+    messages = [f"Read {len(fields)} fields"]
+    boxes = []
+    for f in fields:
+        boxes.append((f["label_bounding_box"], "label", f))
+        boxes.append((f["entry_bounding_box"], "entry", f))
+
+    def rects_intersect(r1, r2):
+        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+        return not (disjoint_horizontal or disjoint_vertical)
+
+    def limit_reached():
+        if max_messages is not None and len(messages) >= max_messages:
+            messages.append("Aborting further checks; fix bounding boxes and try again")
+            return True
+        return False
+
+    has_error = False
+    for i, (rect_i, type_i, field_i) in enumerate(boxes):
+        for rect_j, type_j, field_j in boxes[i + 1:]:
+            if field_i["page_number"] == field_j["page_number"] and rects_intersect(rect_i, rect_j):
+                has_error = True
+                if field_i is field_j:
+                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{field_i['description']}` ({rect_i}, {rect_j})")
+                else:
+                    messages.append(f"FAILURE: intersection between {type_i} bounding box for `{field_i['description']}` ({rect_i}) and {type_j} bounding box for `{field_j['description']}` ({rect_j})")
+                if limit_reached():
+                    return messages
+        if type_i == "entry" and "entry_text" in field_i:
+            font_size = field_i["entry_text"].get("font_size", 14)
+            entry_height = rect_i[3] - rect_i[1]
+            if entry_height < font_size:
+                has_error = True
+                messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{field_i['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
+                if limit_reached():
+                    return messages
+    if not has_error:
+        messages.append("SUCCESS: All bounding boxes are valid")
+    return messages
+
+
+class TestGridMatchesPairwiseCheck(unittest.TestCase):
+
+    def random_fields(self, rng, count, pages):
+        def random_box():
+            x, y = rng.uniform(0, 600), rng.uniform(0, 800)
+            w, h = rng.choice([rng.uniform(1, 60), rng.uniform(100, 600)]), rng.uniform(1, 30)
+            box = [round(x), round(y), round(x + w), round(y + h)]
+            if rng.random() < 0.05:
+                # Coordinates in the wrong order
+                box[0], box[2] = box[2], box[0]
+            return box
+
+        fields = []
+        for i in range(count):
+            field = {
+                "description": f"Field{i}",
+                "page_number": rng.randint(1, pages),
+                "label_bounding_box": random_box(),
+                "entry_bounding_box": random_box(),
+            }
+            if rng.random() < 0.3:
+                field["entry_text"] = {"font_size": rng.choice([8, 10, 14])}
+            fields.append(field)
+        return fields
+
+    def test_same_messages_as_pairwise_check(self):
+        """Test that the grid reports the same messages, in the same order, as comparing all pairs"""
+        rng = random.Random(0)
+        for count, pages in [(1, 1), (10, 1), (60, 2), (200, 5), (400, 3)]:
+            fields = self.random_fields(rng, count, pages)
+            for max_messages in (20, None):
+                with self.subTest(count=count, pages=pages, max_messages=max_messages):
+                    stream = io.StringIO(json.dumps({"form_fields": fields}))
+                    self.assertEqual(
+                        get_bounding_box_messages(stream, max_messages=max_messages),
+                        brute_force_messages(fields, max_messages=max_messages),
+                    )
+
+
+class BenchmarkBoundingBoxMessages(unittest.TestCase):
+
+    def test_100k_boxes(self):
+        """Benchmark: 50,000 fields (100,000 boxes) laid out on 40 pages without overlaps"""
+        fields = []
+        fields_per_page = 1250
+        for i in range(50000):
+            slot = i % fields_per_page
+            row, column = divmod(slot, 25)
+            x, y = column * 24, row * 16
+            fields.append({
+                "description": f"Field{i}",
+                "page_number": i // fields_per_page + 1,
+                "label_bounding_box": [x, y, x + 10, y + 15],
+                "entry_bounding_box": [x + 10, y, x + 24, y + 15],
+                "entry_text": {"font_size": 10},
+            })
+        stream = io.StringIO(json.dumps({"form_fields": fields}))
+
+        start = time.perf_counter()
+        messages = get_bounding_box_messages(stream)
+        elapsed = time.perf_counter() - start
+        print(f"\nChecked 100,000 boxes in {elapsed:.2f}s")
+
+        self.assertEqual(messages, ["Read 50000 fields", "SUCCESS: All bounding boxes are valid"])
+
 
 if __name__ == '__main__':
     unittest.main()
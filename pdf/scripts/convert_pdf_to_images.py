@@ -1,35 +1,98 @@
+import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from pdf2image import convert_from_path
+from pypdf import PdfReader
+
+from page_ranges import parse_page_range
 
 
 # Converts each page of a PDF to a PNG image.
+# Pages are rendered a few at a time, directly at the resolution that fits
+# `max_dim`, so memory use does not grow with the number of pages.
+
+
+# DPI used when the page already fits within `max_dim` at this resolution.
+DEFAULT_DPI = 200
+# Consecutive pages rendered by one pdftoppm call.
+DEFAULT_BATCH_SIZE = 4
+
+
+# Returns the DPI to render a page at so that its larger side is at most `max_dim` pixels.
+def page_dpi(page, max_dim):
+    # pdftoppm renders the media box by default; rotation doesn't change the larger side.
+    longest_side = max(float(page.mediabox.width), float(page.mediabox.height))
+    if longest_side <= 0:
+        return DEFAULT_DPI
+    return min(DEFAULT_DPI, max_dim * 72 / longest_side)
 
 
-def convert(pdf_path, output_dir, max_dim=1000):
-    images = convert_from_path(pdf_path, dpi=200)
+# Groups consecutive pages that render at the same DPI into batches of at most `batch_size`.
+def make_batches(page_numbers, dpis, batch_size):
+    batches = []
+    for page_number in page_numbers:
+        dpi = dpis[page_number]
+        if batches:
+            last = batches[-1]
+            if last["dpi"] == dpi and last["last_page"] == page_number - 1 and last["last_page"] - last["first_page"] + 1 < batch_size:
+                last["last_page"] = page_number
+                continue
+        batches.append({"first_page": page_number, "last_page": page_number, "dpi": dpi})
+    return batches
 
-    for i, image in enumerate(images):
-        # Scale image if needed to keep width/height under `max_dim`
+
+def render_batch(pdf_path, output_dir, batch, max_dim):
+    images = convert_from_path(
+        pdf_path, dpi=batch["dpi"], first_page=batch["first_page"], last_page=batch["last_page"]
+    )
+    saved = []
+    for page_number, image in zip(range(batch["first_page"], batch["last_page"] + 1), images):
+        # Rounding in the renderer can overshoot `max_dim` by a pixel
         width, height = image.size
         if width > max_dim or height > max_dim:
             scale_factor = min(max_dim / width, max_dim / height)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            image = image.resize((new_width, new_height))
-        
-        image_path = os.path.join(output_dir, f"page_{i+1}.png")
+            image = image.resize((int(width * scale_factor), int(height * scale_factor)))
+        image_path = os.path.join(output_dir, f"page_{page_number}.png")
         image.save(image_path)
-        print(f"Saved page {i+1} as {image_path} (size: {image.size})")
+        saved.append((page_number, image_path, image.size))
+        image.close()
+    return saved
+
+
+def convert(pdf_path, output_dir, max_dim=1000, pages=None, threads=None, batch_size=DEFAULT_BATCH_SIZE):
+    reader = PdfReader(pdf_path)
+    page_count = len(reader.pages)
+    page_numbers = parse_page_range(pages, page_count) if pages else list(range(1, page_count + 1))
+    dpis = {n: page_dpi(reader.pages[n - 1], max_dim) for n in page_numbers}
+    batches = make_batches(page_numbers, dpis, batch_size)
+
+    os.makedirs(output_dir, exist_ok=True)
+    # Each batch runs in its own pdftoppm process, so threads are enough for parallelism.
+    # Only the images of the batches in flight are held in memory.
+    threads = threads or min(4, os.cpu_count() or 1)
+    converted = 0
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for saved in executor.map(lambda batch: render_batch(pdf_path, output_dir, batch, max_dim), batches):
+            for page_number, image_path, size in saved:
+                print(f"Saved page {page_number} as {image_path} (size: {size})")
+            converted += len(saved)
 
-    print(f"Converted {len(images)} pages to PNG images")
+    print(f"Converted {converted} pages to PNG images")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: convert_pdf_to_images.py [input pdf] [output directory]")
+    parser = argparse.ArgumentParser(description="Converts each page of a PDF to a PNG image.")
+    parser.add_argument("pdf_path", help="input pdf")
+    parser.add_argument("output_directory", help="output directory")
+    parser.add_argument("--max-dim", type=int, default=1000, help="Maximum width/height of each image in pixels (default: 1000)")
+    parser.add_argument("--pages", help="Pages to convert, e.g. '1-5,8' (default: all)")
+    parser.add_argument("--threads", type=int, help="Number of pages rendered in parallel (default: up to 4)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Pages rendered per pdftoppm call")
+    args = parser.parse_args()
+    try:
+        convert(args.pdf_path, args.output_directory, args.max_dim, args.pages, args.threads, args.batch_size)
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
-    pdf_path = sys.argv[1]
-    output_directory = sys.argv[2]
-    convert(pdf_path, output_directory)
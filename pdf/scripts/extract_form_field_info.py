@@ -1,7 +1,9 @@
 import json
 import sys
+from functools import cached_property
 
 from pypdf import PdfReader
+from pypdf.generic import DictionaryObject, IndirectObject
 
 
 # Extracts data for the fillable form fields in a PDF and outputs JSON that
@@ -50,91 +52,187 @@ def make_field_dict(field, field_id):
     return field_dict
 
 
-# Returns a list of fillable PDF fields:
-# [
-#   {
-#     "field_id": "name",
-#     "page": 1,
-#     "type": ("text", "checkbox", "radio_group", or "choice")
-#     // Per-type additional fields described in forms.md
-#   },
-# ]
-def get_field_info(reader: PdfReader):
-    fields = reader.get_fields()
-
-    field_info_by_id = {}
-    possible_radio_names = set()
-
-    for field_id, field in fields.items():
-        # Skip if this is a container field with children, except that it might be
-        # a parent group for radio button options.
-        if field.get("/Kids"):
-            if field.get("/FT") == "/Btn":
-                possible_radio_names.add(field_id)
-            continue
-        field_info_by_id[field_id] = make_field_dict(field, field_id)
-
-    # Bounding rects are stored in annotations in page objects.
-
-    # Radio button options have a separate annotation for each choice;
-    # all choices have the same field name.
-    # See https://westhealth.github.io/exploring-fillable-forms-with-pdfrw.html
-    radio_fields_by_id = {}
-
-    for page_index, page in enumerate(reader.pages):
-        annotations = page.get('/Annots', [])
-        for ann in annotations:
-            field_id = get_full_annotation_field_id(ann)
-            if field_id in field_info_by_id:
-                field_info_by_id[field_id]["page"] = page_index + 1
-                field_info_by_id[field_id]["rect"] = ann.get('/Rect')
-            elif field_id in possible_radio_names:
-                try:
-                    # ann['/AP']['/N'] should have two items. One of them is '/Off',
-                    # the other is the active value.
-                    on_values = [v for v in ann["/AP"]["/N"] if v != "/Off"]
-                except KeyError:
-                    continue
-                if len(on_values) == 1:
-                    rect = ann.get("/Rect")
-                    if field_id not in radio_fields_by_id:
-                        radio_fields_by_id[field_id] = {
-                            "field_id": field_id,
-                            "type": "radio_group",
-                            "page": page_index + 1,
-                            "radio_options": [],
-                        }
-                    # Note: at least on macOS 15.7, Preview.app doesn't show selected
-                    # radio buttons correctly. (It does if you remove the leading slash
-                    # from the value, but that causes them not to appear correctly in
-                    # Chrome/Firefox/Acrobat/etc).
-                    radio_fields_by_id[field_id]["radio_options"].append({
-                        "value": on_values[0],
-                        "rect": rect,
-                    })
-
-    # Some PDFs have form field definitions without corresponding annotations,
-    # so we can't tell where they are. Ignore these fields for now.
-    fields_with_location = []
-    for field_info in field_info_by_id.values():
-        if "page" in field_info:
-            fields_with_location.append(field_info)
+# Already parsed fields for `PdfReader.get_fields`, which checks `field in stack` for every
+# field. With a plain list (compared by value) that makes it quadratic in the number of fields.
+class ParsedFieldStack(list):
+    def __init__(self):
+        super().__init__()
+        self._ids = set()
+
+    def append(self, obj):
+        self._ids.add(id(obj))
+        super().append(obj)
+
+    def __contains__(self, obj):
+        return id(obj) in self._ids
+
+
+# Index of the form fields of a PDF, built once per reader so that fill scripts can
+# look up fields by id or page, and transform coordinates, in constant time.
+class FormIndex:
+    def __init__(self, reader: PdfReader):
+        self.reader = reader
+        # Full field name for each annotation/field object, keyed by object number.
+        self._field_names = {}
+        self._page_sizes = {}
+        self._transforms = {}
+
+    # Same as `get_full_annotation_field_id`, but each object's name is computed only
+    # once, so annotations sharing ancestors don't walk the `/Parent` chain repeatedly.
+    def field_name(self, annotation):
+        reference = annotation if isinstance(annotation, IndirectObject) else getattr(annotation, "indirect_reference", None)
+        key = (reference.idnum, reference.generation) if reference is not None else None
+        if key is not None and key in self._field_names:
+            return self._field_names[key]
+
+        annotation = annotation.get_object()
+        parent = annotation.get('/Parent')
+        parent_name = self.field_name(parent) if parent else None
+        field_name = annotation.get('/T')
+        if parent_name and field_name:
+            name = f"{parent_name}.{field_name}"
         else:
-            print(f"Unable to determine location for field id: {field_info.get('field_id')}, ignoring")
+            name = field_name or parent_name or None
+
+        if key is not None:
+            self._field_names[key] = name
+        return name
+
+    # Same as `PdfReader.get_fields()`, in linear time.
+    def _get_fields(self):
+        acro_form = self.reader.root_object.get("/AcroForm")
+        acro_form = acro_form.get_object() if acro_form is not None else None
+        if not isinstance(acro_form, DictionaryObject):
+            return {}
+        return self.reader.get_fields(tree=acro_form, retval={}, stack=ParsedFieldStack())
+
+    # Returns a list of fillable PDF fields:
+    # [
+    #   {
+    #     "field_id": "name",
+    #     "page": 1,
+    #     "type": ("text", "checkbox", "radio_group", or "choice")
+    #     // Per-type additional fields described in forms.md
+    #   },
+    # ]
+    @cached_property
+    def field_info(self):
+        fields = self._get_fields()
+
+        field_info_by_id = {}
+        possible_radio_names = set()
+
+        for field_id, field in fields.items():
+            # Skip if this is a container field with children, except that it might be
+            # a parent group for radio button options.
+            if field.get("/Kids"):
+                if field.get("/FT") == "/Btn":
+                    possible_radio_names.add(field_id)
+                continue
+            field_info_by_id[field_id] = make_field_dict(field, field_id)
+
+        # Bounding rects are stored in annotations in page objects.
+
+        # Radio button options have a separate annotation for each choice;
+        # all choices have the same field name.
+        # See https://westhealth.github.io/exploring-fillable-forms-with-pdfrw.html
+        radio_fields_by_id = {}
+
+        for page_index, page in enumerate(self.reader.pages):
+            annotations = page.get('/Annots', [])
+            for ann in annotations:
+                field_id = self.field_name(ann)
+                if field_id in field_info_by_id:
+                    field_info_by_id[field_id]["page"] = page_index + 1
+                    field_info_by_id[field_id]["rect"] = ann.get('/Rect')
+                elif field_id in possible_radio_names:
+                    try:
+                        # ann['/AP']['/N'] should have two items. One of them is '/Off',
+                        # the other is the active value.
+                        on_values = [v for v in ann["/AP"]["/N"] if v != "/Off"]
+                    except KeyError:
+                        continue
+                    if len(on_values) == 1:
+                        rect = ann.get("/Rect")
+                        if field_id not in radio_fields_by_id:
+                            radio_fields_by_id[field_id] = {
+                                "field_id": field_id,
+                                "type": "radio_group",
+                                "page": page_index + 1,
+                                "radio_options": [],
+                            }
+                        # Note: at least on macOS 15.7, Preview.app doesn't show selected
+                        # radio buttons correctly. (It does if you remove the leading slash
+                        # from the value, but that causes them not to appear correctly in
+                        # Chrome/Firefox/Acrobat/etc).
+                        radio_fields_by_id[field_id]["radio_options"].append({
+                            "value": on_values[0],
+                            "rect": rect,
+                        })
+
+        # Some PDFs have form field definitions without corresponding annotations,
+        # so we can't tell where they are. Ignore these fields for now.
+        fields_with_location = []
+        for field_info in field_info_by_id.values():
+            if "page" in field_info:
+                fields_with_location.append(field_info)
+            else:
+                print(f"Unable to determine location for field id: {field_info.get('field_id')}, ignoring")
 
-    # Sort by page number, then Y position (flipped in PDF coordinate system), then X.
-    def sort_key(f):
-        if "radio_options" in f:
-            rect = f["radio_options"][0]["rect"] or [0, 0, 0, 0]
-        else:
-            rect = f.get("rect") or [0, 0, 0, 0]
-        adjusted_position = [-rect[1], rect[0]]
-        return [f.get("page"), adjusted_position]
-    
-    sorted_fields = fields_with_location + list(radio_fields_by_id.values())
-    sorted_fields.sort(key=sort_key)
-
-    return sorted_fields
+        # Sort by page number, then Y position (flipped in PDF coordinate system), then X.
+        def sort_key(f):
+            if "radio_options" in f:
+                rect = f["radio_options"][0]["rect"] or [0, 0, 0, 0]
+            else:
+                rect = f.get("rect") or [0, 0, 0, 0]
+            adjusted_position = [-rect[1], rect[0]]
+            return [f.get("page"), adjusted_position]
+
+        sorted_fields = fields_with_location + list(radio_fields_by_id.values())
+        sorted_fields.sort(key=sort_key)
+
+        return sorted_fields
+
+    @cached_property
+    def fields_by_id(self):
+        return {f["field_id"]: f for f in self.field_info}
+
+    # Page number (1-based) -> fields on that page, in `field_info` order.
+    @cached_property
+    def fields_by_page(self):
+        by_page = {}
+        for f in self.field_info:
+            by_page.setdefault(f["page"], []).append(f)
+        return by_page
+
+    # (width, height) of a page's media box, for a 1-based page number.
+    def page_size(self, page_number):
+        if page_number not in self._page_sizes:
+            mediabox = self.reader.pages[page_number - 1].mediabox
+            self._page_sizes[page_number] = (mediabox.width, mediabox.height)
+        return self._page_sizes[page_number]
+
+    # Transforms a [left, top, right, bottom] box in the coordinates of an image of the
+    # page to PDF coordinates, returned as (left, bottom, right, top).
+    # Image coordinates: origin at top-left, y increases downward
+    # PDF coordinates: origin at bottom-left, y increases upward
+    def image_box_to_pdf(self, page_number, bbox, image_width, image_height):
+        key = (page_number, image_width, image_height)
+        if key not in self._transforms:
+            pdf_width, pdf_height = self.page_size(page_number)
+            self._transforms[key] = (pdf_width / image_width, pdf_height / image_height, pdf_height)
+        x_scale, y_scale, pdf_height = self._transforms[key]
+        return (
+            bbox[0] * x_scale,
+            pdf_height - (bbox[3] * y_scale),
+            bbox[2] * x_scale,
+            pdf_height - (bbox[1] * y_scale),
+        )
+
+
+# Returns a list of fillable PDF fields; see `FormIndex.field_info`.
+def get_field_info(reader: PdfReader):
+    return FormIndex(reader).field_info
 
 
 def write_field_info(pdf_path: str, json_output_path: str):
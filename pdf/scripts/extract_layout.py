@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+from page_ranges import parse_page_range
+
+
+# Extracts the words, text lines and table candidates of each page of a PDF, with their
+# coordinates, and writes them as JSON. Coordinates are in PDF points with the origin at
+# the top-left of the page (pdfplumber's `top`/`bottom` convention).
+#
+# Each page is opened once and all three are extracted from the same parsed page objects.
+# Pages are split into ranges that are extracted in parallel by worker processes. Results
+# are cached per page, keyed by the SHA-256 of the file and the page number, so repeated
+# queries on the same file only extract pages that haven't been seen before.
+
+
+# Bump when the format of the extracted data changes, to invalidate cached pages.
+LAYOUT_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "pdf_layout"
+)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def rounded(obj, keys):
+    return {k: round(obj[k], 2) if isinstance(obj[k], float) else obj[k] for k in keys if k in obj}
+
+
+# Extracts the layout of one pdfplumber page.
+def page_layout(page):
+    words = page.extract_words(extra_attrs=["fontname", "size"])
+    lines = page.extract_text_lines(return_chars=False)
+    tables = page.find_tables()
+    return {
+        "page_number": page.page_number,
+        "width": round(float(page.width), 2),
+        "height": round(float(page.height), 2),
+        "words": [rounded(w, ("text", "x0", "top", "x1", "bottom", "fontname", "size")) for w in words],
+        "lines": [rounded(line, ("text", "x0", "top", "x1", "bottom")) for line in lines],
+        "tables": [
+            {"bbox": [round(float(v), 2) for v in table.bbox], "rows": table.extract()}
+            for table in tables
+        ],
+    }
+
+
+class PageCache:
+    def __init__(self, cache_dir, file_hash):
+        self.dir = os.path.join(cache_dir, f"{file_hash}-v{LAYOUT_VERSION}")
+
+    def path(self, page_number):
+        return os.path.join(self.dir, f"page_{page_number}.json")
+
+    def get(self, page_number):
+        try:
+            with open(self.path(page_number)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, layout):
+        os.makedirs(self.dir, exist_ok=True)
+        path = self.path(layout["page_number"])
+        # Write to a temporary file first so concurrent readers never see a partial page
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(layout, f)
+        os.replace(tmp_path, path)
+
+
+# Extracts a range of pages in a worker process, caching each page as it is done.
+def extract_page_range(pdf_path, page_numbers, cache):
+    layouts = []
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            layout = page_layout(page)
+            if cache is not None:
+                cache.put(layout)
+            layouts.append(layout)
+            # Free the parsed page objects before moving on to the next page
+            page.close()
+    return layouts
+
+
+# Splits page numbers into contiguous ranges, several per worker so that slow pages
+# don't leave the other workers idle.
+def split_pages(page_numbers, workers):
+    if not page_numbers:
+        return []
+    size = max(1, -(-len(page_numbers) // (workers * 4)))
+    return [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+
+
+# Returns the layout of the requested pages (all by default) in page order.
+# `pages` is a page range string such as "1-5,8".
+def extract_layout(pdf_path, pages=None, workers=None, cache_dir=DEFAULT_CACHE_DIR, use_cache=True):
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+    page_numbers = parse_page_range(pages, page_count) if pages else list(range(1, page_count + 1))
+
+    cache = PageCache(cache_dir, file_sha256(pdf_path)) if use_cache else None
+    layouts = {}
+    if cache is not None:
+        for page_number in page_numbers:
+            layout = cache.get(page_number)
+            if layout is not None:
+                layouts[page_number] = layout
+    cached = len(layouts)
+
+    missing = [n for n in page_numbers if n not in layouts]
+    workers = min(workers or os.cpu_count() or 1, max(len(missing), 1))
+    ranges = split_pages(missing, workers)
+    if workers == 1:
+        results = (extract_page_range(pdf_path, r, cache) for r in ranges)
+        for result in results:
+            layouts.update((layout["page_number"], layout) for layout in result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(extract_page_range, pdf_path, r, cache) for r in ranges]
+            for future in futures:
+                layouts.update((layout["page_number"], layout) for layout in future.result())
+
+    return [layouts[n] for n in page_numbers], cached
+
+
+def write_layout(pdf_path, json_output_path, pages=None, workers=None, use_cache=True):
+    start = time.perf_counter()
+    layouts, cached = extract_layout(pdf_path, pages, workers, use_cache=use_cache)
+    with open(json_output_path, "w") as f:
+        json.dump({"pages": layouts}, f)
+    elapsed = time.perf_counter() - start
+    words = sum(len(p["words"]) for p in layouts)
+    tables = sum(len(p["tables"]) for p in layouts)
+    print(f"Wrote layout of {len(layouts)} pages ({cached} from cache; {words} words, {tables} tables) to {json_output_path} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    usage = "Usage: extract_layout.py [--pages 1-5,8] [--workers N] [--no-cache] [input pdf] [output json]"
+    args = sys.argv[1:]
+    options = {"--pages": None, "--workers": None}
+    for option in options:
+        if option in args:
+            i = args.index(option)
+            if i + 1 >= len(args) or args[i + 1].startswith("--"):
+                print(f"Error: {option} needs a value")
+                print(usage)
+                sys.exit(1)
+            options[option] = args[i + 1]
+            del args[i:i + 2]
+    use_cache = "--no-cache" not in args
+    if not use_cache:
+        args.remove("--no-cache")
+    if len(args) != 2 or (options["--workers"] and not options["--workers"].isdigit()):
+        print(usage)
+        sys.exit(1)
+    workers = int(options["--workers"]) if options["--workers"] else None
+    try:
+        write_layout(args[0], args[1], options["--pages"], workers, use_cache)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -3,7 +3,7 @@ import sys
 
 from pypdf import PdfReader, PdfWriter
 
-from extract_form_field_info import get_field_info
+from extract_form_field_info import FormIndex
 
 
 # Fills fillable form fields in a PDF. See forms.md.
@@ -25,8 +25,7 @@ def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path:
     reader = PdfReader(input_pdf_path)
 
     has_error = False
-    field_info = get_field_info(reader)
-    fields_by_ids = {f["field_id"]: f for f in field_info}
+    fields_by_ids = FormIndex(reader).fields_by_id
     for field in fields:
         existing_field = fields_by_ids.get(field["field_id"])
         if not existing_field:
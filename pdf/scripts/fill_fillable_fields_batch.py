@@ -0,0 +1,222 @@
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from pypdf import PdfReader, PdfWriter
+
+from extract_form_field_info import FormIndex
+from fill_fillable_fields import monkeypatch_pydpf_method, validation_error_for_field_value
+
+
+# Fills the fillable form fields of one template PDF for many records. See forms.md.
+#
+# Records are read from a JSONL file (one JSON object per line) or a CSV file (one
+# column per field). Each record maps field IDs to values, as in the "value" entries
+# of field_values.json. The optional "_output" key/column gives the output file name
+# (relative to the output directory, which it may not leave; each name may be used once);
+# otherwise records are written as record_<n>.pdf. Empty CSV cells are left unfilled.
+#
+# The template and its field metadata are parsed once. Records are validated in the
+# main process and filled by a pool of worker processes that each load the template once.
+# Records that cannot be parsed, validated or filled are reported and skipped; the other
+# records are still filled.
+
+
+OUTPUT_KEY = "_output"
+# Records sent to a worker at a time.
+CHUNK_SIZE = 16
+
+
+# Field metadata computed once per template and used to validate every record.
+class TemplateFields:
+    def __init__(self, form_index):
+        self.field_info_by_id = form_index.fields_by_id
+        self.page_by_id = {field_id: f["page"] for field_id, f in self.field_info_by_id.items()}
+        # Valid values for checkbox, radio group and choice fields.
+        self.allowed_values_by_id = {}
+        for f in form_index.field_info:
+            if f["type"] == "checkbox":
+                self.allowed_values_by_id[f["field_id"]] = {f.get("checked_value"), f.get("unchecked_value")}
+            elif f["type"] == "radio_group":
+                self.allowed_values_by_id[f["field_id"]] = {opt["value"] for opt in f["radio_options"]}
+            elif f["type"] == "choice":
+                self.allowed_values_by_id[f["field_id"]] = {opt["value"] for opt in f["choice_options"]}
+
+    # Returns a list of error messages for a record (empty if it is valid).
+    def validation_errors(self, values):
+        errors = []
+        for field_id, value in values.items():
+            if field_id not in self.page_by_id:
+                errors.append(f"ERROR: `{field_id}` is not a valid field ID")
+                continue
+            allowed = self.allowed_values_by_id.get(field_id)
+            if allowed is not None and not isinstance(value, str):
+                errors.append(f"ERROR: Value for `{field_id}` must be a string, not {json.dumps(value)}")
+            elif allowed is not None and value not in allowed:
+                errors.append(validation_error_for_field_value(self.field_info_by_id[field_id], value))
+        return errors
+
+    # Groups a record's values by page number, as `update_page_form_field_values` expects.
+    def values_by_page(self, values):
+        by_page = {}
+        for field_id, value in values.items():
+            by_page.setdefault(self.page_by_id[field_id], {})[field_id] = value
+        return by_page
+
+
+# Yields (record number, record, error) triples from a JSONL or CSV file; record is None
+# and error a message for lines that are not JSON objects.
+def read_records(records_path):
+    with open(records_path, newline="") as f:
+        if records_path.lower().endswith(".csv"):
+            for n, row in enumerate(csv.DictReader(f), start=1):
+                yield n, {k: v for k, v in row.items() if k and v not in (None, "")}, None
+        else:
+            n = 0
+            for line in f:
+                if line.strip():
+                    n += 1
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield n, None, f"ERROR: Invalid JSON: {e}"
+                        continue
+                    if not isinstance(record, dict):
+                        yield n, None, "ERROR: Record is not a JSON object"
+                        continue
+                    yield n, record, None
+
+
+# Template reader shared by all records filled in a worker process.
+_template_reader = None
+
+
+def init_worker(template_path):
+    global _template_reader
+    monkeypatch_pydpf_method()
+    _template_reader = PdfReader(template_path)
+
+
+# Fills a list of (record number, output path, values by page) jobs; returns the number
+# of files written and a list of (record number, error message) for the records that failed.
+def fill_records(jobs):
+    written = 0
+    failures = []
+    for n, output_path, values_by_page in jobs:
+        try:
+            # Cloning leaves the template reader unchanged, so it can be reused for every record.
+            writer = PdfWriter(clone_from=_template_reader)
+            for page, field_values in values_by_page.items():
+                writer.update_page_form_field_values(writer.pages[page - 1], field_values, auto_regenerate=False)
+            writer.set_need_appearances_writer(True)
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            with open(output_path, "wb") as f:
+                writer.write(f)
+            written += 1
+        except Exception as e:
+            failures.append((n, f"ERROR: Could not fill {output_path}: {type(e).__name__}: {e}"))
+    return written, failures
+
+
+# Returns the path for an output file name, or an error message if the name is not a
+# string or leaves the output directory.
+def output_path_for(output_dir, output_name):
+    if not isinstance(output_name, str):
+        return None, f"ERROR: `{OUTPUT_KEY}` must be a string, not {json.dumps(output_name)}"
+    root = os.path.abspath(output_dir)
+    path = os.path.normpath(os.path.join(root, output_name))
+    if os.path.commonpath([root, path]) != root or path == root:
+        return None, f"ERROR: Output file `{output_name}` is outside the output directory"
+    return path, None
+
+
+def fill_pdf_batch(template_pdf_path: str, records_path: str, output_dir: str, workers=None):
+    template_fields = TemplateFields(FormIndex(PdfReader(template_pdf_path)))
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    invalid = 0
+
+    def report_invalid(n, errors):
+        nonlocal invalid
+        invalid += 1
+        for err in errors:
+            print(f"Record {n}: {err}")
+
+    # Validates records as they are read and yields the valid ones as fill jobs.
+    def jobs():
+        # Output path (normalized for the file system) -> number of the record using it.
+        records_by_output = {}
+        for n, record, error in read_records(records_path):
+            if error:
+                report_invalid(n, [error])
+                continue
+            values = dict(record)
+            output_path, error = output_path_for(output_dir, values.pop(OUTPUT_KEY, None) or f"record_{n}.pdf")
+            errors = template_fields.validation_errors(values)
+            if output_path is not None:
+                other = records_by_output.setdefault(os.path.normcase(output_path), n)
+                if other != n:
+                    error = f"ERROR: Output file `{os.path.relpath(output_path, output_dir)}` is already used by record {other}"
+            if error:
+                errors.insert(0, error)
+            if errors:
+                report_invalid(n, errors)
+                continue
+            yield n, output_path, template_fields.values_by_page(values)
+
+    start = time.perf_counter()
+    filled = 0
+    job_iter = iter(jobs())
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(template_pdf_path,)) as executor:
+        # Keep a bounded number of chunks in flight so records are streamed, not all loaded.
+        pending = {}
+        while True:
+            while len(pending) < workers * 2:
+                chunk = list(islice(job_iter, CHUNK_SIZE))
+                if not chunk:
+                    break
+                pending[executor.submit(fill_records, chunk)] = chunk
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    written, failures = future.result()
+                except Exception as e:
+                    # The worker itself failed (e.g. it was killed); none of its records were written.
+                    written, failures = 0, [(n, f"ERROR: Worker failed: {type(e).__name__}: {e}") for n, _, _ in chunk]
+                filled += written
+                for n, error in failures:
+                    report_invalid(n, [error])
+    elapsed = time.perf_counter() - start
+
+    rate = filled / elapsed if elapsed > 0 else 0
+    print(f"Filled {filled} records in {elapsed:.1f}s ({rate:.1f} records/s) using {workers} worker(s)")
+    if invalid:
+        print(f"Skipped {invalid} invalid record(s)")
+    return filled, invalid
+
+
+if __name__ == "__main__":
+    usage = "Usage: fill_fillable_fields_batch.py [--workers N] [input pdf] [records.jsonl or records.csv] [output directory]"
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        if i + 1 >= len(args) or not args[i + 1].isdigit():
+            print(usage)
+            sys.exit(1)
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) != 3:
+        print(usage)
+        sys.exit(1)
+    filled, invalid = fill_pdf_batch(args[0], args[1], args[2], workers)
+    if invalid:
+        sys.exit(1)
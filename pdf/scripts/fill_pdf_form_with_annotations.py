@@ -3,26 +3,70 @@ import sys
 
 from pypdf import PdfReader, PdfWriter
 from pypdf.annotations import FreeText
+from pypdf.generic import ArrayObject, DictionaryObject, NameObject, RectangleObject, TextStringObject
+
+from extract_form_field_info import FormIndex
 
 
 # Fills a PDF by adding text annotations defined in `fields.json`. See forms.md.
 
 
-def transform_coordinates(bbox, image_width, image_height, pdf_width, pdf_height):
-    """Transform bounding box from image coordinates to PDF coordinates"""
-    # Image coordinates: origin at top-left, y increases downward
-    # PDF coordinates: origin at bottom-left, y increases upward
-    x_scale = pdf_width / image_width
-    y_scale = pdf_height / image_height
-    
-    left = bbox[0] * x_scale
-    right = bbox[2] * x_scale
-    
-    # Flip Y coordinates for PDF
-    top = pdf_height - (bbox[1] * y_scale)
-    bottom = pdf_height - (bbox[3] * y_scale)
-    
-    return left, bottom, right, top
+# Adds many FreeText annotations to a writer at once. `writer.add_annotation` looks up
+# the page and appends to its `/Annots` array for every annotation; here annotations are
+# grouped by page and each page's `/Annots` array is extended once. The entries that only
+# depend on the text style (font, size and color) are built once per style and shared by
+# all annotations with that style, and the border style is a single shared object.
+class AnnotationBatch:
+    def __init__(self, writer):
+        self.writer = writer
+        self.annotations_by_page = {}
+        self._styles = {}
+
+    # Entries of a FreeText annotation that only depend on its style.
+    def style(self, font, font_size, font_color):
+        key = (font, font_size, font_color)
+        if key not in self._styles:
+            # Font size/color seems to not work reliably across viewers:
+            # https://github.com/py-pdf/pypdf/issues/2084
+            template = FreeText(
+                text="",
+                rect=(0, 0, 0, 0),
+                font=font,
+                font_size=font_size,
+                font_color=font_color,
+                border_color=None,
+                background_color=None,
+            )
+            style = {k: v for k, v in template.items() if k not in ("/Rect", "/Contents")}
+            if "/BS" in style:
+                style[NameObject("/BS")] = self.writer._add_object(style["/BS"])
+            self._styles[key] = style
+        return self._styles[key]
+
+    # Queues an annotation; `page_number` is 1-based.
+    def add(self, page_number, text, rect, style):
+        annotation = DictionaryObject(style)
+        annotation[NameObject("/Rect")] = RectangleObject(rect)
+        annotation[NameObject("/Contents")] = TextStringObject(text)
+        self.annotations_by_page.setdefault(page_number, []).append(annotation)
+
+    # Adds all queued annotations to their pages; returns the number added.
+    def write_annotations(self):
+        count = 0
+        for page_number, annotations in self.annotations_by_page.items():
+            page = self.writer.pages[page_number - 1]
+            refs = []
+            for annotation in annotations:
+                annotation[NameObject("/P")] = page.indirect_reference
+                refs.append(self.writer._add_object(annotation))
+            existing = page.get("/Annots")
+            if existing is None:
+                page[NameObject("/Annots")] = ArrayObject(refs)
+            else:
+                existing.get_object().extend(refs)
+            count += len(refs)
+        self.annotations_by_page = {}
+        return count
 
 
 def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
@@ -39,27 +83,21 @@ def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
     # Copy all pages to writer
     writer.append(reader)
     
-    # Get PDF dimensions for each page
-    pdf_dimensions = {}
-    for i, page in enumerate(reader.pages):
-        mediabox = page.mediabox
-        pdf_dimensions[i + 1] = [mediabox.width, mediabox.height]
+    # Page sizes and image-to-PDF transforms are computed once per page
+    form_index = FormIndex(reader)
+    pages_by_number = {p["page_number"]: p for p in fields_data["pages"]}
     
     # Process each form field
-    annotations = []
+    batch = AnnotationBatch(writer)
     for field in fields_data["form_fields"]:
         page_num = field["page_number"]
         
         # Get page dimensions and transform coordinates.
-        page_info = next(p for p in fields_data["pages"] if p["page_number"] == page_num)
-        image_width = page_info["image_width"]
-        image_height = page_info["image_height"]
-        pdf_width, pdf_height = pdf_dimensions[page_num]
-        
-        transformed_entry_box = transform_coordinates(
+        page_info = pages_by_number[page_num]
+        transformed_entry_box = form_index.image_box_to_pdf(
+            page_num,
             field["entry_bounding_box"],
-            image_width, image_height,
-            pdf_width, pdf_height
+            page_info["image_width"], page_info["image_height"]
         )
         
         # Skip empty fields
@@ -73,28 +111,15 @@ def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
         font_name = entry_text.get("font", "Arial")
         font_size = str(entry_text.get("font_size", 14)) + "pt"
         font_color = entry_text.get("font_color", "000000")
-
-        # Font size/color seems to not work reliably across viewers:
-        # https://github.com/py-pdf/pypdf/issues/2084
-        annotation = FreeText(
-            text=text,
-            rect=transformed_entry_box,
-            font=font_name,
-            font_size=font_size,
-            font_color=font_color,
-            border_color=None,
-            background_color=None,
-        )
-        annotations.append(annotation)
-        # page_number is 0-based for pypdf
-        writer.add_annotation(page_number=page_num - 1, annotation=annotation)
+        batch.add(page_num, text, transformed_entry_box, batch.style(font_name, font_size, font_color))
+    annotation_count = batch.write_annotations()
         
     # Save the filled PDF
     with open(output_pdf_path, "wb") as output:
         writer.write(output)
     
     print(f"Successfully filled PDF form and saved to {output_pdf_path}")
-    print(f"Added {len(annotations)} text annotations")
+    print(f"Added {annotation_count} text annotations")
 
 
 if __name__ == "__main__":
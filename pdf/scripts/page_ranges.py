@@ -0,0 +1,21 @@
+# Page range parsing shared by the scripts that accept a --pages option. Kept in its own
+# module so that importing it doesn't pull in rendering dependencies such as pdf2image.
+
+
+# Parses a page range such as "1-5,8,10-" into a sorted list of 1-based page numbers.
+def parse_page_range(spec, page_count):
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            start = int(start) if start else 1
+            end = int(end) if end else page_count
+        else:
+            start = end = int(part)
+        if start < 1 or end > page_count or start > end:
+            raise ValueError(f"Invalid page range '{part}' for a PDF with {page_count} pages")
+        pages.update(range(start, end + 1))
+    return sorted(pages)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Downsample and recompress the images of an unpacked Office document.
+
+The size each picture is displayed at is read from the slide/document XML
+(including cropping and group scaling). Images larger than needed for the
+target effective DPI are downsampled, JPEGs are re-encoded at the given quality
+and PNGs are optimized losslessly. A file is only replaced when the result is
+smaller. Images whose displayed size cannot be determined (e.g. used by charts,
+tiled fills or inherited placeholders) are recompressed but not resized.
+
+Example usage:
+    python optimize_images.py <input_directory> [--dpi 150] [--jpeg-quality 85] [--jobs 4]
+"""
+
+import argparse
+import io
+import math
+import os
+import posixpath
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import lxml.etree
+
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+
+EMU_PER_INCH = 914400
+RESIZABLE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+# Elements that own a picture's size; searching stops at the first one
+SHAPE_ELEMENTS = {"sp", "pic", "cxnSp", "graphicFrame"}
+# Skip resizing when it would shrink the image by less than this factor
+MIN_RESIZE_FACTOR = 0.9
+
+
+def _local(tag):
+    return tag.rpartition("}")[2] if isinstance(tag, str) else ""
+
+
+def _ext_size(xfrm):
+    """(cx, cy) of an xfrm's ext element, or None."""
+    if xfrm is None:
+        return None
+    ext = xfrm.find(f"{{{A_NS}}}ext")
+    if ext is None or ext.get("cx") is None:
+        return None
+    return int(ext.get("cx")), int(ext.get("cy"))
+
+
+def _group_scale(elem):
+    """Scale applied by enclosing groups (ext / chExt), as (sx, sy)."""
+    sx = sy = 1.0
+    for group in elem.iterancestors():
+        if _local(group.tag) != "grpSp":
+            continue
+        for child in group:
+            if _local(child.tag) == "grpSpPr":
+                xfrm = child.find(f"{{{A_NS}}}xfrm")
+                ext = _ext_size(xfrm)
+                ch_ext = xfrm.find(f"{{{A_NS}}}chExt") if xfrm is not None else None
+                if ext and ch_ext is not None and int(ch_ext.get("cx", 0)) > 0:
+                    sx *= ext[0] / int(ch_ext.get("cx"))
+                    sy *= ext[1] / max(int(ch_ext.get("cy", 1)), 1)
+    return sx, sy
+
+
+def displayed_extent(blip, page_size=None):
+    """Size (cx, cy) in EMU at which the picture of an a:blip is displayed.
+
+    Returns None when the size cannot be determined or the picture is tiled.
+    """
+    blip_fill = blip.getparent()
+    if blip_fill is not None and blip_fill.find(f"{{{A_NS}}}tile") is not None:
+        return None
+
+    for ancestor in blip.iterancestors():
+        local = _local(ancestor.tag)
+        if local == "bg":
+            # Slide backgrounds fill the slide
+            return page_size
+        if local in ("inline", "anchor"):
+            # Word drawings: wp:extent
+            for child in ancestor:
+                if _local(child.tag) == "extent":
+                    return int(child.get("cx")), int(child.get("cy"))
+        if local == "spPr":
+            size = _ext_size(ancestor.find(f"{{{A_NS}}}xfrm"))
+        else:
+            size = None
+            for child in ancestor:
+                if _local(child.tag) == "spPr":
+                    size = _ext_size(child.find(f"{{{A_NS}}}xfrm"))
+                    break
+        if size:
+            sx, sy = _group_scale(ancestor)
+            return size[0] * sx, size[1] * sy
+        if local in SHAPE_ELEMENTS:
+            # e.g. a placeholder whose size is inherited from the layout
+            return None
+    return None
+
+
+def _visible_fraction(blip):
+    """Fraction (fx, fy) of the image left visible by a:srcRect cropping."""
+    blip_fill = blip.getparent()
+    src_rect = blip_fill.find(f"{{{A_NS}}}srcRect") if blip_fill is not None else None
+    if src_rect is None:
+        return 1.0, 1.0
+    crop = {k: int(src_rect.get(k, 0)) / 100000 for k in ("l", "t", "r", "b")}
+    fx = max(1.0 - crop["l"] - crop["r"], 0.01)
+    fy = max(1.0 - crop["t"] - crop["b"], 0.01)
+    return fx, fy
+
+
+def _rels_targets(rels_file, base_dir):
+    """Map rId -> target path for the internal relationships in rels_file."""
+    targets = {}
+    root = lxml.etree.parse(str(rels_file)).getroot()
+    for rel in root.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = posixpath.join(base_dir.as_posix(), rel.get("Target", ""))
+        targets[rel.get("Id")] = Path(posixpath.normpath(target))
+    return targets
+
+
+def _merge(needed, other):
+    """Combine two pixel requirements; None (unknown) wins."""
+    if needed is None or other is None:
+        return None
+    return max(needed[0], other[0]), max(needed[1], other[1])
+
+
+def _page_size(content_dir):
+    """Slide size in EMU for presentations, else None."""
+    presentation = content_dir / "ppt" / "presentation.xml"
+    if not presentation.exists():
+        return None
+    sld_sz = lxml.etree.parse(str(presentation)).getroot().find(f"{{{P_NS}}}sldSz")
+    if sld_sz is None:
+        return None
+    return int(sld_sz.get("cx")), int(sld_sz.get("cy"))
+
+
+def collect_image_requirements(content_dir, dpi):
+    """Pixel size each media image needs for dpi, keyed by image path.
+
+    The value is (width, height) in pixels, or None if any use of the image
+    has an unknown size (such images are not resized).
+    """
+    content_dir = Path(content_dir).resolve()
+    page_size = _page_size(content_dir)
+    requirements = {}
+
+    for rels_file in content_dir.rglob("*.rels"):
+        # word/_rels/document.xml.rels belongs to word/document.xml
+        part = rels_file.parent.parent / rels_file.name[: -len(".rels")]
+        media = {
+            rid: target
+            for rid, target in _rels_targets(rels_file, part.parent).items()
+            if target.parent.name == "media"
+        }
+        if not media:
+            continue
+
+        # Size needed by each picture of this part; other uses (VML, OLE
+        # previews, non-XML parts) leave the requirement unknown
+        needs = {}
+        if part.suffix == ".xml" and part.is_file():
+            root = lxml.etree.parse(str(part)).getroot()
+            for blip in root.iter(f"{{{A_NS}}}blip"):
+                rid = blip.get(R_EMBED)
+                if rid not in media:
+                    continue
+                extent = displayed_extent(blip, page_size)
+                needed = None
+                if extent is not None:
+                    fx, fy = _visible_fraction(blip)
+                    needed = (
+                        math.ceil(extent[0] / EMU_PER_INCH * dpi / fx),
+                        math.ceil(extent[1] / EMU_PER_INCH * dpi / fy),
+                    )
+                needs[rid] = _merge(needed, needs[rid]) if rid in needs else needed
+
+        for rid, image in media.items():
+            needed = needs.get(rid)
+            if image in requirements:
+                needed = _merge(needed, requirements[image])
+            requirements[image] = needed
+
+    return requirements
+
+
+def optimize_image(path, needed, jpeg_quality=85):
+    """Downsample and recompress one image in place.
+
+    Args:
+        path: Image file
+        needed: (width, height) in pixels the image must keep, or None to
+            only recompress
+        jpeg_quality: JPEG quality for re-encoding
+
+    Returns:
+        tuple: (bytes before, bytes after)
+    """
+    from PIL import Image
+
+    before = path.stat().st_size
+    with Image.open(path) as img:
+        fmt = img.format
+        if fmt not in ("JPEG", "PNG"):
+            return before, before
+
+        scale = 1.0
+        if needed:
+            scale = max(needed[0] / img.width, needed[1] / img.height)
+        resize = scale < MIN_RESIZE_FACTOR
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+
+        if resize and fmt == "JPEG":
+            # Let the decoder skip detail we are about to throw away
+            img.draft(img.mode, size)
+        info = dict(img.info)
+        img.load()
+        if resize:
+            if img.mode in ("1", "P"):
+                # Palette images can only be resized with nearest-neighbour
+                img = img.convert("RGBA" if "transparency" in info else "RGB")
+                info.pop("transparency", None)
+            img = img.resize(size, Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        if fmt == "JPEG":
+            img.save(
+                buffer,
+                "JPEG",
+                quality=jpeg_quality,
+                optimize=True,
+                icc_profile=info.get("icc_profile"),
+                exif=info.get("exif", b""),
+                dpi=info.get("dpi", (72, 72)),
+            )
+        else:
+            params = {"optimize": True}
+            for key in ("icc_profile", "transparency", "dpi"):
+                if key in info:
+                    params[key] = info[key]
+            img.save(buffer, "PNG", **params)
+
+    data = buffer.getvalue()
+    if len(data) >= before:
+        return before, before
+    path.write_bytes(data)
+    return before, len(data)
+
+
+def optimize_images(content_dir, dpi=150, jpeg_quality=85, jobs=None):
+    """Downsample and recompress all JPEG/PNG media of an unpacked document.
+
+    Args:
+        content_dir: Path to unpacked Office document directory
+        dpi: Target effective resolution at the displayed size
+        jpeg_quality: JPEG quality for re-encoding
+        jobs: Number of images processed in parallel (default: CPU count)
+
+    Returns:
+        tuple: (images changed, bytes before, bytes after)
+    """
+    content_dir = Path(content_dir).resolve()
+    requirements = collect_image_requirements(content_dir, dpi)
+    images = sorted(
+        f
+        for f in content_dir.rglob("*")
+        if f.is_file()
+        and f.parent.name == "media"
+        and f.suffix.lower() in RESIZABLE_EXTENSIONS
+    )
+
+    def run(image):
+        try:
+            return optimize_image(image, requirements.get(image), jpeg_quality)
+        except Exception as e:
+            print(f"Warning: Could not optimize {image.name}: {e}", file=sys.stderr)
+            size = image.stat().st_size
+            return size, size
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        results = list(executor.map(run, images))
+
+    changed = sum(1 for before, after in results if after < before)
+    return (
+        changed,
+        sum(before for before, _ in results),
+        sum(after for _, after in results),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Downsample and recompress images of an unpacked Office document"
+    )
+    parser.add_argument("input_directory", help="Unpacked Office document directory")
+    parser.add_argument(
+        "--dpi", type=int, default=150, help="Target effective DPI (default: 150)"
+    )
+    parser.add_argument(
+        "--jpeg-quality", type=int, default=85, help="JPEG quality (default: 85)"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="Images processed in parallel"
+    )
+    args = parser.parse_args()
+
+    if not Path(args.input_directory).is_dir():
+        sys.exit(f"Error: {args.input_directory} is not a directory")
+
+    changed, before, after = optimize_images(
+        args.input_directory, args.dpi, args.jpeg_quality, args.jobs
+    )
+    print(
+        f"Optimized {changed} image(s): "
+        f"{before / (1024 * 1024):.1f} MB -> {after / (1024 * 1024):.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,19 @@
 """
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
+Identical media files (e.g. the same logo stored as several media/imageN.png)
+are collapsed into one part and the relationships pointing at them are updated.
+With --optimize-images, pictures are also downsampled to the resolution they
+are displayed at and recompressed (see optimize_images.py).
+
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--keep-duplicate-media]
+    python pack.py <input_directory> <office_file> --optimize-images [--image-dpi 150]
 """
 
 import argparse
+import hashlib
+import posixpath
 import shutil
 import subprocess
 import sys
@@ -21,11 +29,38 @@ def main():
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--keep-duplicate-media",
+        action="store_true",
+        help="Do not collapse identical media files into one part",
+    )
+    parser.add_argument(
+        "--optimize-images",
+        action="store_true",
+        help="Downsample images to their displayed size and recompress them",
+    )
+    parser.add_argument(
+        "--image-dpi",
+        type=int,
+        default=150,
+        help="Target effective DPI for --optimize-images (default: 150)",
+    )
+    parser.add_argument(
+        "--jpeg-quality",
+        type=int,
+        default=85,
+        help="JPEG quality for --optimize-images (default: 85)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            dedupe_media=not args.keep_duplicate_media,
+            image_dpi=args.image_dpi if args.optimize_images else None,
+            jpeg_quality=args.jpeg_quality,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +77,24 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    dedupe_media=True,
+    image_dpi=None,
+    jpeg_quality=85,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        dedupe_media: If True, stores identical media files once (default: True)
+        image_dpi: If set, downsamples images to this effective DPI at their
+            displayed size and recompresses them (default: None)
+        jpeg_quality: JPEG quality used when image_dpi is set (default: 85)
 
     Returns:
         bool: True if successful, False if validation failed
@@ -71,6 +117,28 @@ def pack_document(input_dir, output_file, validate=False):
             for xml_file in temp_content_dir.rglob(pattern):
                 condense_xml(xml_file)
 
+        if dedupe_media:
+            removed, saved = deduplicate_media(temp_content_dir)
+            if removed:
+                print(
+                    f"Removed {removed} duplicate media file(s), "
+                    f"saving {saved / (1024 * 1024):.1f} MB"
+                )
+
+        if image_dpi:
+            if __package__:
+                from .optimize_images import optimize_images
+            else:
+                from optimize_images import optimize_images
+
+            changed, before, after = optimize_images(
+                temp_content_dir, dpi=image_dpi, jpeg_quality=jpeg_quality
+            )
+            print(
+                f"Optimized {changed} image(s): "
+                f"{before / (1024 * 1024):.1f} MB -> {after / (1024 * 1024):.1f} MB"
+            )
+
         # Create final Office file as zip archive
         output_file.parent.mkdir(parents=True, exist_ok=True)
         with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
@@ -130,6 +198,98 @@ def validate_document(doc_path):
             return False
 
 
+def _file_digest(path):
+    """SHA-256 of a file's contents."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def deduplicate_media(content_dir):
+    """Collapse identical files in media folders into one part.
+
+    Relationship targets that point at a duplicate are redirected to the kept
+    copy, the duplicate is deleted and its [Content_Types].xml override (if
+    any) is removed.
+
+    Returns:
+        tuple: (number of files removed, bytes saved)
+    """
+    content_dir = Path(content_dir)
+    media_files = sorted(
+        f for f in content_dir.rglob("*") if f.is_file() and f.parent.name == "media"
+    )
+
+    # Only files of the same size and extension can be identical; hash those
+    by_size = {}
+    for f in media_files:
+        by_size.setdefault((f.suffix.lower(), f.stat().st_size), []).append(f)
+
+    duplicates = {}  # Part name of duplicate -> part name of kept copy
+    saved = 0
+    for (_, size), files in by_size.items():
+        if len(files) < 2:
+            continue
+        kept = {}
+        for f in files:
+            digest = _file_digest(f)
+            part_name = "/" + f.relative_to(content_dir).as_posix()
+            if digest in kept:
+                duplicates[part_name] = kept[digest]
+                saved += size
+            else:
+                kept[digest] = part_name
+
+    if not duplicates:
+        return 0, 0
+
+    # Point relationships at the kept copies
+    for rels_file in content_dir.rglob("*.rels"):
+        # word/_rels/document.xml.rels holds targets relative to word/
+        source_dir = "/" + rels_file.parent.parent.relative_to(content_dir).as_posix()
+        with open(rels_file, "r", encoding="utf-8") as f:
+            dom = defusedxml.minidom.parse(f)
+
+        changed = False
+        for rel in dom.getElementsByTagName("Relationship"):
+            target = rel.getAttribute("Target")
+            if rel.getAttribute("TargetMode") == "External" or not target:
+                continue
+            part_name = posixpath.normpath(posixpath.join(source_dir, target))
+            if part_name in duplicates:
+                kept = duplicates[part_name]
+                rel.setAttribute(
+                    "Target",
+                    kept if target.startswith("/") else posixpath.relpath(kept, source_dir),
+                )
+                changed = True
+
+        if changed:
+            with open(rels_file, "wb") as f:
+                f.write(dom.toxml(encoding="UTF-8"))
+
+    # Drop content type overrides of removed parts
+    content_types_file = content_dir / "[Content_Types].xml"
+    if content_types_file.exists():
+        with open(content_types_file, "r", encoding="utf-8") as f:
+            dom = defusedxml.minidom.parse(f)
+        changed = False
+        for override in dom.getElementsByTagName("Override"):
+            if override.getAttribute("PartName") in duplicates:
+                override.parentNode.removeChild(override)
+                changed = True
+        if changed:
+            with open(content_types_file, "wb") as f:
+                f.write(dom.toxml(encoding="UTF-8"))
+
+    for part_name in duplicates:
+        (content_dir / part_name.lstrip("/")).unlink()
+
+    return len(duplicates), saved
+
+
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
     with open(xml_file, "r", encoding="utf-8") as f:
@@ -3,10 +3,21 @@ Base validator with common validation logic for document files.
 """
 
 import re
+import time
+from collections import defaultdict
 from pathlib import Path
 
 import lxml.etree
 
+from .rules import (
+    ContentTypeRule,
+    NamespaceRule,
+    RelationshipIdRule,
+    UniqueIdRule,
+    WellFormedRule,
+    XmlPart,
+)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,10 +114,14 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(self, unpacked_dir, original_file, verbose=False, timing=False):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        self.timing = timing
+        self.timings = defaultdict(float)  # Check name -> seconds
+        self._rels_roots = {}  # Parsed .rels files shared between rules
+        self._schemas = {}  # Compiled XSD schemas by path
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -124,155 +139,136 @@ class BaseSchemaValidator:
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
-    def validate_xml(self):
-        """Validate that all XML files are well-formed."""
-        errors = []
-
+    def parse_part(self, path):
+        """Parse an XML part; .rels files are parsed once and shared."""
+        if path.suffix != ".rels":
+            return lxml.etree.parse(str(path)).getroot()
+        if path not in self._rels_roots:
+            self._rels_roots[path] = lxml.etree.parse(str(path)).getroot()
+        return self._rels_roots[path]
+
+    def walk_parts(self, rules):
+        """Parse every XML part once and feed it to all rules in one traversal."""
+        local_names = {}  # Qualified name -> lowercase local name
         for xml_file in self.xml_files:
+            active = [rule for rule in rules if rule.wants_part(xml_file)]
+            if not active:
+                continue
+
+            start = time.perf_counter()
             try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
+                root = self.parse_part(xml_file)
             except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+                for rule in active:
+                    rule.parse_failed(xml_file, e)
+                continue
+            finally:
+                self.timings["parse"] += time.perf_counter() - start
 
-        if errors:
-            print(f"FAILED - Found {len(errors)} XML violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All XML files are well-formed")
-            return True
+            self._walk_part(XmlPart(xml_file, root), active, local_names)
 
-    def validate_namespaces(self):
-        """Validate that namespace prefixes in Ignorable attributes are declared."""
-        errors = []
+        for rule in rules:
+            self.timings[rule.name] += rule.elapsed
 
-        for xml_file in self.xml_files:
+    def _walk_part(self, part, rules, local_names):
+        """Dispatch one part's elements to the rules that handle them."""
+        for rule in list(rules):
+            try:
+                self._hook(rule, rule.start_part)(part)
+            except Exception as e:
+                rule.part_failed(part.path, e)
+                rules.remove(rule)
+
+        every, by_tag, attributes = self._handlers(rules)
+        if every or by_tag or attributes:
+            for elem in part.root.iter(lxml.etree.Element):
+                tag = elem.tag
+                local = local_names.get(tag)
+                if local is None:
+                    local = local_names[tag] = tag.rpartition("}")[2].lower()
+                try:
+                    for rule, handler in every:
+                        handler(part, elem, local)
+                    for rule, handler in by_tag.get(local, ()):
+                        handler(part, elem, local)
+                    if attributes:
+                        for attr, value in elem.items():
+                            name = local_names.get(attr)
+                            if name is None:
+                                name = local_names[attr] = attr.rpartition("}")[2].lower()
+                            for rule, handler in attributes:
+                                handler(part, elem, name, value)
+                except Exception as e:
+                    # The failing rule gives up on this part, the others continue
+                    rule.part_failed(part.path, e)
+                    rules.remove(rule)
+                    every, by_tag, attributes = self._handlers(rules)
+
+        for rule in rules:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
+                self._hook(rule, rule.end_part)(part)
+            except Exception as e:
+                rule.part_failed(part.path, e)
+
+    def _handlers(self, rules):
+        """Element, per-tag and attribute handlers of rules."""
+        every, by_tag, attributes = [], {}, []
+        for rule in rules:
+            if rule.all_elements:
+                every.append((rule, self._hook(rule, rule.visit_element)))
+            else:
+                for tag in rule.tags:
+                    by_tag.setdefault(tag, []).append(
+                        (rule, self._hook(rule, rule.visit_element))
                     )
-            except lxml.etree.XMLSyntaxError:
-                continue
-
-        if errors:
-            print(f"FAILED - {len(errors)} namespace issues:")
-            for error in errors:
-                print(error)
-            return False
-        if self.verbose:
-            print("PASSED - All namespace prefixes properly declared")
-        return True
+            if rule.attributes:
+                attributes.append((rule, self._hook(rule, rule.visit_attribute)))
+        return every, by_tag, attributes
 
-    def validate_unique_ids(self):
-        """Validate that specific IDs are unique according to OOXML requirements."""
-        errors = []
-        global_ids = {}  # Track globally unique IDs across all files
+    def _hook(self, rule, hook):
+        """Return hook, timed into rule.elapsed when timing is enabled."""
+        if not self.timing:
+            return hook
 
-        for xml_file in self.xml_files:
+        def timed(*args):
+            start = time.perf_counter()
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+                hook(*args)
+            finally:
+                rule.elapsed += time.perf_counter() - start
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
+        return timed
 
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+    def run_rule(self, rule):
+        """Run a single rule over all parts and report its result."""
+        self.walk_parts([rule])
+        return rule.report()
 
-        if errors:
-            print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All required IDs are unique")
-            return True
+    def run_check(self, name, check):
+        """Run a check that does its own traversal, recording its time."""
+        start = time.perf_counter()
+        try:
+            return check()
+        finally:
+            self.timings[name] += time.perf_counter() - start
+
+    def print_timings(self):
+        """Print the time spent per check, slowest first."""
+        print("Timings:")
+        for name, seconds in sorted(self.timings.items(), key=lambda x: -x[1]):
+            print(f"  {name}: {seconds:.3f}s")
+
+    def validate_xml(self):
+        """Validate that all XML files are well-formed."""
+        return self.run_rule(WellFormedRule(self))
+
+    def validate_namespaces(self):
+        """Validate that namespace prefixes in Ignorable attributes are declared."""
+        return self.run_rule(NamespaceRule(self))
+
+    def validate_unique_ids(self):
+        """Validate that specific IDs are unique according to OOXML requirements."""
+        return self.run_rule(UniqueIdRule(self))
 
     def validate_file_references(self):
         """
@@ -390,98 +386,7 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
-        errors = []
-
-        # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
-            # Skip .rels files themselves
-            if xml_file.suffix == ".rels":
-                continue
-
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
-            # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
-                continue
-
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
-            for error in errors:
-                print(error)
-            print("\nThese ID mismatches will cause the document to appear corrupt!")
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All relationship ID references are valid")
-            return True
+        return self.run_rule(RelationshipIdRule(self))
 
     def _get_expected_relationship_type(self, element_name):
         """
@@ -521,122 +426,7 @@ class BaseSchemaValidator:
 
     def validate_content_types(self):
         """Validate that all content files are properly declared in [Content_Types].xml."""
-        errors = []
-
-        # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
-            print("FAILED - [Content_Types].xml file not found")
-            return False
-
-        try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
-
-            # Root elements that require content type declaration
-            declarable_roots = {
-                "sld",
-                "sldLayout",
-                "sldMaster",
-                "presentation",  # PowerPoint
-                "document",  # Word
-                "workbook",
-                "worksheet",  # Excel
-                "theme",  # Common
-            }
-
-            # Common media file extensions that should be declared
-            media_extensions = {
-                "png": "image/png",
-                "jpg": "image/jpeg",
-                "jpeg": "image/jpeg",
-                "gif": "image/gif",
-                "bmp": "image/bmp",
-                "tiff": "image/tiff",
-                "wmf": "image/x-wmf",
-                "emf": "image/x-emf",
-            }
-
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
-            # Check all XML files for Override declarations
-            for xml_file in self.xml_files:
-                path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
-                    "\\", "/"
-                )
-
-                # Skip non-content files
-                if any(
-                    skip in path_str
-                    for skip in [".rels", "[Content_Types]", "docProps/", "_rels/"]
-                ):
-                    continue
-
-                try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
-
-                    if root_name in declarable_roots and path_str not in declared_parts:
-                        errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
-                        )
-
-                except Exception:
-                    continue  # Skip unparseable files
-
-            # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
-                # Skip XML files and metadata files (already checked above)
-                if file_path.suffix.lower() in {".xml", ".rels"}:
-                    continue
-                if file_path.name == "[Content_Types].xml":
-                    continue
-                if "_rels" in file_path.parts or "docProps" in file_path.parts:
-                    continue
-
-                extension = file_path.suffix.lstrip(".").lower()
-                if extension and extension not in declared_extensions:
-                    # Check if it's a known media extension that should be declared
-                    if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
-                        errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
-                        )
-
-        except Exception as e:
-            errors.append(f"  Error parsing [Content_Types].xml: {e}")
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} content type declaration errors:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print(
-                    "PASSED - All content files are properly declared in [Content_Types].xml"
-                )
-            return True
+        return self.run_rule(ContentTypeRule(self))
 
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
@@ -830,13 +620,16 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            # Load schema (compiled once per validator)
+            schema = self._schemas.get(schema_path)
+            if schema is None:
+                with open(schema_path, "rb") as xsd_file:
+                    parser = lxml.etree.XMLParser()
+                    xsd_doc = lxml.etree.parse(
+                        xsd_file, parser=parser, base_url=str(schema_path)
+                    )
+                    schema = lxml.etree.XMLSchema(xsd_doc)
+                self._schemas[schema_path] = schema
 
             # Load and preprocess XML
             with open(xml_file, "r") as f:
@@ -0,0 +1,697 @@
+#!/usr/bin/env python3
+"""
+Assemble a presentation from slides of several template decks.
+
+Slides are picked as (deck, slide index) pairs from any number of source
+.pptx files. Slide masters, layouts and themes are merged and deduplicated by
+content hash, so decks built from the same template share one master. Media
+(images, audio, video) are stored once no matter how many slides or decks use
+them. Every part is copied straight from the source archives into the output
+archive in a single streaming pass, without unpacking or loading the decks.
+
+The first source deck (or --base) provides the slide size and the
+presentation-level properties of the output. Speaker notes and comments are
+not carried over.
+
+Usage:
+    python assemble.py output.pptx deck-a.pptx:0,3,3 deck-b.pptx:5 deck-a.pptx:7
+    python assemble.py output.pptx --spec assembly.json [--base template.pptx]
+
+The spec file is a JSON list of {"deck": "path.pptx", "slide": 0} objects (or
+["path.pptx", 0] pairs); relative deck paths are resolved against the spec
+file's directory. Slide indices are 0-based.
+"""
+
+import argparse
+import hashlib
+import json
+import posixpath
+import re
+import shutil
+import sys
+import time
+import zipfile
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import lxml.etree
+
+# Namespaces
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+P = f"{{{P_NS}}}"
+R_ID = f"{{{R_NS}}}id"
+
+# Relationship and content types
+RT_OFFICE_DOCUMENT = f"{R_NS}/officeDocument"
+RT_SLIDE_MASTER = f"{R_NS}/slideMaster"
+RT_SLIDE = f"{R_NS}/slide"
+RT_SLIDE_LAYOUT = f"{R_NS}/slideLayout"
+RT_THEME = f"{R_NS}/theme"
+CT_MASTER = "application/vnd.openxmlformats-officedocument.presentationml.slideMaster+xml"
+CT_LAYOUT = "application/vnd.openxmlformats-officedocument.presentationml.slideLayout+xml"
+CT_THEME = "application/vnd.openxmlformats-officedocument.theme+xml"
+CT_RELS = "application/vnd.openxmlformats-package.relationships+xml"
+
+# Parts shared between slides and decks when their content is identical
+SHARED_CONTENT_TYPES = {CT_MASTER, CT_LAYOUT, CT_THEME}
+SHARED_MEDIA_PREFIXES = ("image/", "audio/", "video/")
+MEDIA_FOLDER = "/ppt/media/"
+
+# Relationships (by last path segment of the type) not carried into the output
+DROPPED_RELTYPES = {
+    "notesSlide",
+    "notesMaster",
+    "handoutMaster",
+    "comments",
+    "commentAuthors",
+    "authors",
+    "vbaProject",
+    "customXml",
+}
+
+# presentation.xml children that refer to parts that are not carried over
+DROPPED_PRESENTATION_ELEMENTS = [
+    "notesMasterIdLst",
+    "handoutMasterIdLst",
+    "custShowLst",
+    "embeddedFontLst",
+]
+SECTION_LIST_EXT_URI = "{521415D9-36F7-43E2-AB2F-B90AF26B5E84}"
+
+FIRST_SLIDE_ID = 256
+FIRST_MASTER_ID = 2147483648  # Masters and layouts share this id space
+LAYOUT_ID_LIST_PATTERN = re.compile(
+    rb"<(?:\w+:)?sldLayoutIdLst\b.*?</(?:\w+:)?sldLayoutIdLst>", re.DOTALL
+)
+PARTNAME_PATTERN = re.compile(r"^(.*?)(\d*)(\.[^./]+)?$")
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class Rel(NamedTuple):
+    """A relationship with its target resolved to an absolute partname."""
+
+    rId: str
+    reltype: str
+    target: str
+    is_external: bool
+
+
+class SourcePackage:
+    """Read-only view of a .pptx package that reads parts on demand."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.zip = zipfile.ZipFile(self.path)
+        self.names = {"/" + name for name in self.zip.namelist()}
+        self._rels: Dict[str, List[Rel]] = {}
+
+        types = lxml.etree.fromstring(self.zip.read("[Content_Types].xml"))
+        self.defaults = {
+            e.get("Extension").lower(): e.get("ContentType")
+            for e in types.iterfind(f"{{{CT_NS}}}Default")
+        }
+        self.overrides = {
+            e.get("PartName").lower(): e.get("ContentType")
+            for e in types.iterfind(f"{{{CT_NS}}}Override")
+        }
+
+        self.presentation = next(
+            rel.target for rel in self.rels("/") if rel.reltype == RT_OFFICE_DOCUMENT
+        )
+        pres = lxml.etree.fromstring(self.read(self.presentation))
+        pres_rels = {rel.rId: rel for rel in self.rels(self.presentation)}
+        self.slides = [
+            pres_rels[sld_id.get(R_ID)].target
+            for sld_id in pres.iterfind(f"{P}sldIdLst/{P}sldId")
+        ]
+        sld_sz = pres.find(f"{P}sldSz")
+        self.slide_size = (
+            (sld_sz.get("cx"), sld_sz.get("cy")) if sld_sz is not None else None
+        )
+
+    def read(self, partname: str) -> bytes:
+        return self.zip.read(partname.lstrip("/"))
+
+    def open(self, partname: str):
+        return self.zip.open(partname.lstrip("/"))
+
+    def content_type(self, partname: str) -> Tuple[str, bool]:
+        """Return (content_type, is_override) for a part."""
+        override = self.overrides.get(partname.lower())
+        if override:
+            return override, True
+        ext = partname.rsplit(".", 1)[-1].lower()
+        return self.defaults.get(ext, "application/octet-stream"), False
+
+    def rels(self, partname: str) -> List[Rel]:
+        """Relationships of a part ("/" for package relationships)."""
+        if partname in self._rels:
+            return self._rels[partname]
+
+        if partname == "/":
+            rels_name, base_dir = "/_rels/.rels", "/"
+        else:
+            base_dir, name = posixpath.split(partname)
+            rels_name = f"{base_dir}/_rels/{name}.rels"
+
+        rels = []
+        if rels_name in self.names:
+            root = lxml.etree.fromstring(self.read(rels_name))
+            for e in root.iterfind(f"{{{PKG_REL_NS}}}Relationship"):
+                target = e.get("Target", "")
+                is_external = e.get("TargetMode") == "External"
+                if not is_external:
+                    if not target.startswith("/"):
+                        target = posixpath.join(base_dir, target)
+                    target = posixpath.normpath(target)
+                rels.append(Rel(e.get("Id"), e.get("Type"), target, is_external))
+
+        self._rels[partname] = rels
+        return rels
+
+    def close(self) -> None:
+        self.zip.close()
+
+
+@dataclass
+class PlannedPart:
+    """An output part: where to copy it from and how to relate it."""
+
+    source: SourcePackage
+    source_name: str
+    content_type: str
+    is_override: bool
+    rels: List[Rel] = field(default_factory=list)
+    # Slide-to-slide links, resolved once all slides are known
+    slide_links: List[Rel] = field(default_factory=list)
+
+
+class DeckAssembler:
+    """Plans and writes a presentation assembled from slides of several decks."""
+
+    def __init__(self, base: SourcePackage):
+        """Start an assembly whose presentation properties come from base."""
+        self.base = base
+        self.parts: Dict[str, PlannedPart] = {}  # Output partname -> plan
+        self.slides: List[str] = []  # Output slide partnames in order
+        self.master_layouts: Dict[str, List[str]] = {}  # Master -> its layouts
+        self.stats: Counter = Counter()
+
+        self._shared: Dict[str, str] = {}  # Content hash -> output partname
+        self._hashes: Dict[Tuple[str, str], str] = {}
+        self._counters: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._reserved = {base.presentation}
+        self._slide_copies: Dict[Tuple[str, str], str] = {}
+
+    # ============ PLANNING ============
+
+    def add_slide(self, source: SourcePackage, index: int) -> str:
+        """Append a copy of slide index of source; returns its output partname."""
+        if not 0 <= index < len(source.slides):
+            raise ValueError(
+                f"Slide index {index} out of range for {source.path.name} "
+                f"(0-{len(source.slides) - 1})"
+            )
+        slide_name = source.slides[index]
+        out_name = self._import_part(source, slide_name, {})
+        self.slides.append(out_name)
+        self._slide_copies.setdefault((str(source.path), slide_name), out_name)
+        return out_name
+
+    def _is_shared(self, content_type: str) -> bool:
+        return content_type in SHARED_CONTENT_TYPES or content_type.startswith(
+            SHARED_MEDIA_PREFIXES
+        )
+
+    @staticmethod
+    def _skip_rel(rel: Rel, content_type: str) -> bool:
+        """Relationships that are dropped, or rebuilt when writing."""
+        leaf = rel.reltype.rsplit("/", 1)[-1]
+        if leaf in DROPPED_RELTYPES:
+            return True
+        # A master's layout list is rebuilt from the layouts actually used
+        return content_type == CT_MASTER and rel.reltype == RT_SLIDE_LAYOUT
+
+    def _part_hash(self, source: SourcePackage, partname: str) -> str:
+        """Content hash of a part and everything it relates to."""
+        key = (str(source.path), partname)
+        if key in self._hashes:
+            return self._hashes[key]
+
+        content_type, _ = source.content_type(partname)
+        hasher = hashlib.sha256(content_type.encode())
+        if content_type == CT_MASTER:
+            hasher.update(LAYOUT_ID_LIST_PATTERN.sub(b"", source.read(partname)))
+        else:
+            with source.open(partname) as f:
+                while chunk := f.read(COPY_CHUNK_SIZE):
+                    hasher.update(chunk)
+
+        for rel in sorted(source.rels(partname)):
+            if self._skip_rel(rel, content_type) or rel.reltype == RT_SLIDE:
+                continue
+            if rel.is_external or rel.target not in source.names:
+                target_id = rel.target
+            else:
+                target_id = self._part_hash(source, rel.target)
+            hasher.update(f"|{rel.rId}|{rel.reltype}|{target_id}".encode())
+
+        digest = hasher.hexdigest()
+        self._hashes[key] = digest
+        return digest
+
+    def _allocate(self, partname: str) -> str:
+        """Choose an unused output partname in the same folder as partname."""
+        stem, digits, ext = PARTNAME_PATTERN.match(partname).groups()  # type: ignore
+        ext = ext or ""
+        if not digits and partname not in self.parts and partname not in self._reserved:
+            return partname
+        while True:
+            self._counters[(stem, ext)] += 1
+            candidate = f"{stem}{self._counters[(stem, ext)]}{ext}"
+            if candidate not in self.parts and candidate not in self._reserved:
+                return candidate
+
+    def _import_part(
+        self, source: SourcePackage, partname: str, scope: Dict[str, str]
+    ) -> str:
+        """Plan a source part (and its related parts) for the output.
+
+        Shared parts (masters, layouts, themes, media) are reused when an
+        identical part was already planned. Other parts are copied once per
+        scope, i.e. once per imported slide.
+        """
+        content_type, is_override = source.content_type(partname)
+        shared = self._is_shared(content_type)
+
+        if shared:
+            digest = self._part_hash(source, partname)
+            if digest in self._shared:
+                self.stats["reused"] += 1
+                return self._shared[digest]
+        elif partname in scope:
+            return scope[partname]
+
+        out_name = self._allocate(partname)
+        plan = PlannedPart(source, partname, content_type, is_override)
+        self.parts[out_name] = plan
+        if shared:
+            self._shared[digest] = out_name
+        else:
+            scope[partname] = out_name
+        self.stats[content_type] += 1
+
+        # Shared parts own their related non-shared parts
+        child_scope = {} if shared else scope
+        for rel in source.rels(partname):
+            if self._skip_rel(rel, content_type):
+                continue
+            if rel.is_external:
+                plan.rels.append(rel)
+            elif rel.reltype == RT_SLIDE:
+                plan.slide_links.append(rel)
+            elif rel.target in source.names:
+                target = self._import_part(source, rel.target, child_scope)
+                plan.rels.append(rel._replace(target=target))
+
+        if content_type == CT_MASTER:
+            self.master_layouts.setdefault(out_name, [])
+        elif content_type == CT_LAYOUT:
+            for rel in plan.rels:
+                if rel.reltype == RT_SLIDE_MASTER:
+                    self.master_layouts.setdefault(rel.target, []).append(out_name)
+                    break
+
+        return out_name
+
+    def _plan_presentation(self) -> List[Rel]:
+        """Plan presentation-level parts from the base deck; returns its rels."""
+        rels = []
+        for idx, master in enumerate(self.master_layouts, start=1):
+            rels.append(Rel(f"rId{idx}", RT_SLIDE_MASTER, master, False))
+        for slide in self.slides:
+            rels.append(Rel(f"rId{len(rels) + 1}", RT_SLIDE, slide, False))
+
+        for rel in self.base.rels(self.base.presentation):
+            leaf = rel.reltype.rsplit("/", 1)[-1]
+            if rel.is_external or leaf in DROPPED_RELTYPES:
+                continue
+            if rel.reltype in (RT_SLIDE, RT_SLIDE_MASTER, RT_THEME):
+                continue
+            if rel.target in self.base.names:
+                target = self._import_part(self.base, rel.target, {})
+                rels.append(Rel(f"rId{len(rels) + 1}", rel.reltype, target, False))
+
+        # The presentation theme is the theme of the first master
+        if self.master_layouts:
+            first_master = self.parts[next(iter(self.master_layouts))]
+            for rel in first_master.rels:
+                if rel.reltype == RT_THEME:
+                    rels.append(Rel(f"rId{len(rels) + 1}", RT_THEME, rel.target, False))
+                    break
+        return rels
+
+    def _plan_package(self) -> List[Rel]:
+        """Plan package-level parts (document properties, thumbnail)."""
+        rels = []
+        for rel in self.base.rels("/"):
+            if rel.reltype == RT_OFFICE_DOCUMENT:
+                rels.append(rel._replace(target=self.base.presentation))
+            elif rel.is_external:
+                rels.append(rel)
+            elif rel.target in self.base.names:
+                target = self._import_part(self.base, rel.target, {})
+                rels.append(rel._replace(target=target))
+        return rels
+
+    # ============ WRITING ============
+
+    @staticmethod
+    def _rels_xml(owner: str, rels: List[Rel]) -> bytes:
+        """Serialize relationships of owner with targets relative to it."""
+        root = lxml.etree.Element(f"{{{PKG_REL_NS}}}Relationships", nsmap={None: PKG_REL_NS})
+        base_dir = posixpath.dirname(owner) if owner != "/" else "/"
+        for rel in rels:
+            e = lxml.etree.SubElement(root, f"{{{PKG_REL_NS}}}Relationship")
+            e.set("Id", rel.rId)
+            e.set("Type", rel.reltype)
+            if rel.is_external:
+                e.set("Target", rel.target)
+                e.set("TargetMode", "External")
+            else:
+                e.set("Target", posixpath.relpath(rel.target, base_dir))
+        return lxml.etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    @staticmethod
+    def _rels_name(partname: str) -> str:
+        if partname == "/":
+            return "_rels/.rels"
+        base_dir, name = posixpath.split(partname)
+        return f"{base_dir.lstrip('/')}/_rels/{name}.rels"
+
+    def _content_types_xml(self) -> bytes:
+        defaults = {"rels": CT_RELS, "xml": "application/xml"}
+        overrides = {}
+        parts = [(self.base.presentation, *self.base.content_type(self.base.presentation))]
+        parts += [(name, plan.content_type, plan.is_override) for name, plan in self.parts.items()]
+        for name, content_type, is_override in parts:
+            ext = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+            if not is_override and ext and defaults.setdefault(ext, content_type) == content_type:
+                continue
+            overrides[name] = content_type
+
+        root = lxml.etree.Element(f"{{{CT_NS}}}Types", nsmap={None: CT_NS})
+        for ext, content_type in defaults.items():
+            lxml.etree.SubElement(
+                root, f"{{{CT_NS}}}Default", Extension=ext, ContentType=content_type
+            )
+        for name, content_type in overrides.items():
+            lxml.etree.SubElement(
+                root, f"{{{CT_NS}}}Override", PartName=name, ContentType=content_type
+            )
+        return lxml.etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    def _presentation_xml(self, rels: List[Rel], layout_ids: Dict[str, int]) -> bytes:
+        """The base deck's presentation.xml with the new master and slide lists."""
+        pres = lxml.etree.fromstring(self.base.read(self.base.presentation))
+        for tag in DROPPED_PRESENTATION_ELEMENTS:
+            for e in pres.findall(f"{P}{tag}"):
+                pres.remove(e)
+        for ext in pres.findall(f"{P}extLst/{P}ext[@uri='{SECTION_LIST_EXT_URI}']"):
+            ext.getparent().remove(ext)
+
+        master_lst = pres.find(f"{P}sldMasterIdLst")
+        if master_lst is None:
+            master_lst = lxml.etree.Element(f"{P}sldMasterIdLst")
+            pres.insert(0, master_lst)
+        master_lst.clear()
+
+        slide_lst = pres.find(f"{P}sldIdLst")
+        if slide_lst is None:
+            slide_lst = lxml.etree.Element(f"{P}sldIdLst")
+            master_lst.addnext(slide_lst)
+        slide_lst.clear()
+
+        for rel in rels:
+            if rel.reltype == RT_SLIDE_MASTER:
+                lxml.etree.SubElement(
+                    master_lst, f"{P}sldMasterId", id=str(layout_ids[rel.target])
+                ).set(R_ID, rel.rId)
+            elif rel.reltype == RT_SLIDE:
+                lxml.etree.SubElement(
+                    slide_lst, f"{P}sldId", id=str(FIRST_SLIDE_ID + len(slide_lst))
+                ).set(R_ID, rel.rId)
+
+        return lxml.etree.tostring(pres, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    def _master_xml(
+        self, plan: PlannedPart, layout_rels: List[Rel], layout_ids: Dict[str, int]
+    ) -> bytes:
+        """Master XML with its layout list rebuilt for the layouts in use."""
+        master = lxml.etree.fromstring(plan.source.read(plan.source_name))
+        layout_lst = master.find(f"{P}sldLayoutIdLst")
+        if layout_lst is None:
+            layout_lst = lxml.etree.Element(f"{P}sldLayoutIdLst")
+            master.find(f"{P}cSld").addnext(layout_lst)
+            # clrMap must precede sldLayoutIdLst
+            clr_map = master.find(f"{P}clrMap")
+            if clr_map is not None:
+                clr_map.addnext(layout_lst)
+        layout_lst.clear()
+        for rel in layout_rels:
+            lxml.etree.SubElement(
+                layout_lst, f"{P}sldLayoutId", id=str(layout_ids[rel.target])
+            ).set(R_ID, rel.rId)
+        return lxml.etree.tostring(master, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    @staticmethod
+    def _remove_links(blob: bytes, rIds: set) -> bytes:
+        """Remove hyperlink elements that point at dropped relationships."""
+        root = lxml.etree.fromstring(blob)
+        for e in list(root.iter()):
+            if e.get(R_ID) in rIds and e.getparent() is not None:
+                e.getparent().remove(e)
+        return lxml.etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    def save(self, output_path: Path) -> None:
+        """Write the assembled presentation in one pass over the planned parts."""
+        package_rels = self._plan_package()
+        pres_rels = self._plan_presentation()
+
+        # Masters and layouts share one id space
+        layout_ids: Dict[str, int] = {}
+        next_id = FIRST_MASTER_ID
+        for master, layouts in self.master_layouts.items():
+            for name in [master] + layouts:
+                layout_ids[name] = next_id
+                next_id += 1
+
+        timestamp = time.localtime()[:6]
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("[Content_Types].xml", self._content_types_xml())
+            zf.writestr(self._rels_name("/"), self._rels_xml("/", package_rels))
+            zf.writestr(
+                self.base.presentation.lstrip("/"),
+                self._presentation_xml(pres_rels, layout_ids),
+            )
+            zf.writestr(
+                self._rels_name(self.base.presentation),
+                self._rels_xml(self.base.presentation, pres_rels),
+            )
+
+            for name, plan in self.parts.items():
+                rels = list(plan.rels)
+                data: Optional[bytes] = None
+
+                if plan.content_type == CT_MASTER:
+                    used = {int(r.rId[3:]) for r in rels if r.rId[3:].isdigit()}
+                    next_rid = max(used, default=0) + 1
+                    layout_rels = []
+                    for layout in self.master_layouts.get(name, []):
+                        layout_rels.append(
+                            Rel(f"rId{next_rid}", RT_SLIDE_LAYOUT, layout, False)
+                        )
+                        next_rid += 1
+                    rels += layout_rels
+                    data = self._master_xml(plan, layout_rels, layout_ids)
+
+                # Keep links to slides that made it into the output
+                dropped = set()
+                for rel in plan.slide_links:
+                    target = self._slide_copies.get((str(plan.source.path), rel.target))
+                    if target:
+                        rels.append(rel._replace(target=target))
+                    else:
+                        dropped.add(rel.rId)
+                if dropped:
+                    data = self._remove_links(plan.source.read(plan.source_name), dropped)
+
+                if data is not None:
+                    zf.writestr(name.lstrip("/"), data)
+                else:
+                    # Stream the part; media is already compressed
+                    info = zipfile.ZipInfo(name.lstrip("/"), date_time=timestamp)
+                    info.compress_type = (
+                        zipfile.ZIP_STORED
+                        if plan.content_type.startswith(SHARED_MEDIA_PREFIXES)
+                        else zipfile.ZIP_DEFLATED
+                    )
+                    with plan.source.open(plan.source_name) as src, zf.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+                if rels:
+                    zf.writestr(self._rels_name(name), self._rels_xml(name, rels))
+
+
+def parse_slide_refs(refs: List[str]) -> List[Tuple[Path, int]]:
+    """Parse deck.pptx:0,3,5-7 arguments into (deck, slide index) pairs."""
+    result = []
+    for ref in refs:
+        deck, sep, spec = ref.rpartition(":")
+        if not sep or not deck:
+            raise ValueError(f"Expected deck.pptx:INDICES, got '{ref}'")
+        for item in spec.split(","):
+            item = item.strip()
+            try:
+                if "-" in item:
+                    first, last = (int(x) for x in item.split("-", 1))
+                    result.extend((Path(deck), idx) for idx in range(first, last + 1))
+                else:
+                    result.append((Path(deck), int(item)))
+            except ValueError:
+                raise ValueError(f"Invalid slide index '{item}' in '{ref}'")
+    return result
+
+
+def load_spec(spec_path: Path) -> List[Tuple[Path, int]]:
+    """Load (deck, slide index) pairs from a JSON spec file."""
+    with open(spec_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    result = []
+    for entry in entries:
+        deck, slide = (entry["deck"], entry["slide"]) if isinstance(entry, dict) else entry
+        deck_path = Path(deck)
+        if not deck_path.is_absolute():
+            deck_path = spec_path.parent / deck_path
+        result.append((deck_path, int(slide)))
+    return result
+
+
+def assemble_presentation(
+    slide_refs: List[Tuple[Path, int]], output_path: Path, base_path: Optional[Path] = None
+) -> DeckAssembler:
+    """
+    Create a presentation from slides of several decks.
+
+    Args:
+        slide_refs: (deck path, 0-based slide index) pairs in output order
+        output_path: Path for output PPTX file
+        base_path: Deck providing slide size and presentation properties
+            (default: the first deck in slide_refs)
+
+    Returns:
+        The DeckAssembler used, for statistics
+    """
+    if not slide_refs:
+        raise ValueError("No slides to assemble")
+
+    sources: Dict[Path, SourcePackage] = {}
+
+    def get_source(path: Path) -> SourcePackage:
+        key = path.resolve()
+        if key not in sources:
+            if not path.exists():
+                raise ValueError(f"Source deck not found: {path}")
+            sources[key] = SourcePackage(path)
+        return sources[key]
+
+    try:
+        base = get_source(base_path or slide_refs[0][0])
+        assembler = DeckAssembler(base)
+        warned = set()
+        for deck_path, index in slide_refs:
+            source = get_source(deck_path)
+            if source.slide_size != base.slide_size and source.path not in warned:
+                print(
+                    f"Warning: {source.path.name} slide size differs from "
+                    f"{base.path.name}; slides are not rescaled"
+                )
+                warned.add(source.path)
+            assembler.add_slide(source, index)
+        assembler.save(output_path)
+    finally:
+        for source in sources.values():
+            source.close()
+
+    return assembler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Assemble a presentation from slides of several template decks.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python assemble.py output.pptx intro.pptx:0 content.pptx:3,3,5-7 outro.pptx:2
+    Creates output.pptx with slide 0 of intro.pptx, slide 3 of content.pptx
+    twice, slides 5-7 of content.pptx and slide 2 of outro.pptx
+
+  python assemble.py output.pptx --spec assembly.json --base template.pptx
+    Reads [{"deck": "content.pptx", "slide": 3}, ...] from assembly.json
+
+Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
+        """,
+    )
+    parser.add_argument("output", help="Path for output PPTX file")
+    parser.add_argument(
+        "slides", nargs="*", help="Slides as deck.pptx:INDICES (e.g. deck.pptx:0,3,5-7)"
+    )
+    parser.add_argument("--spec", help="JSON file listing the slides to assemble")
+    parser.add_argument(
+        "--base",
+        help="Deck providing slide size and presentation properties (default: first deck)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        slide_refs = load_spec(Path(args.spec)) if args.spec else []
+        slide_refs += parse_slide_refs(args.slides)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error: Invalid slide list: {e}")
+        sys.exit(1)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        decks = {deck.resolve() for deck, _ in slide_refs}
+        print(f"Assembling {len(slide_refs)} slides from {len(decks)} source deck(s)...")
+        assembler = assemble_presentation(
+            slide_refs, output_path, Path(args.base) if args.base else None
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error processing presentation: {e}")
+        sys.exit(1)
+
+    # Package-level images such as docProps/thumbnail.jpeg are not slide media
+    media = sum(1 for partname in assembler.parts if partname.startswith(MEDIA_FOLDER))
+    print(f"Saved assembled presentation to: {output_path}")
+    print(f"Final presentation has {len(assembler.slides)} slides")
+    print(
+        f"Shared parts: {assembler.stats[CT_MASTER]} master(s), "
+        f"{assembler.stats[CT_LAYOUT]} layout(s), {media} media file(s) "
+        f"({assembler.stats['reused']} duplicate references reused)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark assemble.py on a generated library of template decks.
+
+Builds a library of source decks (several theme variants, shared and unique
+images, slide-to-slide links), assembles a random selection of their slides
+and reports time, memory and how many parts were shared.
+
+Usage:
+    python benchmark_assemble.py [--sources 40] [--slides 500] [--keep DIR]
+"""
+
+import argparse
+import io
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from assemble import CT_LAYOUT, CT_MASTER, MEDIA_FOLDER, assemble_presentation
+from PIL import Image
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.util import Inches
+
+THEME_VARIANTS = 8
+SLIDES_PER_SOURCE = 20
+
+
+def make_image(seed, size=(640, 480)):
+    """PNG bytes of a solid image whose color depends on seed."""
+    rng = random.Random(seed)
+    color = tuple(rng.randrange(256) for _ in range(3))
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def make_source_deck(path, deck_idx):
+    """Write one source deck; decks with the same variant share a theme."""
+    prs = Presentation()
+    variant = deck_idx % THEME_VARIANTS
+
+    # Vary the theme so that decks fall into THEME_VARIANTS distinct masters
+    theme_part = prs.slide_master.part.part_related_by(RT.THEME)
+    theme_part._blob = theme_part.blob.replace(
+        b'<a:srgbClr val="4F81BD"/>', f'<a:srgbClr val="{variant * 30:02X}81BD"/>'.encode()
+    )
+
+    logo = io.BytesIO(make_image("logo"))
+    variant_image = io.BytesIO(make_image(f"variant-{variant}"))
+    unique_image = io.BytesIO(make_image(f"deck-{deck_idx}"))
+
+    layouts = prs.slide_layouts
+    for slide_idx in range(SLIDES_PER_SOURCE):
+        slide = prs.slides.add_slide(layouts[slide_idx % 6])
+        if slide.shapes.title is not None:
+            slide.shapes.title.text = f"Deck {deck_idx} slide {slide_idx}"
+        for image, left in ((logo, 0), (variant_image, 3), (unique_image, 6)):
+            image.seek(0)
+            slide.shapes.add_picture(image, Inches(left), Inches(5), width=Inches(2))
+        box = slide.shapes.add_textbox(Inches(1), Inches(3), Inches(4), Inches(1))
+        box.text_frame.text = "Next"
+        box.text_frame.paragraphs[0].runs[0].font.color.rgb = RGBColor(0, 0, 0)
+
+    # Link each slide to the following one
+    for current, following in zip(prs.slides, list(prs.slides)[1:]):
+        box = current.shapes[-1]
+        box.click_action.target_slide = following
+
+    prs.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark assemble.py.")
+    parser.add_argument("--sources", type=int, default=40, help="Number of source decks")
+    parser.add_argument("--slides", type=int, default=500, help="Number of slides to assemble")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for slide selection")
+    parser.add_argument("--keep", help="Directory to keep the generated decks in")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = Path(args.keep or temp_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        print(f"Generating {args.sources} source decks...")
+        sources = []
+        for deck_idx in range(args.sources):
+            path = work_dir / f"source-{deck_idx:02d}.pptx"
+            make_source_deck(path, deck_idx)
+            sources.append(path)
+        input_bytes = sum(path.stat().st_size for path in sources)
+
+        rng = random.Random(args.seed)
+        slide_refs = [
+            (rng.choice(sources), rng.randrange(SLIDES_PER_SOURCE)) for _ in range(args.slides)
+        ]
+        output_path = work_dir / "assembled.pptx"
+
+        start = time.perf_counter()
+        assembler = assemble_presentation(slide_refs, output_path)
+        elapsed = time.perf_counter() - start
+
+        prs = Presentation(output_path)
+        if len(prs.slides) != args.slides:
+            print(f"Error: expected {args.slides} slides, found {len(prs.slides)}")
+            sys.exit(1)
+
+        media = sum(1 for partname in assembler.parts if partname.startswith(MEDIA_FOLDER))
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"Assembled {args.slides} slides from {args.sources} decks in {elapsed:.2f}s")
+        print(f"  Masters: {assembler.stats[CT_MASTER]}, layouts: {assembler.stats[CT_LAYOUT]}")
+        print(f"  Media files: {media}")
+        print(
+            f"  Shared parts reused (masters, layouts, themes, media): "
+            f"{assembler.stats['reused']}"
+        )
+        print(
+            f"  Output: {output_path.stat().st_size / 1e6:.1f} MB "
+            f"(sources: {input_bytes / 1e6:.1f} MB)"
+        )
+        print(f"  Peak RSS: {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,23 +16,33 @@ Classes:
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    get_inventory_as_dict: Extract JSON-serializable inventory (uses the cache)
     save_inventory: Save extracted data to JSON
 
+Per-slide results are cached on disk (see inventory_cache.py), keyed by a
+hash of the slide, its layout and master, and the font files used to measure
+text, so re-running on an unchanged deck skips text measurement entirely.
+
 Usage:
-    python inventory.py input.pptx output.json
+    python inventory.py input.pptx output.json [--no-cache]
 """
 
 import argparse
+import functools
+import hashlib
 import json
 import platform
+import re
 import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+from inventory_cache import InventoryCache, get_default_cache
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
-from pptx.enum.text import PP_ALIGN
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.enum.text import MSO_UNDERLINE
 from pptx.shapes.base import BaseShape
 
 # Type aliases for cleaner signatures
@@ -46,6 +56,18 @@ InventoryData = Dict[
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+# Font typefaces referenced from slide, layout and master XML (theme refs like
+# "+mn-lt" are resolved by PowerPoint, not by font files, and are skipped)
+TYPEFACE_PATTERN = re.compile(rb'typeface="([^"+][^"]*)"')
+FALLBACK_FONT = "Arial"
+
+# Namespaces for reading text properties directly from the XML
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
+# a:pPr/@algn values reported in the inventory (LEFT is the default)
+ALIGNMENT_NAMES = {"ctr": "CENTER", "r": "RIGHT", "just": "JUSTIFY"}
+
 
 def main():
     """Main entry point for command-line usage."""
@@ -60,6 +82,9 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py presentation.pptx inventory.json --no-cache
+    Recomputes every slide instead of reusing cached results
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -76,6 +101,11 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk inventory cache",
+    )
 
     args = parser.parse_args()
 
@@ -94,13 +124,18 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        cache = None if args.no_cache else get_default_cache()
+        inventory = get_inventory_as_dict(
+            input_path, issues_only=args.issues_only, cache=cache
+        )
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        save_inventory(inventory, output_path)
+        write_inventory_json(inventory, output_path)
 
         print(f"Output saved to: {args.output}")
+        if cache is not None and cache.hits:
+            print(f"Reused cached inventory for {cache.hits} slide(s)")
 
         # Report statistics
         total_slides = len(inventory)
@@ -135,15 +170,39 @@ class ShapeWithPosition:
 
 
 class ParagraphData:
-    """Data structure for paragraph properties extracted from a PowerPoint paragraph."""
+    """Data structure for paragraph properties extracted from a PowerPoint paragraph.
+
+    Properties are read straight from the paragraph's a:pPr and first run's
+    a:rPr XML. Unlike python-pptx font access this never modifies the XML
+    (python-pptx adds empty rPr/solidFill elements when reading font colors).
+    """
+
+    __slots__ = (
+        "text",
+        "bullet",
+        "level",
+        "alignment",
+        "space_before",
+        "space_after",
+        "font_name",
+        "font_size",
+        "bold",
+        "italic",
+        "underline",
+        "color",
+        "theme_color",
+        "line_spacing",
+    )
 
     def __init__(self, paragraph: Any):
-        """Initialize from a PowerPoint paragraph object.
+        """Initialize from a PowerPoint paragraph.
 
         Args:
-            paragraph: The PowerPoint paragraph object
+            paragraph: The python-pptx paragraph object or its a:p element
         """
-        self.text: str = paragraph.text.strip()
+        p = getattr(paragraph, "_p", paragraph)
+
+        self.text: str = p.text.strip()
         self.bullet: bool = False
         self.level: Optional[int] = None
         self.alignment: Optional[str] = None
@@ -153,80 +212,104 @@ class ParagraphData:
         self.font_size: Optional[float] = None
         self.bold: Optional[bool] = None
         self.italic: Optional[bool] = None
-        self.underline: Optional[bool] = None
+        self.underline: Union[bool, MSO_UNDERLINE, None] = None
         self.color: Optional[str] = None
         self.theme_color: Optional[str] = None
         self.line_spacing: Optional[float] = None
 
-        # Check for bullet formatting
-        if (
-            hasattr(paragraph, "_p")
-            and paragraph._p is not None
-            and paragraph._p.pPr is not None
-        ):
-            pPr = paragraph._p.pPr
-            ns = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+        pPr = p.find(f"{A_NS}pPr")
+        if pPr is not None:
+            # Check for bullet formatting
             if (
-                pPr.find(f"{ns}buChar") is not None
-                or pPr.find(f"{ns}buAutoNum") is not None
+                pPr.find(f"{A_NS}buChar") is not None
+                or pPr.find(f"{A_NS}buAutoNum") is not None
             ):
                 self.bullet = True
-                if hasattr(paragraph, "level"):
-                    self.level = paragraph.level
-
-        # Add alignment if not LEFT (default)
-        if hasattr(paragraph, "alignment") and paragraph.alignment is not None:
-            alignment_map = {
-                PP_ALIGN.CENTER: "CENTER",
-                PP_ALIGN.RIGHT: "RIGHT",
-                PP_ALIGN.JUSTIFY: "JUSTIFY",
-            }
-            if paragraph.alignment in alignment_map:
-                self.alignment = alignment_map[paragraph.alignment]
+                self.level = int(pPr.get("lvl", "0"))
 
-        # Add spacing properties if set
-        if hasattr(paragraph, "space_before") and paragraph.space_before:
-            self.space_before = paragraph.space_before.pt
-        if hasattr(paragraph, "space_after") and paragraph.space_after:
-            self.space_after = paragraph.space_after.pt
+            # Add alignment if not LEFT (default)
+            self.alignment = ALIGNMENT_NAMES.get(pPr.get("algn", ""))
+
+            # Add spacing properties if set
+            self.space_before = self._spacing_points(pPr, "spcBef")
+            self.space_after = self._spacing_points(pPr, "spcAft")
 
         # Extract font properties from first run
-        if paragraph.runs:
-            first_run = paragraph.runs[0]
-            if hasattr(first_run, "font"):
-                font = first_run.font
-                if font.name:
-                    self.font_name = font.name
-                if font.size:
-                    self.font_size = font.size.pt
-                if font.bold is not None:
-                    self.bold = font.bold
-                if font.italic is not None:
-                    self.italic = font.italic
-                if font.underline is not None:
-                    self.underline = font.underline
-
-                # Handle color - both RGB and theme colors
-                try:
-                    # Try RGB color first
-                    if font.color.rgb:
-                        self.color = str(font.color.rgb)
-                except (AttributeError, TypeError):
-                    # Fall back to theme color
+        rPr = p.find(f"{A_NS}r/{A_NS}rPr")
+        if rPr is not None:
+            latin = rPr.find(f"{A_NS}latin")
+            if latin is not None and latin.get("typeface"):
+                self.font_name = latin.get("typeface")
+            if rPr.get("sz"):
+                self.font_size = self._centipoints_to_pt(rPr.get("sz"))
+            self.bold = self._xsd_boolean(rPr.get("b"))
+            self.italic = self._xsd_boolean(rPr.get("i"))
+
+            u = rPr.get("u")
+            if u is not None:
+                # None -> False, single -> True, others as MSO_UNDERLINE members
+                underline = MSO_UNDERLINE.from_xml(u)
+                if underline is MSO_UNDERLINE.NONE:
+                    self.underline = False
+                elif underline is MSO_UNDERLINE.SINGLE_LINE:
+                    self.underline = True
+                else:
+                    self.underline = underline
+
+            # Handle color - both RGB and theme colors
+            solid_fill = rPr.find(f"{A_NS}solidFill")
+            if solid_fill is not None and len(solid_fill):
+                color_elem = solid_fill[0]
+                if color_elem.tag == f"{A_NS}srgbClr":
+                    self.color = color_elem.get("val", "").upper()
+                elif color_elem.tag == f"{A_NS}schemeClr":
                     try:
-                        if font.color.theme_color:
-                            self.theme_color = font.color.theme_color.name
-                    except (AttributeError, TypeError):
-                        pass
+                        self.theme_color = MSO_THEME_COLOR.from_xml(
+                            color_elem.get("val")
+                        ).name
+                    except ValueError:
+                        pass  # e.g. phClr, which has no theme color equivalent
 
         # Add line spacing if set
-        if hasattr(paragraph, "line_spacing") and paragraph.line_spacing is not None:
-            if hasattr(paragraph.line_spacing, "pt"):
-                self.line_spacing = round(paragraph.line_spacing.pt, 2)
-            else:
-                # Multiplier - convert to points
-                font_size = self.font_size if self.font_size else 12.0
-                self.line_spacing = round(paragraph.line_spacing * font_size, 2)
+        if pPr is not None:
+            lnSpc = pPr.find(f"{A_NS}lnSpc")
+            if lnSpc is not None:
+                spcPts = lnSpc.find(f"{A_NS}spcPts")
+                spcPct = lnSpc.find(f"{A_NS}spcPct")
+                if spcPts is not None:
+                    self.line_spacing = round(
+                        self._centipoints_to_pt(spcPts.get("val")), 2
+                    )
+                elif spcPct is not None:
+                    # Multiplier - convert to points
+                    value = spcPct.get("val", "100000")
+                    if value.endswith("%"):
+                        multiplier = float(value[:-1]) / 100.0
+                    else:
+                        multiplier = int(value) / 100000.0
+                    font_size = self.font_size if self.font_size else 12.0
+                    self.line_spacing = round(multiplier * font_size, 2)
+
+    @staticmethod
+    def _centipoints_to_pt(value: str) -> float:
+        """Convert a centipoints attribute to points, rounded like python-pptx."""
+        return int(int(value) * 127) / 12700.0
+
+    @staticmethod
+    def _xsd_boolean(value: Optional[str]) -> Optional[bool]:
+        """Parse an optional xsd:boolean attribute."""
+        if value is None:
+            return None
+        return value in ("1", "true")
+
+    @classmethod
+    def _spacing_points(cls, pPr: Any, tag: str) -> Optional[float]:
+        """Read a:spcBef/a:spcAft point spacing, ignoring percentage and zero spacing."""
+        spcPts = pPr.find(f"{A_NS}{tag}/{A_NS}spcPts")
+        if spcPts is None:
+            return None
+        points = cls._centipoints_to_pt(spcPts.get("val", "0"))
+        return points if points else None
 
     def to_dict(self) -> ParagraphDict:
         """Convert to dictionary for JSON serialization, excluding None values."""
@@ -252,7 +335,7 @@ class ParagraphData:
         if self.italic is not None:
             result["italic"] = self.italic
         if self.underline is not None:
-            result["underline"] = self.underline
+            result["underline"] = self.underline  # type: ignore
         if self.color:
             result["color"] = self.color
         if self.theme_color:
@@ -264,7 +347,35 @@ class ParagraphData:
 
 
 class ShapeData:
-    """Data structure for shape properties extracted from a PowerPoint shape."""
+    """Data structure for shape properties extracted from a PowerPoint shape.
+
+    Only the shape's XML element and its parent collection are kept after
+    extraction; the python-pptx shape proxy is rebuilt on demand by the
+    ``shape`` property, and paragraphs are parsed only when requested.
+    """
+
+    __slots__ = (
+        "_element",
+        "_parent",
+        "shape_id",
+        "slide_width_emu",
+        "slide_height_emu",
+        "placeholder_type",
+        "default_font_size",
+        "left",
+        "top",
+        "width",
+        "height",
+        "left_emu",
+        "top_emu",
+        "width_emu",
+        "height_emu",
+        "frame_overflow_bottom",
+        "slide_overflow_right",
+        "slide_overflow_bottom",
+        "overlapping_shapes",
+        "warnings",
+    )
 
     @staticmethod
     def emu_to_inches(emu: int) -> float:
@@ -277,6 +388,7 @@ class ShapeData:
         return int(inches * dpi)
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_font_path(font_name: str) -> Optional[str]:
         """Get the font file path for a given font name.
 
@@ -391,6 +503,7 @@ class ShapeData:
         absolute_left: Optional[int] = None,
         absolute_top: Optional[int] = None,
         slide: Optional[Any] = None,
+        analyze: bool = True,
     ):
         """Initialize from a PowerPoint shape object.
 
@@ -399,8 +512,12 @@ class ShapeData:
             absolute_left: Absolute left position in EMUs (for shapes in groups)
             absolute_top: Absolute top position in EMUs (for shapes in groups)
             slide: Optional slide object to get dimensions and layout information
+            analyze: If False, skip overflow and bullet detection (the results
+                are expected to be restored from the cache via restore_issues)
         """
-        self.shape = shape  # Store reference to original shape
+        # Keep the XML element rather than the python-pptx proxy (see shape)
+        self._element = shape.element
+        self._parent = getattr(shape, "_parent", None)
         self.shape_id: str = ""  # Will be set after sorting
 
         # Get slide dimensions from slide object
@@ -461,31 +578,52 @@ class ShapeData:
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
         self.warnings: List[str] = []
-        self._estimate_frame_overflow()
-        self._calculate_slide_overflow()
-        self._detect_bullet_issues()
+        if analyze:
+            self._estimate_frame_overflow(shape)
+            self._calculate_slide_overflow()
+            self._detect_bullet_issues()
+
+    def restore_issues(self, data: ShapeDict) -> None:
+        """Restore overflow, overlap and warning results from a to_dict() result."""
+        overflow: Dict[str, Any] = data.get("overflow") or {}  # type: ignore
+        frame = overflow.get("frame", {})
+        slide_overflow = overflow.get("slide", {})
+        self.frame_overflow_bottom = frame.get("overflow_bottom")
+        self.slide_overflow_right = slide_overflow.get("overflow_right")
+        self.slide_overflow_bottom = slide_overflow.get("overflow_bottom")
+
+        overlap: Dict[str, Any] = data.get("overlap") or {}  # type: ignore
+        self.overlapping_shapes = dict(overlap.get("overlapping_shapes", {}))
+        self.warnings = list(data.get("warnings") or [])  # type: ignore
 
     @property
-    def paragraphs(self) -> List[ParagraphData]:
-        """Calculate paragraphs from the shape's text frame."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
+    def shape(self) -> Optional[BaseShape]:
+        """The python-pptx shape object, recreated from the stored XML element."""
+        if self._parent is None or not hasattr(self._parent, "_shape_factory"):
+            return None
+        return self._parent._shape_factory(self._element)
+
+    def _paragraph_elements(self) -> List[Any]:
+        """The a:p elements of the shape's text body."""
+        tx_body = self._element.find(f"{P_NS}txBody")
+        if tx_body is None:
             return []
+        return tx_body.findall(f"{A_NS}p")
 
-        paragraphs = []
-        for paragraph in self.shape.text_frame.paragraphs:  # type: ignore
-            if paragraph.text.strip():
-                paragraphs.append(ParagraphData(paragraph))
-        return paragraphs
+    @property
+    def paragraphs(self) -> List[ParagraphData]:
+        """Calculate paragraphs from the shape's text body XML."""
+        return [
+            ParagraphData(p) for p in self._paragraph_elements() if p.text.strip()
+        ]
 
-    def _get_default_font_size(self) -> int:
+    def _get_default_font_size(self, shape: BaseShape) -> int:
         """Get default font size from theme text styles or use conservative default."""
         try:
-            if not (
-                hasattr(self.shape, "part") and hasattr(self.shape.part, "slide_layout")
-            ):
+            if not (hasattr(shape, "part") and hasattr(shape.part, "slide_layout")):
                 return 14
 
-            slide_master = self.shape.part.slide_layout.slide_master  # type: ignore
+            slide_master = shape.part.slide_layout.slide_master  # type: ignore
             if not hasattr(slide_master, "element"):
                 return 14
 
@@ -559,13 +697,14 @@ class ShapeData:
 
         return wrapped
 
-    def _estimate_frame_overflow(self) -> None:
+    def _estimate_frame_overflow(self, shape: BaseShape) -> None:
         """Estimate if text overflows the shape bounds using PIL text measurement."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
+        if not hasattr(shape, "text_frame"):
             return
 
-        text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
+        text_frame = shape.text_frame  # type: ignore
+        paragraph_elements = self._paragraph_elements()
+        if not text_frame or not paragraph_elements:
             return
 
         # Get usable dimensions after accounting for margins
@@ -578,16 +717,17 @@ class ShapeData:
         draw = ImageDraw.Draw(dummy_img)
 
         # Get default font size from placeholder or use conservative estimate
-        default_font_size = self._get_default_font_size()
+        default_font_size = self._get_default_font_size(shape)
 
         # Calculate total height of all paragraphs
         total_height_px = 0
 
-        for para_idx, paragraph in enumerate(text_frame.paragraphs):
-            if not paragraph.text.strip():
+        for para_idx, p in enumerate(paragraph_elements):
+            paragraph_text = p.text
+            if not paragraph_text.strip():
                 continue
 
-            para_data = ParagraphData(paragraph)
+            para_data = ParagraphData(p)
 
             # Load font for this paragraph
             font_name = para_data.font_name or "Arial"
@@ -605,7 +745,7 @@ class ShapeData:
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
-            for line in paragraph.text.split("\n"):
+            for line in paragraph_text.split("\n"):
                 wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
                 all_wrapped_lines.extend(wrapped)
 
@@ -659,18 +799,11 @@ class ShapeData:
 
     def _detect_bullet_issues(self) -> None:
         """Detect bullet point formatting issues in paragraphs."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
-            return
-
-        text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
-            return
-
         # Common bullet symbols that indicate manual bullets
         bullet_symbols = ["•", "●", "○"]
 
-        for paragraph in text_frame.paragraphs:
-            text = paragraph.text.strip()
+        for p in self._paragraph_elements():
+            text = p.text.strip()
             # Check for manual bullet symbols
             if text and any(text.startswith(symbol + " ") for symbol in bullet_symbols):
                 self.warnings.append(
@@ -911,8 +1044,137 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
                 shape2.overlapping_shapes[shape1.shape_id] = overlap_area
 
 
+def _part_digest(part: Any, digests: Dict[int, str]) -> str:
+    """Hash a part's XML, memoized per part for the duration of one extraction."""
+    key = id(part)
+    if key not in digests:
+        digests[key] = hashlib.sha256(part.blob).hexdigest()
+    return digests[key]
+
+
+@functools.lru_cache(maxsize=1)
+def _inventory_source_digest() -> str:
+    """Hash of this module's source, so cached results expire when it changes."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def _font_fingerprint(font_name: str) -> str:
+    """Identify the font file used to measure text set in font_name."""
+    font_path = ShapeData.get_font_path(font_name)
+    if not font_path:
+        return f"{font_name}:missing"
+    try:
+        stat = Path(font_path).stat()
+    except OSError:
+        return f"{font_name}:missing"
+    return f"{font_name}:{font_path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def slide_cache_key(slide: Any, part_digests: Optional[Dict[int, str]] = None) -> str:
+    """Compute the content hash under which a slide's inventory is cached.
+
+    The key covers everything the inventory of a slide depends on: the slide
+    XML, its layout and master (placeholder and default font sizes), the slide
+    dimensions (slide overflow), the font files used for text measurement, and
+    the inventory code itself. Must be computed before the slide is analyzed,
+    since reading run fonts through python-pptx adds empty rPr elements.
+
+    Args:
+        slide: Slide object
+        part_digests: Optional memo of part hashes shared across slides
+
+    Returns:
+        Hex digest identifying the slide's inventory
+    """
+    if part_digests is None:
+        part_digests = {}
+
+    layout = slide.slide_layout
+    master = layout.slide_master
+    slide_blob = slide.part.blob
+    width, height = ShapeData.get_slide_dimensions(slide)
+
+    hasher = hashlib.sha256()
+    hasher.update(_inventory_source_digest().encode())
+    hasher.update(hashlib.sha256(slide_blob).hexdigest().encode())
+    hasher.update(_part_digest(layout.part, part_digests).encode())
+    hasher.update(_part_digest(master.part, part_digests).encode())
+    hasher.update(f"{width}x{height}".encode())
+
+    font_names = {FALLBACK_FONT}
+    for blob in (slide_blob, layout.part.blob, master.part.blob):
+        font_names.update(
+            name.decode("utf-8", "replace") for name in TYPEFACE_PATTERN.findall(blob)
+        )
+    for font_name in sorted(font_names):
+        hasher.update(_font_fingerprint(font_name).encode())
+
+    return hasher.hexdigest()
+
+
+def extract_slide_shapes(
+    slide: Any, cached: Optional[Dict[str, ShapeDict]] = None
+) -> List[ShapeData]:
+    """Extract the text shapes of one slide, sorted by position with stable IDs.
+
+    Args:
+        slide: Slide object
+        cached: Optional cached to_dict() results for this slide. When given,
+            overflow and overlap analysis is skipped and restored from the cache.
+
+    Returns:
+        List of ShapeData objects with shape_id set and overlaps detected
+    """
+    # Collect all valid shapes from this slide with absolute positions
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+    if not shapes_with_positions:
+        return []
+
+    # Convert to ShapeData with absolute positions and slide reference
+    shape_data_list = [
+        ShapeData(
+            swp.shape,
+            swp.absolute_left,
+            swp.absolute_top,
+            slide,
+            analyze=cached is None,
+        )
+        for swp in shapes_with_positions
+    ]
+
+    # Sort by visual position and assign stable IDs in one step
+    sorted_shapes = sort_shapes_by_position(shape_data_list)
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+
+    if cached is not None:
+        if set(cached) != {sd.shape_id for sd in sorted_shapes}:
+            # Cache entry does not describe these shapes; analyze from scratch
+            return extract_slide_shapes(slide)
+        for shape_data in sorted_shapes:
+            shape_data.restore_issues(cached[shape_data.shape_id])
+        return sorted_shapes
+
+    # Detect overlaps using the stable shape IDs
+    if len(sorted_shapes) > 1:
+        detect_overlaps(sorted_shapes)
+
+    return sorted_shapes
+
+
+def shape_dict_has_issues(shape_dict: ShapeDict) -> bool:
+    """Check a serialized shape for issues, matching ShapeData.has_any_issues."""
+    return any(key in shape_dict for key in ("overflow", "overlap", "warnings"))
+
+
 def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    cache: Optional[InventoryCache] = None,
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
@@ -920,6 +1182,8 @@ def extract_text_inventory(
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
         issues_only: If True, only include shapes that have overflow or overlap issues
+        cache: Optional InventoryCache. Slides found in the cache skip text
+            measurement; newly analyzed slides are added to it.
 
     Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
     Shapes are sorted by visual position (top-to-bottom, left-to-right).
@@ -929,35 +1193,16 @@ def extract_text_inventory(
     if prs is None:
         prs = Presentation(str(pptx_path))
     inventory: InventoryData = {}
+    part_digests: Dict[int, str] = {}
 
     for slide_idx, slide in enumerate(prs.slides):
-        # Collect all valid shapes from this slide with absolute positions
-        shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+        key = slide_cache_key(slide, part_digests) if cache is not None else None
+        cached = cache.get(key) if cache is not None and key else None
 
-        if not shapes_with_positions:
-            continue
-
-        # Convert to ShapeData with absolute positions and slide reference
-        shape_data_list = [
-            ShapeData(
-                swp.shape,
-                swp.absolute_left,
-                swp.absolute_top,
-                slide,
-            )
-            for swp in shapes_with_positions
-        ]
-
-        # Sort by visual position and assign stable IDs in one step
-        sorted_shapes = sort_shapes_by_position(shape_data_list)
-        for idx, shape_data in enumerate(sorted_shapes):
-            shape_data.shape_id = f"shape-{idx}"
+        sorted_shapes = extract_slide_shapes(slide, cached)
 
-        # Detect overlaps using the stable shape IDs
-        if len(sorted_shapes) > 1:
-            detect_overlaps(sorted_shapes)
+        if cache is not None and key and cached is None:
+            cache.put(key, {sd.shape_id: sd.to_dict() for sd in sorted_shapes})
 
         # Filter for issues only if requested (after overlap detection)
         if issues_only:
@@ -974,28 +1219,55 @@ def extract_text_inventory(
     return inventory
 
 
-def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
+def get_inventory_as_dict(
+    pptx_path: Path,
+    issues_only: bool = False,
+    prs: Optional[Any] = None,
+    cache: Optional[InventoryCache] = None,
+) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
     This is a convenience wrapper around extract_text_inventory that returns
     dictionaries instead of ShapeData objects, useful for testing and direct
-    JSON serialization.
+    JSON serialization. Slides found in the cache are returned without
+    touching their shapes at all.
 
     Args:
         pptx_path: Path to the PowerPoint file
         issues_only: If True, only include shapes that have overflow or overlap issues
+        prs: Optional Presentation object to use. If not provided, will load from pptx_path.
+        cache: Optional InventoryCache to read from and populate
 
     Returns:
         Nested dictionary with all data serialized for JSON
     """
-    inventory = extract_text_inventory(pptx_path, issues_only=issues_only)
-
-    # Convert ShapeData objects to dictionaries
+    if prs is None:
+        prs = Presentation(str(pptx_path))
     dict_inventory: InventoryDict = {}
-    for slide_key, shapes in inventory.items():
-        dict_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
-        }
+    part_digests: Dict[int, str] = {}
+
+    for slide_idx, slide in enumerate(prs.slides):
+        key = slide_cache_key(slide, part_digests) if cache is not None else None
+        slide_dict = cache.get(key) if cache is not None and key else None
+
+        if slide_dict is None:
+            slide_dict = {
+                shape_data.shape_id: shape_data.to_dict()
+                for shape_data in extract_slide_shapes(slide)
+            }
+            if cache is not None and key:
+                cache.put(key, slide_dict)
+
+        # Filter for issues only if requested
+        if issues_only:
+            slide_dict = {
+                shape_key: shape_dict
+                for shape_key, shape_dict in slide_dict.items()
+                if shape_dict_has_issues(shape_dict)
+            }
+
+        if slide_dict:
+            dict_inventory[f"slide-{slide_idx}"] = slide_dict
 
     return dict_inventory
 
@@ -1012,8 +1284,13 @@ def save_inventory(inventory: InventoryData, output_path: Path) -> None:
             shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
         }
 
+    write_inventory_json(json_inventory, output_path)
+
+
+def write_inventory_json(inventory: InventoryDict, output_path: Path) -> None:
+    """Write an already serialized inventory to a JSON file."""
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(json_inventory, f, indent=2, ensure_ascii=False)
+        json.dump(inventory, f, indent=2, ensure_ascii=False)
 
 
 if __name__ == "__main__":
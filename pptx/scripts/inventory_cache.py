@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk caches for per-slide text inventories and slide images.
+
+inventory.py, replace.py and thumbnail.py all extract the same text inventory
+for the same deck. Extraction is dominated by font lookups and PIL text
+measurement, so the serialized result of each slide (the ``to_dict()`` output
+of its shapes) is stored on disk under a content hash of everything the
+inventory depends on. Re-running any of the tools on an unchanged deck is then
+a cache hit per slide. thumbnail.py stores rendered slide images the same way,
+so regenerating grids after an edit only re-renders the changed slides.
+
+Each cache is a directory of small files, one per slide key. Least recently
+used entries are evicted once the directory grows past its size limit; an
+entry's modification time doubles as its last-access time.
+
+Environment variables:
+    PPTX_INVENTORY_CACHE_DIR: Cache directory (default: ~/.cache/pptx-skill/inventory)
+    PPTX_INVENTORY_CACHE_MAX_BYTES: Size limit in bytes (default: 64 MiB)
+    PPTX_INVENTORY_CACHE: Set to "0" or "off" to disable the cache entirely
+    PPTX_THUMBNAIL_CACHE_DIR: Image cache directory (default: ~/.cache/pptx-skill/thumbnails)
+    PPTX_THUMBNAIL_CACHE_MAX_BYTES: Image cache size limit in bytes (default: 256 MiB)
+    PPTX_THUMBNAIL_CACHE: Set to "0" or "off" to disable the image cache
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "pptx-skill" / "inventory"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_IMAGE_CACHE_DIR = Path.home() / ".cache" / "pptx-skill" / "thumbnails"
+DEFAULT_IMAGE_MAX_BYTES = 256 * 1024 * 1024
+DISABLED_VALUES = {"0", "off", "false"}
+EVICT_TARGET_RATIO = 0.8  # Evict down to this fraction of max_bytes
+
+# Serialized shapes of one slide: {shape_id -> ShapeData.to_dict()}
+SlideEntry = Dict[str, Dict[str, Any]]
+
+
+class DiskCache:
+    """Content-addressed, size-bounded LRU store of opaque byte entries."""
+
+    suffix = ".bin"
+    env_prefix = "PPTX_CACHE"
+    default_dir = DEFAULT_CACHE_DIR
+    default_max_bytes = DEFAULT_MAX_BYTES
+
+    def __init__(
+        self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None
+    ):
+        """Open (and lazily create) a cache directory.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total size above which least recently used entries are evicted
+        """
+        if cache_dir is None:
+            cache_dir = Path(
+                os.environ.get(f"{self.env_prefix}_DIR", self.default_dir)
+            )
+        if max_bytes is None:
+            max_bytes = int(
+                os.environ.get(f"{self.env_prefix}_MAX_BYTES", self.default_max_bytes)
+            )
+
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes: Optional[int] = None  # Computed on first write
+
+    def _entry_path(self, key: str) -> Path:
+        """Shard entries by key prefix to keep directories small."""
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes for key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return data
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        """Store bytes under key, evicting old entries if the cache is full."""
+        path = self._entry_path(key)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous_size = path.stat().st_size if path.exists() else 0
+
+            # Write atomically so concurrent readers never see partial entries
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except OSError:
+            return  # Caching is best-effort
+
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, _, size in self._scan())
+        else:
+            self._total_bytes += len(data) - previous_size
+
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def _scan(self) -> List[Tuple[float, Path, int]]:
+        """List (last_used, path, size) for every entry in the cache."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.glob(f"*/*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under the target size."""
+        entries = sorted(self._scan(), key=lambda e: e[0])
+        total = sum(size for _, _, size in entries)
+        target = int(self.max_bytes * EVICT_TARGET_RATIO)
+
+        for _, path, size in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                continue
+
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for _, path, _ in self._scan():
+            try:
+                path.unlink()
+            except OSError:
+                continue
+        self._total_bytes = 0
+
+
+class InventoryCache(DiskCache):
+    """Cache of serialized slide inventories, stored as JSON."""
+
+    suffix = ".json"
+    env_prefix = "PPTX_INVENTORY_CACHE"
+
+    def get(self, key: str) -> Optional[SlideEntry]:
+        """Return the cached slide entry for key, or None on a miss."""
+        data = self.get_bytes(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except ValueError:
+            # Count corrupt entries as misses
+            self.hits -= 1
+            self.misses += 1
+            return None
+
+    def put(self, key: str, entry: SlideEntry) -> None:
+        """Store a slide entry, evicting old entries if the cache is full."""
+        data = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        self.put_bytes(key, data)
+
+
+class SlideImageCache(DiskCache):
+    """Cache of rendered slide images, stored as encoded JPEG bytes."""
+
+    suffix = ".jpg"
+    env_prefix = "PPTX_THUMBNAIL_CACHE"
+    default_dir = DEFAULT_IMAGE_CACHE_DIR
+    default_max_bytes = DEFAULT_IMAGE_MAX_BYTES
+
+
+def get_default_cache() -> Optional[InventoryCache]:
+    """Return the shared cache, or None if disabled via PPTX_INVENTORY_CACHE."""
+    if os.environ.get("PPTX_INVENTORY_CACHE", "").lower() in DISABLED_VALUES:
+        return None
+    return InventoryCache()
+
+
+def get_default_image_cache() -> Optional[SlideImageCache]:
+    """Return the shared slide image cache, or None if disabled via PPTX_THUMBNAIL_CACHE."""
+    if os.environ.get("PPTX_THUMBNAIL_CACHE", "").lower() in DISABLED_VALUES:
+        return None
+    return SlideImageCache()
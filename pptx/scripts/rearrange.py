@@ -12,11 +12,17 @@ Slides can be repeated (e.g., 34 appears twice).
 import argparse
 import shutil
 import sys
+from collections import Counter
 from copy import deepcopy
 from pathlib import Path
 
 import six
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.parts.slide import SlidePart
+
+# Relationship attribute namespace (r:embed, r:link, r:id)
+R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
 
 
 def main():
@@ -73,83 +79,88 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
 
 
 def duplicate_slide(pres, index):
-    """Duplicate a slide in the presentation."""
+    """Duplicate a slide in the presentation.
+
+    The copy shares the source slide's image and media parts rather than
+    storing them again, and is appended at the end of the slide list.
+    """
     source = pres.slides[index]
 
-    # Use source's layout to preserve formatting
-    new_slide = pres.slides.add_slide(source.slide_layout)
+    # Create a blank slide part on the source's layout to preserve formatting.
+    # Unlike pres.slides.add_slide this skips cloning layout placeholders that
+    # would be replaced anyway, and adds the presentation relationship without
+    # scanning every existing slide relationship.
+    slide_part = SlidePart.new(
+        pres.part._next_slide_partname, pres.part.package, source.slide_layout.part
+    )
+    rId = pres.part.rels._add_relationship(RT.SLIDE, slide_part)
+    pres.slides._sldIdLst.add_sldId(rId)
+    new_slide = slide_part.slide
 
-    # Collect all image and media relationships from the source slide
-    image_rels = {}
+    # Relate the new slide to the same image/media parts and external links
+    rId_map = {}
     for rel_id, rel in six.iteritems(source.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
-
-    # CRITICAL: Clear placeholder shapes to avoid duplicates
-    for shape in new_slide.shapes:
-        sp = shape.element
-        sp.getparent().remove(sp)
-
-    # Copy all shapes from source
-    for shape in source.shapes:
-        el = shape.element
-        new_el = deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-
-        # Handle picture shapes - need to update the blip reference
-        # Look for all blip elements (they can be in pic or other contexts)
-        # Using the element's own xpath method without namespaces argument
-        blips = new_el.xpath(".//a:blip[@r:embed]")
-        for blip in blips:
-            old_rId = blip.get(
-                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-            )
-            if old_rId in image_rels:
-                # Create a new relationship in the destination slide for this image
-                old_rel = image_rels[old_rId]
-                # get_or_add returns the rId directly, or adds and returns new rId
-                new_rId = new_slide.part.rels.get_or_add(
-                    old_rel.reltype, old_rel._target
-                )
-                # Update the blip's embed reference to use the new relationship ID
-                blip.set(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                    new_rId,
+        if rel.is_external:
+            if "hyperlink" in rel.reltype:
+                rId_map[rel_id] = new_slide.part.rels.get_or_add_ext_rel(
+                    rel.reltype, rel.target_ref
                 )
+        elif "image" in rel.reltype or "media" in rel.reltype:
+            rId_map[rel_id] = new_slide.part.rels.get_or_add(
+                rel.reltype, rel.target_part
+            )
+
+    # Replace the layout's placeholder shapes with one copy of the source shape tree
+    # (access spTree through the element; new_slide.shapes would cache the old tree)
+    new_tree = deepcopy(source.element.cSld.spTree)
+    old_tree = new_slide.element.cSld.spTree
+    old_tree.getparent().replace(old_tree, new_tree)
 
-    # Copy any additional image/media relationships that might be referenced elsewhere
-    for rel_id, rel in image_rels.items():
-        try:
-            new_slide.part.rels.get_or_add(rel.reltype, rel._target)
-        except Exception:
-            pass  # Relationship might already exist
+    # Point r:embed, r:link and r:id references at the new slide's relationships
+    for el in new_tree.iter():
+        for attr, value in el.attrib.items():
+            if attr.startswith(R_NS) and value in rId_map:
+                el.set(attr, rId_map[value])
 
     return new_slide
 
 
-def delete_slide(pres, index):
-    """Delete a slide from the presentation."""
-    rId = pres.slides._sldIdLst[index].rId
-    pres.part.drop_rel(rId)
-    del pres.slides._sldIdLst[index]
+def plan_rearrangement(slide_sequence, total_slides):
+    """
+    Compute how to build the final slide sequence from the template.
+
+    The first occurrence of each template slide uses the original; later
+    occurrences use duplicates. Runs in O(n) for n = len(slide_sequence).
 
+    Args:
+        slide_sequence: List of slide indices (0-based) to include
+        total_slides: Number of slides in the template
 
-def reorder_slides(pres, slide_index, target_index):
-    """Move a slide from one position to another."""
-    slides = pres.slides._sldIdLst
+    Returns:
+        Tuple of (plan, unused) where plan is a list of (template_idx, is_duplicate)
+        in final order and unused is a sorted list of template slides to delete
+    """
+    for idx in slide_sequence:
+        if idx < 0 or idx >= total_slides:
+            raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
 
-    # Remove slide element from current position
-    slide_element = slides[slide_index]
-    slides.remove(slide_element)
+    plan = []
+    used = set()
+    for template_idx in slide_sequence:
+        plan.append((template_idx, template_idx in used))
+        used.add(template_idx)
 
-    # Insert at target position
-    slides.insert(target_index, slide_element)
+    unused = [idx for idx in range(total_slides) if idx not in used]
+    return plan, unused
 
 
 def rearrange_presentation(template_path, output_path, slide_sequence):
     """
     Create a new presentation with slides from template in specified order.
 
+    Duplicates are appended, unused slides are dropped, and the slide list is
+    rebuilt once in the final order.
+
     Args:
         template_path: Path to template PPTX file
         output_path: Path for output PPTX file
@@ -162,64 +173,40 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
     else:
         prs = Presentation(template_path)
 
-    total_slides = len(prs.slides)
-
-    # Validate indices
-    for idx in slide_sequence:
-        if idx < 0 or idx >= total_slides:
-            raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
-
-    # Track original slides and their duplicates
-    slide_map = []  # List of actual slide indices for final presentation
-    duplicated = {}  # Track duplicates: original_idx -> [duplicate_indices]
+    sld_id_lst = prs.slides._sldIdLst
+    original_ids = list(sld_id_lst)
+    plan, unused = plan_rearrangement(slide_sequence, len(original_ids))
+    copies = Counter(template_idx for template_idx, _ in plan)
 
     # Step 1: DUPLICATE repeated slides
     print(f"Processing {len(slide_sequence)} slides from template...")
-    for i, template_idx in enumerate(slide_sequence):
-        if template_idx in duplicated and duplicated[template_idx]:
-            # Already duplicated this slide, use the duplicate
-            slide_map.append(duplicated[template_idx].pop(0))
+    final_ids = []
+    for i, (template_idx, is_duplicate) in enumerate(plan):
+        if is_duplicate:
+            duplicate_slide(prs, template_idx)
+            final_ids.append(sld_id_lst[-1])
             print(f"  [{i}] Using duplicate of slide {template_idx}")
-        elif slide_sequence.count(template_idx) > 1 and template_idx not in duplicated:
-            # First occurrence of a repeated slide - create duplicates
-            slide_map.append(template_idx)
-            duplicates = []
-            count = slide_sequence.count(template_idx) - 1
-            print(
-                f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
-            )
-            for _ in range(count):
-                duplicate_slide(prs, template_idx)
-                duplicates.append(len(prs.slides) - 1)
-            duplicated[template_idx] = duplicates
         else:
-            # Unique slide or first occurrence already handled, use original
-            slide_map.append(template_idx)
-            print(f"  [{i}] Using original slide {template_idx}")
-
-    # Step 2: DELETE unwanted slides (work backwards)
-    slides_to_keep = set(slide_map)
-    print(f"\nDeleting {len(prs.slides) - len(slides_to_keep)} unused slides...")
-    for i in range(len(prs.slides) - 1, -1, -1):
-        if i not in slides_to_keep:
-            delete_slide(prs, i)
-            # Update slide_map indices after deletion
-            slide_map = [idx - 1 if idx > i else idx for idx in slide_map]
-
-    # Step 3: REORDER to final sequence
-    print(f"Reordering {len(slide_map)} slides to final sequence...")
-    for target_pos in range(len(slide_map)):
-        # Find which slide should be at target_pos
-        current_pos = slide_map[target_pos]
-        if current_pos != target_pos:
-            reorder_slides(prs, current_pos, target_pos)
-            # Update slide_map: the move shifts other slides
-            for i in range(len(slide_map)):
-                if slide_map[i] > current_pos and slide_map[i] <= target_pos:
-                    slide_map[i] -= 1
-                elif slide_map[i] < current_pos and slide_map[i] >= target_pos:
-                    slide_map[i] += 1
-            slide_map[target_pos] = target_pos
+            final_ids.append(original_ids[template_idx])
+            if copies[template_idx] > 1:
+                print(
+                    f"  [{i}] Using original slide {template_idx}, "
+                    f"creating {copies[template_idx] - 1} duplicate(s)"
+                )
+            else:
+                print(f"  [{i}] Using original slide {template_idx}")
+
+    # Step 2: DELETE unwanted slides
+    print(f"\nDeleting {len(unused)} unused slides...")
+    for template_idx in unused:
+        prs.part.rels.pop(original_ids[template_idx].rId)
+
+    # Step 3: REORDER to final sequence in a single pass
+    print(f"Reordering {len(final_ids)} slides to final sequence...")
+    for sld_id in list(sld_id_lst):
+        sld_id_lst.remove(sld_id)
+    for sld_id in final_ids:
+        sld_id_lst.append(sld_id)
 
     # Save the presentation
     prs.save(output_path)
@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 from inventory import InventoryData, extract_text_inventory
+from inventory_cache import get_default_cache
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.dml import MSO_THEME_COLOR
@@ -217,9 +218,13 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     # Load presentation
     prs = Presentation(pptx_file)
 
+    # Slides unchanged since the last inventory.py/replace.py run are reused
+    # from the on-disk cache instead of re-measuring their text
+    cache = get_default_cache()
+
     # Get inventory of all text shapes (returns ShapeData objects)
     # Pass prs to use same Presentation instance
-    inventory = extract_text_inventory(Path(pptx_file), prs)
+    inventory = extract_text_inventory(Path(pptx_file), prs, cache=cache)
 
     # Detect text overflow in original presentation
     original_overflow = detect_frame_overflow(inventory)
@@ -289,19 +294,10 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
                 apply_paragraph_properties(p, para_data)
 
     # Check for issues after replacements
-    # Save to a temporary file and reload to avoid modifying the presentation during inventory
-    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
-    import tempfile
-
-    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        prs.save(str(tmp_path))
-
-    try:
-        updated_inventory = extract_text_inventory(tmp_path)
-        updated_overflow = detect_frame_overflow(updated_inventory)
-    finally:
-        tmp_path.unlink()  # Clean up temp file
+    # (extract_text_inventory reads the XML without modifying it, so the
+    # in-memory presentation can be inspected directly)
+    updated_inventory = extract_text_inventory(Path(pptx_file), prs, cache=cache)
+    updated_overflow = detect_frame_overflow(updated_inventory)
 
     # Check if any text overflow got worse
     overflow_errors = []
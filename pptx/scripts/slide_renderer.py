@@ -0,0 +1,1011 @@
+#!/usr/bin/env python3
+"""
+Lightweight native slide rasterizer for fast thumbnail previews.
+
+Draws slides directly with Pillow instead of converting the whole deck to PDF
+with LibreOffice. It covers the content that dominates typical decks:
+
+- Slide backgrounds (solid, gradient and picture fills, inherited from the
+  layout and master)
+- Rectangles and common autoshapes with solid/gradient fills and outlines
+- Pictures (including cropping) and picture fills
+- Text boxes and placeholders, using the same font resolution as inventory.py
+- Groups, connectors and simple tables
+
+Charts, SmartArt, effects and uncommon geometries are approximated (charts and
+diagrams as labeled boxes, unknown geometries as rectangles). The output is a
+preview: use LibreOffice rendering when pixel fidelity matters.
+
+Classes:
+    SlideRenderer: Renders slides of one presentation at a fixed pixel width
+
+Usage:
+    from slide_renderer import SlideRenderer
+    renderer = SlideRenderer(prs, width_px=600)
+    image = renderer.render(prs.slides[0])
+"""
+
+import colorsys
+import functools
+import io
+import math
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import lxml.etree
+from inventory import ShapeData
+from PIL import Image, ImageDraw, ImageFont
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+# Namespaces
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+A = "{%s}" % NS["a"]
+CHART_URI = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+P = "{%s}" % NS["p"]
+R_EMBED = "{%s}embed" % NS["r"]
+
+EMU_PER_INCH = 914400
+EMU_PER_POINT = 12700
+
+# Defaults from the DrawingML specification
+DEFAULT_INSETS = (91440, 45720, 91440, 45720)  # left, top, right, bottom in EMUs
+DEFAULT_FONT_SIZE = 18.0  # Points
+LINE_HEIGHT_RATIO = 1.2  # Single line spacing relative to font size
+DEFAULT_LINE_WIDTH = 9525  # EMUs (0.75pt)
+DEFAULT_BACKGROUND = (255, 255, 255, 255)
+UNSUPPORTED_FILL = (235, 235, 235, 255)
+UNSUPPORTED_OUTLINE = (170, 170, 170, 255)
+PICTURE_CACHE_SIZE = 64  # Decoded pictures kept across slides
+
+PRESET_COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "gray": (128, 128, 128),
+    "darkGray": (169, 169, 169),
+    "lightGray": (211, 211, 211),
+}
+
+Color = Tuple[int, int, int, int]
+# Affine transform from EMUs to pixels: (scale_x, scale_y, offset_x, offset_y)
+Transform = Tuple[float, float, float, float]
+
+
+def _local(tag: Any) -> str:
+    """Return an element tag without its namespace."""
+    return tag.split("}")[-1] if isinstance(tag, str) else ""
+
+
+@functools.lru_cache(maxsize=256)
+def _load_font(font_name: str, size_px: int, bold: bool) -> Any:
+    """Load a font at a pixel size, resolved the same way as inventory.py."""
+    candidates = [f"{font_name} Bold", f"{font_name}-Bold"] if bold else []
+    candidates.append(font_name)
+    for candidate in candidates:
+        font_path = ShapeData.get_font_path(candidate)
+        if font_path:
+            try:
+                return ImageFont.truetype(font_path, size=size_px)
+            except OSError:
+                continue  # Unreadable or unsupported font file
+    try:
+        return ImageFont.load_default(size=size_px)
+    except TypeError:
+        # Fall back to basic default font if size parameter not supported
+        return ImageFont.load_default()
+
+
+class SlideRenderer:
+    """Renders slides of one presentation with Pillow."""
+
+    def __init__(self, prs: Any, width_px: int):
+        """Prepare a renderer for a presentation.
+
+        Args:
+            prs: python-pptx Presentation object
+            width_px: Width of rendered slide images in pixels
+        """
+        self.slide_width = prs.slide_width or 9144000
+        self.slide_height = prs.slide_height or 5143500
+        self.width_px = width_px
+        self.scale = width_px / self.slide_width
+        self.height_px = max(1, round(self.slide_height * self.scale))
+
+        self._themes: Dict[int, Dict[str, Any]] = {}
+        # Undecodable pictures are cached as None so they are reported once
+        self._pictures: "OrderedDict[str, Optional[Image.Image]]" = OrderedDict()
+
+    # ============ PUBLIC API ============
+
+    def render(self, slide: Any) -> Image.Image:
+        """Render a slide to an RGB image of the configured size."""
+        layout = slide.slide_layout
+        master = layout.slide_master
+        theme = self._get_theme(master)
+
+        canvas = Image.new("RGBA", (self.width_px, self.height_px), DEFAULT_BACKGROUND)
+        self._draw_background(canvas, [slide, layout, master], theme)
+
+        # Master and layout decorations are shown unless hidden by showMasterSp
+        base_transform: Transform = (self.scale, self.scale, 0.0, 0.0)
+        if slide.element.get("showMasterSp") != "0":
+            if layout.element.get("showMasterSp") != "0":
+                self._draw_shapes(canvas, master.shapes, base_transform, theme, True)
+            self._draw_shapes(canvas, layout.shapes, base_transform, theme, True)
+        self._draw_shapes(canvas, slide.shapes, base_transform, theme, False)
+
+        return canvas.convert("RGB")
+
+    # ============ THEME AND COLORS ============
+
+    def _get_theme(self, master: Any) -> Dict[str, Any]:
+        """Load color scheme, color map and fonts for a slide master."""
+        key = id(master.part)
+        if key in self._themes:
+            return self._themes[key]
+
+        colors: Dict[str, Tuple[int, int, int]] = {}
+        fonts = {"major": "Calibri", "minor": "Calibri"}
+        try:
+            theme_root = lxml.etree.fromstring(master.part.part_related_by(RT.THEME).blob)
+            scheme = theme_root.find(f".//{A}clrScheme")
+            for entry in scheme if scheme is not None else []:
+                rgb = self._parse_base_color(entry, {}, {})
+                if rgb is not None:
+                    colors[_local(entry.tag)] = rgb[:3]
+            for kind in ("major", "minor"):
+                latin = theme_root.find(f".//{A}{kind}Font/{A}latin")
+                if latin is not None and latin.get("typeface"):
+                    fonts[kind] = latin.get("typeface")
+        except (KeyError, lxml.etree.XMLSyntaxError):
+            pass
+
+        color_map = {"bg1": "lt1", "tx1": "dk1", "bg2": "lt2", "tx2": "dk2"}
+        clr_map = master.element.find(f"{P}clrMap")
+        if clr_map is not None:
+            color_map.update(clr_map.attrib)
+
+        theme = {
+            "colors": colors,
+            "color_map": color_map,
+            "fonts": fonts,
+            "master": master,
+        }
+        self._themes[key] = theme
+        return theme
+
+    def _parse_base_color(
+        self,
+        parent: Any,
+        theme_colors: Dict[str, Tuple[int, int, int]],
+        color_map: Dict[str, str],
+        placeholder_color: Optional[Color] = None,
+    ) -> Optional[Color]:
+        """Resolve the first color child of parent, applying color modifiers."""
+        for child in parent:
+            tag = _local(child.tag)
+            rgb: Optional[Tuple[int, int, int]] = None
+            if tag == "srgbClr":
+                value = child.get("val", "000000")
+                rgb = (int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16))
+            elif tag == "sysClr":
+                value = child.get("lastClr") or (
+                    "FFFFFF" if child.get("val") == "window" else "000000"
+                )
+                rgb = (int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16))
+            elif tag == "schemeClr":
+                name = child.get("val", "")
+                if name == "phClr" and placeholder_color is not None:
+                    rgb = placeholder_color[:3]
+                else:
+                    name = color_map.get(name, name)
+                    rgb = theme_colors.get(name, (0, 0, 0))
+            elif tag == "prstClr":
+                rgb = PRESET_COLORS.get(child.get("val", ""), (0, 0, 0))
+            elif tag == "scrgbClr":
+                rgb = tuple(  # type: ignore
+                    min(255, int(int(child.get(c, "0")) / 100000 * 255))
+                    for c in ("r", "g", "b")
+                )
+            if rgb is not None:
+                return self._apply_color_modifiers(rgb, child)
+        return None
+
+    @staticmethod
+    def _apply_color_modifiers(rgb: Tuple[int, int, int], color_elem: Any) -> Color:
+        """Apply lumMod/lumOff/tint/shade/alpha modifiers to a base color."""
+        r, g, b = (c / 255.0 for c in rgb)
+        alpha = 1.0
+        for modifier in color_elem:
+            name = _local(modifier.tag)
+            value = int(modifier.get("val", "100000")) / 100000.0
+            if name in ("lumMod", "lumOff"):
+                h, lum, s = colorsys.rgb_to_hls(r, g, b)
+                lum = lum * value if name == "lumMod" else lum + value
+                r, g, b = colorsys.hls_to_rgb(h, min(1.0, max(0.0, lum)), s)
+            elif name == "tint":
+                r, g, b = (c * value + (1 - value) for c in (r, g, b))
+            elif name == "shade":
+                r, g, b = (c * value for c in (r, g, b))
+            elif name == "alpha":
+                alpha = value
+        return (
+            round(min(1.0, max(0.0, r)) * 255),
+            round(min(1.0, max(0.0, g)) * 255),
+            round(min(1.0, max(0.0, b)) * 255),
+            round(min(1.0, max(0.0, alpha)) * 255),
+        )
+
+    def _color(
+        self, parent: Any, theme: Dict[str, Any], placeholder_color: Optional[Color] = None
+    ) -> Optional[Color]:
+        """Resolve a color element using the slide's theme."""
+        if parent is None:
+            return None
+        return self._parse_base_color(
+            parent, theme["colors"], theme["color_map"], placeholder_color
+        )
+
+    # ============ FILLS ============
+
+    def _fill_image(
+        self,
+        fill_elem: Any,
+        size: Tuple[int, int],
+        theme: Dict[str, Any],
+        part: Any,
+        placeholder_color: Optional[Color] = None,
+    ) -> Optional[Any]:
+        """Turn a fill element into a color or an RGBA image of the given size.
+
+        Returns None for noFill and for fills that cannot be resolved.
+        """
+        tag = _local(fill_elem.tag)
+        if tag == "solidFill":
+            return self._color(fill_elem, theme, placeholder_color)
+        if tag == "gradFill":
+            return self._gradient(fill_elem, size, theme, placeholder_color)
+        if tag == "blipFill":
+            blip = fill_elem.find(f"{A}blip")
+            picture = self._load_picture(part, blip) if blip is not None else None
+            if picture is not None:
+                return picture.resize(size, Image.Resampling.BILINEAR)
+        return None
+
+    def _gradient(
+        self,
+        grad_fill: Any,
+        size: Tuple[int, int],
+        theme: Dict[str, Any],
+        placeholder_color: Optional[Color] = None,
+    ) -> Optional[Image.Image]:
+        """Render a linear gradient (path gradients are drawn as linear)."""
+        stops = []
+        for gs in grad_fill.iterfind(f"{A}gsLst/{A}gs"):
+            color = self._color(gs, theme, placeholder_color)
+            if color is not None:
+                stops.append((int(gs.get("pos", "0")) / 100000.0, color))
+        if not stops:
+            return None
+        stops.sort(key=lambda s: s[0])
+
+        # Build a 256-step color ramp, then stretch and rotate it
+        ramp = Image.new("RGBA", (256, 1))
+        for x in range(256):
+            t = x / 255.0
+            lower = stops[0]
+            upper = stops[-1]
+            for stop in stops:
+                if stop[0] <= t:
+                    lower = stop
+                if stop[0] >= t:
+                    upper = stop
+                    break
+            span = upper[0] - lower[0]
+            f = (t - lower[0]) / span if span > 0 else 0.0
+            ramp.putpixel(
+                (x, 0),
+                tuple(  # type: ignore
+                    round(lc + (uc - lc) * f) for lc, uc in zip(lower[1], upper[1])
+                ),
+            )
+
+        width, height = max(1, size[0]), max(1, size[1])
+        lin = grad_fill.find(f"{A}lin")
+        angle = int(lin.get("ang", "0")) / 60000.0 if lin is not None else 90.0
+        if angle % 180 == 0:
+            gradient = ramp.resize((width, height), Image.Resampling.BILINEAR)
+            if angle % 360:
+                return gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+            return gradient
+        if angle % 180 == 90:
+            gradient = ramp.resize((height, width), Image.Resampling.BILINEAR)
+            gradient = gradient.transpose(Image.Transpose.ROTATE_270)
+            if angle % 360 == 270:
+                return gradient.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+            return gradient
+
+        diagonal = int(math.ceil(math.hypot(width, height)))
+        gradient = ramp.resize((diagonal, diagonal), Image.Resampling.BILINEAR)
+        gradient = gradient.rotate(-angle, resample=Image.Resampling.BILINEAR)
+        left = (diagonal - width) // 2
+        top = (diagonal - height) // 2
+        return gradient.crop((left, top, left + width, top + height))
+
+    def _load_picture(self, part: Any, blip: Any) -> Optional[Image.Image]:
+        """Decode an embedded picture, shared across slides that reuse it."""
+        rid = blip.get(R_EMBED)
+        if not rid:
+            return None
+        try:
+            image_part = part.related_part(rid)
+        except KeyError:
+            return None
+
+        key = str(image_part.partname)
+        if key in self._pictures:
+            self._pictures.move_to_end(key)
+            return self._pictures[key]
+
+        try:
+            picture = Image.open(io.BytesIO(image_part.blob))
+            # Decode JPEGs at reduced size when the slide is much smaller
+            picture.draft("RGB", (self.width_px, self.height_px))
+            picture.load()
+            if max(picture.size) > 2 * max(self.width_px, self.height_px):
+                picture.thumbnail((2 * self.width_px, 2 * self.height_px))
+            picture = picture.convert("RGBA")
+        except Exception as e:
+            # Unsupported format (e.g. EMF/WMF); drawn as a labeled box
+            print(f"Warning: cannot decode picture {key}: {e}")
+            picture = None
+
+        self._pictures[key] = picture
+        if len(self._pictures) > PICTURE_CACHE_SIZE:
+            self._pictures.popitem(last=False)
+        return picture
+
+    def _draw_background(
+        self, canvas: Image.Image, sources: List[Any], theme: Dict[str, Any]
+    ) -> None:
+        """Paint the first background defined on the slide, layout or master."""
+        for source in sources:
+            bg = source.element.find(f"{P}cSld/{P}bg")
+            if bg is None:
+                continue
+            bg_pr = bg.find(f"{P}bgPr")
+            if bg_pr is not None:
+                for fill_elem in bg_pr:
+                    fill = self._fill_image(fill_elem, canvas.size, theme, source.part)
+                    if fill is not None:
+                        self._paste_fill(canvas, fill, None, (0, 0))
+                        return
+            bg_ref = bg.find(f"{P}bgRef")
+            if bg_ref is not None:
+                color = self._color(bg_ref, theme)
+                if color is not None:
+                    canvas.paste(color, (0, 0, *canvas.size))
+                    return
+            return
+
+    # ============ SHAPES ============
+
+    def _draw_shapes(
+        self,
+        canvas: Image.Image,
+        shapes: Any,
+        transform: Transform,
+        theme: Dict[str, Any],
+        skip_placeholders: bool,
+    ) -> None:
+        """Draw a shape collection in z-order."""
+        for shape in shapes:
+            if skip_placeholders and getattr(shape, "is_placeholder", False):
+                continue
+            try:
+                self._draw_shape(canvas, shape, transform, theme)
+            except Exception as e:
+                # A malformed shape should not prevent the rest of the preview
+                print(
+                    f"Warning: skipped shape {shape.shape_id} ({shape.name!r}) "
+                    f"on {shape.part.partname}: {e}"
+                )
+
+    def _box(self, shape: Any, transform: Transform) -> Tuple[int, int, int, int]:
+        """Return the pixel box (left, top, width, height) of a shape."""
+        sx, sy, tx, ty = transform
+        left = (shape.left or 0) * sx + tx
+        top = (shape.top or 0) * sy + ty
+        return (
+            round(left),
+            round(top),
+            max(1, round((shape.width or 0) * sx)),
+            max(1, round((shape.height or 0) * sy)),
+        )
+
+    def _draw_shape(
+        self, canvas: Image.Image, shape: Any, transform: Transform, theme: Dict[str, Any]
+    ) -> None:
+        """Draw a single shape of any supported kind."""
+        element = shape.element
+        tag = _local(element.tag)
+
+        if tag == "grpSp":
+            self._draw_group(canvas, shape, transform, theme)
+            return
+
+        box = self._box(shape, transform)
+        xfrm = element.find(f".//{A}xfrm")
+        rotation = int(xfrm.get("rot", "0")) / 60000.0 if xfrm is not None else 0.0
+        flip_h = xfrm is not None and xfrm.get("flipH") == "1"
+        flip_v = xfrm is not None and xfrm.get("flipV") == "1"
+
+        if tag == "pic":
+            blip = element.find(f".//{A}blip")
+            picture = self._load_picture(shape.part, blip) if blip is not None else None
+            if picture is None:
+                self._draw_unsupported(canvas, box, "Picture")
+                return
+            src_rect = element.find(f".//{A}srcRect")
+            if src_rect is not None:
+                picture = self._crop(picture, src_rect)
+            layer = picture.resize(box[2:], Image.Resampling.BILINEAR)
+            if flip_h:
+                layer = layer.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+            if flip_v:
+                layer = layer.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+            self._composite(canvas, layer, box, rotation)
+            self._draw_outline(canvas, element, shape, box, theme, "rect", rotation)
+            return
+
+        if tag == "graphicFrame":
+            if element.find(f".//{A}tbl") is not None:
+                self._draw_table(canvas, shape, box, theme)
+            else:
+                graphic_data = element.find(f"{A}graphic/{A}graphicData")
+                uri = graphic_data.get("uri") if graphic_data is not None else None
+                self._draw_unsupported(canvas, box, "Chart" if uri == CHART_URI else "Object")
+            return
+
+        geometry = "line" if tag == "cxnSp" else "rect"
+        prst_geom = element.find(f"{P}spPr/{A}prstGeom")
+        if prst_geom is not None:
+            geometry = prst_geom.get("prst", geometry)
+
+        if geometry in ("line", "straightConnector1") or tag == "cxnSp":
+            self._draw_line(canvas, element, box, theme, flip_h, flip_v)
+        else:
+            fill = self._shape_fill(element, shape, box, theme)
+            if fill is not None:
+                mask = self._geometry_mask(geometry, box[2:], element)
+                if flip_h:
+                    mask = mask.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+                if flip_v:
+                    mask = mask.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+                layer = Image.new("RGBA", box[2:], (0, 0, 0, 0))
+                self._paste_fill(layer, fill, mask, (0, 0))
+                self._composite(canvas, layer, box, rotation)
+            self._draw_outline(canvas, element, shape, box, theme, geometry, rotation)
+
+        if element.find(f"{P}txBody") is not None:
+            self._draw_text(canvas, shape, box, theme)
+
+    def _draw_group(
+        self, canvas: Image.Image, group: Any, transform: Transform, theme: Dict[str, Any]
+    ) -> None:
+        """Draw group children, mapping child coordinates into slide space."""
+        xfrm = group.element.find(f"{P}grpSpPr/{A}xfrm")
+        child_transform = transform
+        if xfrm is not None:
+            off = xfrm.find(f"{A}off")
+            ext = xfrm.find(f"{A}ext")
+            ch_off = xfrm.find(f"{A}chOff")
+            ch_ext = xfrm.find(f"{A}chExt")
+            if None not in (off, ext, ch_off, ch_ext):
+                sx, sy, tx, ty = transform
+                ratio_x = int(ext.get("cx")) / max(1, int(ch_ext.get("cx")))
+                ratio_y = int(ext.get("cy")) / max(1, int(ch_ext.get("cy")))
+                child_transform = (
+                    sx * ratio_x,
+                    sy * ratio_y,
+                    tx + sx * (int(off.get("x")) - int(ch_off.get("x")) * ratio_x),
+                    ty + sy * (int(off.get("y")) - int(ch_off.get("y")) * ratio_y),
+                )
+        self._draw_shapes(canvas, group.shapes, child_transform, theme, False)
+
+    def _shape_fill(
+        self, element: Any, shape: Any, box: Tuple[int, int, int, int], theme: Dict[str, Any]
+    ) -> Optional[Any]:
+        """Resolve a shape's fill from spPr, falling back to its style reference."""
+        sp_pr = element.find(f"{P}spPr")
+        if sp_pr is not None:
+            for child in sp_pr:
+                name = _local(child.tag)
+                if name == "noFill":
+                    return None
+                if name in ("solidFill", "gradFill", "blipFill"):
+                    return self._fill_image(child, box[2:], theme, shape.part)
+
+        fill_ref = element.find(f"{P}style/{A}fillRef")
+        if fill_ref is not None and fill_ref.get("idx", "0") != "0":
+            return self._color(fill_ref, theme)
+        return None
+
+    def _line_style(
+        self, element: Any, theme: Dict[str, Any]
+    ) -> Tuple[Optional[Color], int]:
+        """Resolve a shape's outline color and width in pixels."""
+        ln = element.find(f"{P}spPr/{A}ln")
+        width_emu = DEFAULT_LINE_WIDTH
+        color: Optional[Color] = None
+        has_explicit_line = False
+
+        if ln is not None:
+            width_emu = int(ln.get("w", DEFAULT_LINE_WIDTH))
+            if ln.find(f"{A}noFill") is not None:
+                return None, 0
+            solid = ln.find(f"{A}solidFill")
+            if solid is not None:
+                color = self._color(solid, theme)
+                has_explicit_line = True
+
+        if not has_explicit_line:
+            ln_ref = element.find(f"{P}style/{A}lnRef")
+            if ln_ref is None or ln_ref.get("idx", "0") == "0":
+                return None, 0
+            color = self._color(ln_ref, theme)
+
+        return color, max(1, round(width_emu * self.scale))
+
+    def _draw_outline(
+        self,
+        canvas: Image.Image,
+        element: Any,
+        shape: Any,
+        box: Tuple[int, int, int, int],
+        theme: Dict[str, Any],
+        geometry: str,
+        rotation: float,
+    ) -> None:
+        """Draw a shape's outline (unrotated outlines only)."""
+        color, width = self._line_style(element, theme)
+        if color is None or rotation:
+            return
+        left, top, w, h = box
+        draw = ImageDraw.Draw(canvas)
+        rect = [left, top, left + w - 1, top + h - 1]
+        if geometry == "ellipse":
+            draw.ellipse(rect, outline=color, width=width)
+        elif geometry == "roundRect":
+            draw.rounded_rectangle(
+                rect, radius=self._corner_radius(element, w, h), outline=color, width=width
+            )
+        elif geometry in _POLYGONS:
+            points = [(left + x * w, top + y * h) for x, y in _POLYGONS[geometry]]
+            draw.polygon(points, outline=color, width=width)
+        else:
+            draw.rectangle(rect, outline=color, width=width)
+
+    def _draw_line(
+        self,
+        canvas: Image.Image,
+        element: Any,
+        box: Tuple[int, int, int, int],
+        theme: Dict[str, Any],
+        flip_h: bool,
+        flip_v: bool,
+    ) -> None:
+        """Draw a connector or line shape."""
+        color, width = self._line_style(element, theme)
+        if color is None:
+            color, width = (0, 0, 0, 255), 1
+        left, top, w, h = box
+        x1, x2 = (left + w, left) if flip_h else (left, left + w)
+        y1, y2 = (top + h, top) if flip_v else (top, top + h)
+        ImageDraw.Draw(canvas).line([(x1, y1), (x2, y2)], fill=color, width=width)
+
+    def _corner_radius(self, element: Any, width: int, height: int) -> int:
+        """Corner radius of a roundRect from its adjustment value."""
+        adj = 16667
+        gd = element.find(f"{P}spPr/{A}prstGeom/{A}avLst/{A}gd")
+        if gd is not None and gd.get("fmla", "").startswith("val "):
+            try:
+                adj = int(gd.get("fmla").split()[1])
+            except ValueError:
+                pass
+        return max(0, round(min(width, height) * adj / 100000))
+
+    def _geometry_mask(self, geometry: str, size: Tuple[int, int], element: Any) -> Image.Image:
+        """Build an L-mode mask for a preset geometry."""
+        width, height = size
+        mask = Image.new("L", size, 0)
+        draw = ImageDraw.Draw(mask)
+        rect = [0, 0, width - 1, height - 1]
+        if geometry == "ellipse":
+            draw.ellipse(rect, fill=255)
+        elif geometry == "roundRect":
+            draw.rounded_rectangle(
+                rect, radius=self._corner_radius(element, width, height), fill=255
+            )
+        elif geometry in _POLYGONS:
+            draw.polygon([(x * width, y * height) for x, y in _POLYGONS[geometry]], fill=255)
+        else:
+            mask.paste(255, (0, 0, width, height))
+        return mask
+
+    @staticmethod
+    def _crop(picture: Image.Image, src_rect: Any) -> Image.Image:
+        """Apply an a:srcRect crop (values in thousandths of a percent)."""
+        width, height = picture.size
+        left = int(src_rect.get("l", "0")) / 100000 * width
+        top = int(src_rect.get("t", "0")) / 100000 * height
+        right = width - int(src_rect.get("r", "0")) / 100000 * width
+        bottom = height - int(src_rect.get("b", "0")) / 100000 * height
+        if right - left < 1 or bottom - top < 1:
+            return picture
+        return picture.crop((round(left), round(top), round(right), round(bottom)))
+
+    @staticmethod
+    def _paste_fill(
+        target: Image.Image, fill: Any, mask: Optional[Image.Image], origin: Tuple[int, int]
+    ) -> None:
+        """Paste a color or image fill through an optional mask."""
+        if isinstance(fill, tuple):
+            layer = Image.new("RGBA", mask.size if mask else target.size, fill)
+        else:
+            layer = fill
+        if mask is not None:
+            alpha = layer.getchannel("A")
+            layer = layer.copy()
+            layer.putalpha(Image.composite(alpha, Image.new("L", mask.size, 0), mask))
+        target.alpha_composite(layer, dest=origin)
+
+    @staticmethod
+    def _composite(
+        canvas: Image.Image,
+        layer: Image.Image,
+        box: Tuple[int, int, int, int],
+        rotation: float,
+    ) -> None:
+        """Alpha-composite a layer at a box, rotating about its center if needed."""
+        left, top, width, height = box
+        if rotation:
+            layer = layer.rotate(-rotation, expand=True, resample=Image.Resampling.BILINEAR)
+            left += (width - layer.width) // 2
+            top += (height - layer.height) // 2
+
+        # alpha_composite requires non-negative destinations, so clip manually
+        crop_left = max(0, -left)
+        crop_top = max(0, -top)
+        crop_right = min(layer.width, canvas.width - left)
+        crop_bottom = min(layer.height, canvas.height - top)
+        if crop_right <= crop_left or crop_bottom <= crop_top:
+            return
+        if (crop_left, crop_top, crop_right, crop_bottom) != (0, 0, *layer.size):
+            layer = layer.crop((crop_left, crop_top, crop_right, crop_bottom))
+        canvas.alpha_composite(layer, dest=(left + crop_left, top + crop_top))
+
+    def _draw_unsupported(
+        self, canvas: Image.Image, box: Tuple[int, int, int, int], label: str
+    ) -> None:
+        """Draw a labeled box for content the native renderer does not support."""
+        left, top, width, height = box
+        draw = ImageDraw.Draw(canvas)
+        draw.rectangle(
+            [left, top, left + width - 1, top + height - 1],
+            fill=UNSUPPORTED_FILL,
+            outline=UNSUPPORTED_OUTLINE,
+            width=1,
+        )
+        font = _load_font("Arial", max(8, min(height // 4, width // 6, 24)), False)
+        text_box = draw.textbbox((0, 0), label, font=font)
+        draw.text(
+            (
+                left + (width - (text_box[2] - text_box[0])) // 2,
+                top + (height - (text_box[3] - text_box[1])) // 2,
+            ),
+            label,
+            fill=UNSUPPORTED_OUTLINE,
+            font=font,
+        )
+
+    def _draw_table(
+        self,
+        canvas: Image.Image,
+        frame: Any,
+        box: Tuple[int, int, int, int],
+        theme: Dict[str, Any],
+    ) -> None:
+        """Draw a table grid with cell fills and text."""
+        left, top, _, _ = box
+        draw = ImageDraw.Draw(canvas)
+        table = frame.table
+        col_widths = [round(col.width * self.scale) for col in table.columns]
+
+        y = top
+        for row in table.rows:
+            row_height = max(1, round(row.height * self.scale))
+            x = left
+            for col_idx, cell in enumerate(row.cells):
+                width = col_widths[col_idx] if col_idx < len(col_widths) else 0
+                cell_box = (x, y, max(1, width), row_height)
+                tc_pr = cell._tc.find(f"{A}tcPr")
+                solid = tc_pr.find(f"{A}solidFill") if tc_pr is not None else None
+                fill = self._color(solid, theme) if solid is not None else None
+                draw.rectangle(
+                    [x, y, x + max(1, width) - 1, y + row_height - 1],
+                    fill=fill[:3] if fill else None,
+                    outline=UNSUPPORTED_OUTLINE,
+                    width=1,
+                )
+                self._draw_text_body(
+                    canvas, cell._tc.find(f"{A}txBody"), cell_box, theme, None, None
+                )
+                x += width
+            y += row_height
+
+    # ============ TEXT ============
+
+    def _default_text_style(
+        self, shape: Any, theme: Dict[str, Any]
+    ) -> Tuple[Optional[float], Optional[Color]]:
+        """Default font size and color inherited from the layout and master."""
+        master = theme["master"]
+        style_name = "otherStyle"
+        if getattr(shape, "is_placeholder", False):
+            ph_type = str(shape.placeholder_format.type)
+            style_name = "titleStyle" if "TITLE" in ph_type else "bodyStyle"
+
+        size: Optional[float] = None
+        if getattr(shape, "is_placeholder", False):
+            part = getattr(shape, "part", None)
+            layout = getattr(part, "slide_layout", None)
+            if layout is not None:
+                size = ShapeData.get_default_font_size(shape, layout)
+
+        color: Optional[Color] = None
+        def_rpr = master.element.find(f"{P}txStyles/{P}{style_name}/{A}lvl1pPr/{A}defRPr")
+        if def_rpr is not None:
+            if size is None and def_rpr.get("sz"):
+                size = int(def_rpr.get("sz")) / 100.0
+            solid = def_rpr.find(f"{A}solidFill")
+            if solid is not None:
+                color = self._color(solid, theme)
+
+        # Shape style font reference (e.g. white text on filled autoshapes)
+        font_ref = shape.element.find(f"{P}style/{A}fontRef")
+        if font_ref is not None:
+            ref_color = self._color(font_ref, theme)
+            if ref_color is not None:
+                color = ref_color
+
+        return size, color
+
+    def _inherited_text_styles(
+        self, shape: Any, theme: Dict[str, Any]
+    ) -> Tuple[List[Any], List[Any]]:
+        """Body properties and list styles a shape inherits, nearest first.
+
+        Placeholders inherit from the matching layout and master placeholders and
+        then from the master title or body text style; other shapes only from
+        the master's otherStyle. List styles hold the lvl1pPr..lvl9pPr elements.
+        """
+        master_styles = theme["master"].element.find(f"{P}txStyles")
+        style_name = "otherStyle"
+        body_prs: List[Any] = []
+        list_styles: List[Any] = []
+        if getattr(shape, "is_placeholder", False):
+            ph_type = str(shape.placeholder_format.type)
+            style_name = "titleStyle" if "TITLE" in ph_type else "bodyStyle"
+            base = getattr(shape, "_base_placeholder", None)
+            while base is not None:
+                tx_body = base.element.find(f"{P}txBody")
+                if tx_body is not None:
+                    body_prs.append(tx_body.find(f"{A}bodyPr"))
+                    list_styles.append(tx_body.find(f"{A}lstStyle"))
+                base = getattr(base, "_base_placeholder", None)
+        if master_styles is not None:
+            list_styles.append(master_styles.find(f"{P}{style_name}"))
+        return (
+            [elem for elem in body_prs if elem is not None],
+            [elem for elem in list_styles if elem is not None],
+        )
+
+    def _draw_text(
+        self,
+        canvas: Image.Image,
+        shape: Any,
+        box: Tuple[int, int, int, int],
+        theme: Dict[str, Any],
+    ) -> None:
+        """Draw the text of a shape."""
+        default_size, default_color = self._default_text_style(shape, theme)
+        body_prs, list_styles = self._inherited_text_styles(shape, theme)
+        self._draw_text_body(
+            canvas,
+            shape.element.find(f"{P}txBody"),
+            box,
+            theme,
+            default_size,
+            default_color,
+            body_prs,
+            list_styles,
+        )
+
+    def _draw_text_body(
+        self,
+        canvas: Image.Image,
+        tx_body: Any,
+        box: Tuple[int, int, int, int],
+        theme: Dict[str, Any],
+        default_size: Optional[float],
+        default_color: Optional[Color],
+        inherited_body_prs: Sequence[Any] = (),
+        inherited_list_styles: Sequence[Any] = (),
+    ) -> None:
+        """Lay out and draw a txBody inside a pixel box.
+
+        Alignment, anchoring and bullets missing from the txBody itself are
+        taken from the inherited body properties and list styles, nearest first.
+        """
+        if tx_body is None:
+            return
+        body_pr = tx_body.find(f"{A}bodyPr")
+        body_prs = [elem for elem in (body_pr, *inherited_body_prs) if elem is not None]
+        list_styles = [tx_body.find(f"{A}lstStyle"), *inherited_list_styles]
+        list_styles = [elem for elem in list_styles if elem is not None]
+        insets = [
+            int(body_pr.get(attr, default)) if body_pr is not None else default
+            for attr, default in zip(("lIns", "tIns", "rIns", "bIns"), DEFAULT_INSETS)
+        ]
+        wrap = body_pr is None or body_pr.get("wrap") != "none"
+        anchor = next((elem.get("anchor") for elem in body_prs if elem.get("anchor")), "t")
+        font_scale = 1.0
+        autofit = body_pr.find(f"{A}normAutofit") if body_pr is not None else None
+        if autofit is not None and autofit.get("fontScale"):
+            font_scale = int(autofit.get("fontScale")) / 100000.0
+
+        left, top, width, height = box
+        inner_left = left + round(insets[0] * self.scale)
+        inner_width = width - round((insets[0] + insets[2]) * self.scale)
+        inner_top = top + round(insets[1] * self.scale)
+        inner_height = height - round((insets[1] + insets[3]) * self.scale)
+        px_per_point = self.scale * EMU_PER_POINT
+
+        draw = ImageDraw.Draw(canvas)
+        lines = []  # (text, font, color, alignment, line_height)
+        for paragraph in tx_body.iterfind(f"{A}p"):
+            text_parts = []
+            first_rpr = None
+            for child in paragraph:
+                name = _local(child.tag)
+                if name in ("r", "fld"):
+                    if first_rpr is None:
+                        first_rpr = child.find(f"{A}rPr")
+                    text_parts.append(child.findtext(f"{A}t") or "")
+                elif name == "br":
+                    text_parts.append("\n")
+            if first_rpr is None:
+                first_rpr = paragraph.find(f"{A}endParaRPr")
+            text = "".join(text_parts)
+
+            size_pt = default_size or DEFAULT_FONT_SIZE
+            bold = False
+            color = default_color or self._color_from_name("tx1", theme)
+            font_name = theme["fonts"]["minor"]
+            if first_rpr is not None:
+                if first_rpr.get("sz"):
+                    size_pt = int(first_rpr.get("sz")) / 100.0
+                bold = first_rpr.get("b") == "1"
+                solid = first_rpr.find(f"{A}solidFill")
+                if solid is not None:
+                    color = self._color(solid, theme) or color
+                latin = first_rpr.find(f"{A}latin")
+                if latin is not None and latin.get("typeface"):
+                    font_name = latin.get("typeface")
+            if font_name.startswith("+mj"):
+                font_name = theme["fonts"]["major"]
+            elif font_name.startswith("+mn"):
+                font_name = theme["fonts"]["minor"]
+
+            size_px = max(1, round(size_pt * font_scale * px_per_point))
+            font = _load_font(font_name, size_px, bold)
+            line_height = size_px * LINE_HEIGHT_RATIO
+
+            p_pr = paragraph.find(f"{A}pPr")
+            level = int(p_pr.get("lvl", "0")) if p_pr is not None else 0
+            p_prs = [p_pr] + [style.find(f"{A}lvl{level + 1}pPr") for style in list_styles]
+            p_prs = [elem for elem in p_prs if elem is not None]
+            alignment = next((elem.get("algn") for elem in p_prs if elem.get("algn")), "l")
+            bullet = self._bullet(p_prs)
+            if text and bullet:
+                text = f"{bullet} {text}"
+
+            for raw_line in text.split("\n") if text else [""]:
+                wrapped = (
+                    self._wrap(raw_line, inner_width, draw, font) if wrap else [raw_line]
+                )
+                for line in wrapped:
+                    lines.append((line, font, color, alignment, line_height))
+
+        if not any(line[0] for line in lines):
+            return
+
+        total_height = sum(line[4] for line in lines)
+        if anchor == "ctr":
+            y = inner_top + (inner_height - total_height) / 2
+        elif anchor == "b":
+            y = inner_top + inner_height - total_height
+        else:
+            y = inner_top
+
+        for text, font, color, alignment, line_height in lines:
+            if text:
+                line_width = draw.textlength(text, font=font)
+                if alignment == "ctr":
+                    x = inner_left + (inner_width - line_width) / 2
+                elif alignment == "r":
+                    x = inner_left + inner_width - line_width
+                else:
+                    x = inner_left
+                draw.text((x, y), text, fill=color, font=font)
+            y += line_height
+
+    @staticmethod
+    def _bullet(p_prs: List[Any]) -> Optional[str]:
+        """Bullet character of the nearest paragraph properties that set one."""
+        for p_pr in p_prs:
+            if p_pr.find(f"{A}buNone") is not None:
+                return None
+            bu_char = p_pr.find(f"{A}buChar")
+            if bu_char is not None:
+                return bu_char.get("char", "•")
+            if p_pr.find(f"{A}buAutoNum") is not None:
+                return None  # Numbering is not drawn
+        return None
+
+    def _color_from_name(self, name: str, theme: Dict[str, Any]) -> Color:
+        """Resolve a scheme color name such as tx1 through the master color map."""
+        rgb = theme["colors"].get(theme["color_map"].get(name, name), (0, 0, 0))
+        return (*rgb, 255)
+
+    @staticmethod
+    def _wrap(line: str, max_width: int, draw: Any, font: Any) -> List[str]:
+        """Word-wrap a line to a pixel width (mirrors ShapeData._wrap_text_line)."""
+        if not line or max_width <= 0 or draw.textlength(line, font=font) <= max_width:
+            return [line]
+        wrapped = []
+        current = ""
+        for word in line.split(" "):
+            candidate = current + (" " if current else "") + word
+            if draw.textlength(candidate, font=font) <= max_width or not current:
+                current = candidate
+            else:
+                wrapped.append(current)
+                current = word
+        if current:
+            wrapped.append(current)
+        return wrapped
+
+
+# Preset geometries drawn as polygons, as fractions of the shape box
+_POLYGONS = {
+    "triangle": [(0.5, 0), (1, 1), (0, 1)],
+    "rtTriangle": [(0, 0), (1, 1), (0, 1)],
+    "diamond": [(0.5, 0), (1, 0.5), (0.5, 1), (0, 0.5)],
+    "parallelogram": [(0.25, 0), (1, 0), (0.75, 1), (0, 1)],
+    "trapezoid": [(0.25, 0), (0.75, 0), (1, 1), (0, 1)],
+    "pentagon": [(0.5, 0), (1, 0.38), (0.81, 1), (0.19, 1), (0, 0.38)],
+    "hexagon": [(0.25, 0), (0.75, 0), (1, 0.5), (0.75, 1), (0.25, 1), (0, 0.5)],
+    "homePlate": [(0, 0), (0.8, 0), (1, 0.5), (0.8, 1), (0, 1)],
+    "chevron": [(0, 0), (0.8, 0), (1, 0.5), (0.8, 1), (0, 1), (0.2, 0.5)],
+    "rightArrow": [(0, 0.25), (0.7, 0.25), (0.7, 0), (1, 0.5), (0.7, 1), (0.7, 0.75), (0, 0.75)],
+    "leftArrow": [(1, 0.25), (0.3, 0.25), (0.3, 0), (0, 0.5), (0.3, 1), (0.3, 0.75), (1, 0.75)],
+}
@@ -8,6 +8,16 @@ slides, multiple numbered grid files are created automatically.
 
 The program outputs the names of all files created.
 
+Rendered slide images are cached per slide (keyed by a hash of the slide and
+everything it references), so regenerating grids after editing a few slides
+only re-renders those slides.
+
+Rendering:
+- soffice: Converts the deck to PDF with LibreOffice (accurate, slow)
+- native: Draws slides directly with Pillow (fast preview; charts, SmartArt
+  and effects are approximated)
+- auto: Uses soffice when installed, otherwise native [default]
+
 Output:
 - Single grid: {prefix}.jpg (if slides fit in one grid)
 - Multiple grids: {prefix}-1.jpg, {prefix}-2.jpg, etc.
@@ -19,7 +29,9 @@ Grid limits by column count:
 - 6 cols: max 42 slides per grid (6×7)
 
 Usage:
-    python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders]
+    python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders] [--no-cache]
+                        [--renderer auto|soffice|native] [--slides RANGES] [--skip-hidden]
+                        [--jobs N]
 
 Examples:
     python thumbnail.py presentation.pptx
@@ -38,21 +50,34 @@ Examples:
 
     python thumbnail.py template.pptx analysis --outline-placeholders
     # Creates thumbnail grids with red outlines around text placeholders
+
+    python thumbnail.py large-deck.pptx preview --renderer native
+    # Renders slides with Pillow instead of LibreOffice for a quick preview
+
+    python thumbnail.py deck.pptx section --slides 10-19,25
+    # Creates a grid of slides 10 through 19 and 25 only (zero-indexed)
 """
 
 import argparse
+import hashlib
+import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from inventory import extract_text_inventory
+from inventory import get_inventory_as_dict
+from inventory_cache import get_default_cache, get_default_image_cache
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from slide_renderer import SlideRenderer
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
+NATIVE_RENDER_WIDTH = 2 * THUMBNAIL_WIDTH  # Slide width for native rendering
 MAX_COLS = 6  # Maximum number of columns
 DEFAULT_COLS = 5  # Default number of columns
 JPEG_QUALITY = 95  # JPEG compression quality
@@ -86,6 +111,32 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not reuse or store cached slide images and text inventories",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=["auto", "soffice", "native"],
+        default="auto",
+        help="Slide renderer: LibreOffice, native Pillow preview, or auto (default: auto)",
+    )
+    parser.add_argument(
+        "--slides",
+        help="Zero-indexed slides to include, e.g. '0-9,12' (default: all slides)",
+    )
+    parser.add_argument(
+        "--skip-hidden",
+        action="store_true",
+        help="Leave hidden slides out of the grid instead of showing placeholders",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of grids to compose concurrently (default: 1)",
+    )
 
     args = parser.parse_args()
 
@@ -113,13 +164,25 @@ def main():
             if args.outline_placeholders:
                 print("Extracting placeholder regions...")
                 placeholder_regions, slide_dimensions = get_placeholder_regions(
-                    input_path
+                    input_path, use_cache=not args.no_cache
                 )
                 if placeholder_regions:
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
             # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
+            renderer = args.renderer
+            if renderer == "auto":
+                renderer = "soffice" if shutil.which("soffice") else "native"
+                if renderer == "native":
+                    print("LibreOffice not found, using native renderer")
+            slide_images, slide_numbers = get_slide_images(
+                input_path,
+                Path(temp_dir),
+                renderer,
+                slide_spec=args.slides,
+                skip_hidden=args.skip_hidden,
+                cache=None if args.no_cache else get_default_image_cache(),
+            )
             if not slide_images:
                 print("Error: No slides found")
                 sys.exit(1)
@@ -134,6 +197,8 @@ def main():
                 output_path,
                 placeholder_regions,
                 slide_dimensions,
+                slide_numbers,
+                jobs=max(1, args.jobs),
             )
 
             # Print saved files
@@ -156,7 +221,7 @@ def create_hidden_slide_placeholder(size):
     return img
 
 
-def get_placeholder_regions(pptx_path):
+def get_placeholder_regions(pptx_path, use_cache=True):
     """Extract ALL text regions from the presentation.
 
     Returns a tuple of (placeholder_regions, slide_dimensions).
@@ -165,7 +230,8 @@ def get_placeholder_regions(pptx_path):
     slide_dimensions is a tuple of (width_inches, height_inches).
     """
     prs = Presentation(str(pptx_path))
-    inventory = extract_text_inventory(pptx_path, prs)
+    cache = get_default_cache() if use_cache else None
+    inventory = get_inventory_as_dict(pptx_path, prs=prs, cache=cache)
     placeholder_regions = {}
 
     # Get actual slide dimensions in inches (EMU to inches conversion)
@@ -181,10 +247,10 @@ def get_placeholder_regions(pptx_path):
             # The inventory only contains shapes with text, so all shapes should be highlighted
             regions.append(
                 {
-                    "left": shape_data.left,
-                    "top": shape_data.top,
-                    "width": shape_data.width,
-                    "height": shape_data.height,
+                    "left": shape_data["left"],
+                    "top": shape_data["top"],
+                    "width": shape_data["width"],
+                    "height": shape_data["height"],
                 }
             )
 
@@ -194,24 +260,179 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
-    # Detect hidden slides
+def parse_slide_range(spec, total_slides):
+    """Parse a zero-indexed range spec such as '0-4,7,10-' into slide indices."""
+    if not spec:
+        return list(range(total_slides))
+
+    selected = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = part.split("-", 1)
+                first = int(first) if first else 0
+                last = int(last) if last else total_slides - 1
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid slide range: {part}")
+        if first >= total_slides:
+            raise ValueError(f"Slide {first} out of range (deck has {total_slides})")
+        if first < 0 or last < first:
+            raise ValueError(f"Invalid slide range: {part}")
+        selected.update(range(first, min(last, total_slides - 1) + 1))
+
+    return sorted(selected)
+
+
+def _hash_part_tree(part, hasher, digests):
+    """Hash a slide-level part plus the media, charts and theme it references."""
+    skipped = {RT.SLIDE, RT.SLIDE_LAYOUT, RT.SLIDE_MASTER, RT.NOTES_SLIDE}
+    parts = [part] + [
+        rel.target_part
+        for rel in part.rels.values()
+        if not rel.is_external and rel.reltype not in skipped
+    ]
+    for related in parts:
+        key = id(related)
+        if key not in digests:
+            digests[key] = hashlib.sha256(related.blob).hexdigest()
+        hasher.update(digests[key].encode())
+
+
+def slide_image_key(slide, slide_idx, render_settings, part_digests):
+    """Compute the content hash under which a slide's rendered image is cached.
+
+    Covers the slide, its layout and master, the parts they embed (pictures,
+    charts, theme), and the renderer settings. Slide numbers rendered through
+    fields depend on position, so the index is included for those slides.
+    """
+    layout = slide.slide_layout
+    hasher = hashlib.sha256(render_settings.encode())
+    for source in (slide, layout, layout.slide_master):
+        _hash_part_tree(source.part, hasher, part_digests)
+    if b'type="slidenum"' in slide.part.blob:
+        hasher.update(f"slide:{slide_idx}".encode())
+    return hasher.hexdigest()
+
+
+def _slide_renderer_digest():
+    """Hash of the native renderer source, so cached renders expire when it changes."""
+    return hashlib.sha256(
+        (Path(__file__).parent / "slide_renderer.py").read_bytes()
+    ).hexdigest()[:16]
+
+
+def get_slide_images(
+    pptx_path, temp_dir, renderer, slide_spec=None, skip_hidden=False, cache=None
+):
+    """Render the selected slides, reusing cached images where possible.
+
+    Returns a tuple of (image_paths, slide_numbers) where slide_numbers are the
+    zero-indexed slide numbers of each image. Hidden slides are never rendered;
+    they become placeholders, or are left out entirely with skip_hidden.
+    """
     print("Analyzing presentation...")
     prs = Presentation(str(pptx_path))
-    total_slides = len(prs.slides)
+    slides = list(prs.slides)
+    total_slides = len(slides)
+    selected = parse_slide_range(slide_spec, total_slides)
 
-    # Find hidden slides (1-based indexing for display)
     hidden_slides = {
-        idx + 1
-        for idx, slide in enumerate(prs.slides)
-        if slide.element.get("show") == "0"
+        idx for idx, slide in enumerate(slides) if slide.element.get("show") == "0"
     }
 
     print(f"Total slides: {total_slides}")
     if hidden_slides:
-        print(f"Hidden slides: {sorted(hidden_slides)}")
+        # 1-based for display, matching the slide sorter in PowerPoint
+        print(f"Hidden slides: {sorted(idx + 1 for idx in hidden_slides)}")
+    if slide_spec:
+        print(f"Selected slides: {len(selected)}")
+    if skip_hidden:
+        selected = [idx for idx in selected if idx not in hidden_slides]
+
+    slide_width = prs.slide_width or 9144000
+    slide_height = prs.slide_height or 5143500
+    if renderer == "native":
+        render_settings = f"native:{NATIVE_RENDER_WIDTH}:{_slide_renderer_digest()}"
+        image_width = NATIVE_RENDER_WIDTH
+    else:
+        render_settings = f"soffice:{CONVERSION_DPI}"
+        image_width = round(slide_width / 914400 * CONVERSION_DPI)
+    image_size = (image_width, max(1, round(image_width * slide_height / slide_width)))
+
+    # Look up cached renders for visible slides
+    images = {}
+    keys = {}
+    part_digests = {}
+    to_render = []
+    for idx in selected:
+        if idx in hidden_slides:
+            continue
+        if cache is not None:
+            keys[idx] = slide_image_key(slides[idx], idx, render_settings, part_digests)
+            data = cache.get_bytes(keys[idx])
+            if data is not None:
+                image_path = temp_dir / f"cached-{idx + 1:03d}.jpg"
+                image_path.write_bytes(data)
+                images[idx] = image_path
+                continue
+        to_render.append(idx)
+
+    if cache is not None and cache.hits:
+        print(f"Reused cached images for {cache.hits} slide(s)")
+
+    if to_render:
+        if renderer == "native":
+            rendered = render_native_images(prs, temp_dir, NATIVE_RENDER_WIDTH, to_render)
+        else:
+            # The PDF export leaves out hidden slides, so map to visible page numbers
+            visible = [idx for idx in range(total_slides) if idx not in hidden_slides]
+            page_numbers = {idx: visible.index(idx) + 1 for idx in to_render}
+            rendered = convert_to_images(pptx_path, temp_dir, CONVERSION_DPI, page_numbers)
+        for idx, image_path in rendered.items():
+            images[idx] = image_path
+            if cache is not None:
+                cache.put_bytes(keys[idx], image_path.read_bytes())
+
+    # Assemble in slide order, with placeholders for hidden slides
+    image_paths = []
+    slide_numbers = []
+    for idx in selected:
+        if idx in hidden_slides:
+            placeholder_path = temp_dir / f"hidden-{idx + 1:03d}.jpg"
+            create_hidden_slide_placeholder(image_size).save(placeholder_path, "JPEG")
+            image_paths.append(placeholder_path)
+        elif idx in images:
+            image_paths.append(images[idx])
+        else:
+            continue
+        slide_numbers.append(idx)
+
+    return image_paths, slide_numbers
+
+
+def _contiguous_runs(numbers):
+    """Group sorted integers into (first, last) runs."""
+    runs = []
+    for number in sorted(numbers):
+        if runs and number == runs[-1][1] + 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    return [tuple(run) for run in runs]
+
+
+def convert_to_images(pptx_path, temp_dir, dpi, page_numbers):
+    """Convert selected slides to images via PDF.
 
+    page_numbers maps slide indices to 1-based page numbers in the exported
+    PDF. Only those pages are rasterized. Returns a dict of slide index to
+    image path.
+    """
     pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
 
     # Convert to PDF
@@ -232,43 +453,54 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if result.returncode != 0 or not pdf_path.exists():
         raise RuntimeError("PDF conversion failed")
 
-    # Convert PDF to images
-    print(f"Converting to images at {dpi} DPI...")
-    result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError("Image conversion failed")
-
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
+    # Convert only the requested page ranges to images
+    print(f"Converting {len(page_numbers)} page(s) to images at {dpi} DPI...")
+    page_images = {}
+    for run_idx, (first, last) in enumerate(_contiguous_runs(page_numbers.values())):
+        prefix = temp_dir / f"slide-run{run_idx}"
+        result = subprocess.run(
+            [
+                "pdftoppm",
+                "-jpeg",
+                "-r",
+                str(dpi),
+                "-f",
+                str(first),
+                "-l",
+                str(last),
+                str(pdf_path),
+                str(prefix),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("Image conversion failed")
+        run_images = sorted(temp_dir.glob(f"{prefix.name}-*.jpg"))
+        for page, image_path in zip(range(first, last + 1), run_images):
+            page_images[page] = image_path
+
+    return {
+        idx: page_images[page]
+        for idx, page in page_numbers.items()
+        if page in page_images
+    }
 
-    # Create full list with placeholders for hidden slides
-    all_images = []
-    visible_idx = 0
 
-    # Get placeholder dimensions from first visible slide
-    if visible_images:
-        with Image.open(visible_images[0]) as img:
-            placeholder_size = img.size
-    else:
-        placeholder_size = (1920, 1080)
-
-    for slide_num in range(1, total_slides + 1):
-        if slide_num in hidden_slides:
-            # Create placeholder image for hidden slide
-            placeholder_path = temp_dir / f"hidden-{slide_num:03d}.jpg"
-            placeholder_img = create_hidden_slide_placeholder(placeholder_size)
-            placeholder_img.save(placeholder_path, "JPEG")
-            all_images.append(placeholder_path)
-        else:
-            # Use the actual visible slide image
-            if visible_idx < len(visible_images):
-                all_images.append(visible_images[visible_idx])
-                visible_idx += 1
+def render_native_images(prs, temp_dir, width, slide_indices):
+    """Render selected slides directly with Pillow.
 
-    return all_images
+    Returns a dict of slide index to image path.
+    """
+    print(f"Rendering {len(slide_indices)} slide(s) natively at {width}px width...")
+    renderer = SlideRenderer(prs, width)
+    slides = prs.slides
+    images = {}
+    for idx in slide_indices:
+        image_path = temp_dir / f"slide-{idx + 1:03d}.jpg"
+        renderer.render(slides[idx]).save(image_path, "JPEG", quality=JPEG_QUALITY)
+        images[idx] = image_path
+    return images
 
 
 def create_grids(
@@ -278,27 +510,31 @@ def create_grids(
     output_path,
     placeholder_regions=None,
     slide_dimensions=None,
+    slide_numbers=None,
+    jobs=1,
 ):
-    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid."""
+    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid.
+
+    Each grid is composed tile by tile from images decoded at thumbnail size,
+    so memory use depends on the grid size rather than the number of slides or
+    the conversion resolution. With jobs > 1, grids are built concurrently.
+    """
+    if slide_numbers is None:
+        slide_numbers = list(range(len(image_paths)))
+
     # Maximum images per grid is cols × (cols + 1) for better proportions
     max_images_per_grid = cols * (cols + 1)
-    grid_files = []
 
     print(
         f"Creating grids with {cols} columns (max {max_images_per_grid} images per grid)"
     )
 
     # Split images into chunks
+    chunks = []
     for chunk_idx, start_idx in enumerate(
         range(0, len(image_paths), max_images_per_grid)
     ):
         end_idx = min(start_idx + max_images_per_grid, len(image_paths))
-        chunk_images = image_paths[start_idx:end_idx]
-
-        # Create grid for this chunk
-        grid = create_grid(
-            chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
-        )
 
         # Generate output filename
         if len(image_paths) <= max_images_per_grid:
@@ -310,12 +546,92 @@ def create_grids(
             suffix = output_path.suffix
             grid_filename = output_path.parent / f"{stem}-{chunk_idx + 1}{suffix}"
 
+        chunks.append((start_idx, end_idx, grid_filename))
+
+    def build_grid(chunk):
+        start_idx, end_idx, grid_filename = chunk
+        grid = create_grid(
+            image_paths[start_idx:end_idx],
+            cols,
+            width,
+            start_idx,
+            placeholder_regions,
+            slide_dimensions,
+            slide_numbers[start_idx:end_idx],
+        )
+
         # Save grid
         grid_filename.parent.mkdir(parents=True, exist_ok=True)
         grid.save(str(grid_filename), quality=JPEG_QUALITY)
-        grid_files.append(str(grid_filename))
+        return str(grid_filename)
+
+    if jobs > 1 and len(chunks) > 1:
+        # Pillow releases the GIL while decoding, resizing and encoding
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(build_grid, chunks))
+    return [build_grid(chunk) for chunk in chunks]
+
 
-    return grid_files
+def load_thumbnail(img_path, width, height, regions=None, slide_dimensions=None):
+    """Decode a slide image directly at thumbnail size, with optional outlines."""
+    with Image.open(img_path) as img:
+        # Get original dimensions before decoding (read from the header)
+        orig_w, orig_h = img.size
+
+        # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 while decoding
+        img.draft("RGB", (width, height))
+        img.load()
+        decoded_w, decoded_h = img.size
+
+        # Apply placeholder outlines if enabled
+        if regions:
+            # Convert to RGBA for transparency support
+            img = img.convert("RGBA")
+
+            # Calculate scale factors using actual slide dimensions
+            if slide_dimensions:
+                slide_width_inches, slide_height_inches = slide_dimensions
+            else:
+                # Fallback: estimate from image size at CONVERSION_DPI
+                slide_width_inches = orig_w / CONVERSION_DPI
+                slide_height_inches = orig_h / CONVERSION_DPI
+
+            x_scale = decoded_w / slide_width_inches
+            y_scale = decoded_h / slide_height_inches
+
+            # Thicker proportional stroke width, relative to the full-size image
+            stroke_width = max(
+                1, round(max(5, min(orig_w, orig_h) // 150) * decoded_w / orig_w)
+            )
+
+            # Create a highlight overlay
+            overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
+            overlay_draw = ImageDraw.Draw(overlay)
+
+            # Highlight each placeholder region
+            for region in regions:
+                # Convert from inches to pixels in the decoded image
+                px_left = int(region["left"] * x_scale)
+                px_top = int(region["top"] * y_scale)
+                px_width = int(region["width"] * x_scale)
+                px_height = int(region["height"] * y_scale)
+
+                # Draw highlight outline with red color and thick stroke
+                overlay_draw.rectangle(
+                    [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+                    outline=(255, 0, 0, 255),  # Bright red, fully opaque
+                    width=stroke_width,
+                )
+
+            # Composite the overlay onto the image using alpha blending
+            img = Image.alpha_composite(img, overlay)
+
+        # Convert to RGB for pasting into the JPEG grid
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        img.thumbnail((width, height), Image.Resampling.LANCZOS)
+        return img
 
 
 def create_grid(
@@ -325,12 +641,16 @@ def create_grid(
     start_slide_num=0,
     placeholder_regions=None,
     slide_dimensions=None,
+    slide_numbers=None,
 ):
     """Create thumbnail grid from slide images with optional placeholder outlining."""
+    if slide_numbers is None:
+        slide_numbers = [start_slide_num + i for i in range(len(image_paths))]
+
     font_size = int(width * FONT_SIZE_RATIO)
     label_padding = int(font_size * LABEL_PADDING_RATIO)
 
-    # Get dimensions
+    # Get dimensions (only the header is read)
     with Image.open(image_paths[0]) as img:
         aspect = img.height / img.width
     height = int(width * aspect)
@@ -352,7 +672,7 @@ def create_grid(
         # Fall back to basic default font if size parameter not supported
         font = ImageFont.load_default()
 
-    # Place thumbnails
+    # Place thumbnails one tile at a time
     for i, img_path in enumerate(image_paths):
         row, col = i // cols, i % cols
         x = col * width + (col + 1) * GRID_PADDING
@@ -361,7 +681,8 @@ def create_grid(
         )
 
         # Add label with actual slide number
-        label = f"{start_slide_num + i}"
+        slide_num = slide_numbers[i]
+        label = f"{slide_num}"
         bbox = draw.textbbox((0, 0), label, font=font)
         text_w = bbox[2] - bbox[0]
         draw.text(
@@ -374,74 +695,24 @@ def create_grid(
         # Add thumbnail below label with proportional spacing
         y_thumbnail = y_base + label_padding + font_size + label_padding
 
-        with Image.open(img_path) as img:
-            # Get original dimensions before thumbnail
-            orig_w, orig_h = img.size
-
-            # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
-                # Convert to RGBA for transparency support
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get the regions for this slide
-                regions = placeholder_regions[start_slide_num + i]
-
-                # Calculate scale factors using actual slide dimensions
-                if slide_dimensions:
-                    slide_width_inches, slide_height_inches = slide_dimensions
-                else:
-                    # Fallback: estimate from image size at CONVERSION_DPI
-                    slide_width_inches = orig_w / CONVERSION_DPI
-                    slide_height_inches = orig_h / CONVERSION_DPI
-
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
-
-                # Create a highlight overlay
-                overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
-                # Highlight each placeholder region
-                for region in regions:
-                    # Convert from inches to pixels in the original image
-                    px_left = int(region["left"] * x_scale)
-                    px_top = int(region["top"] * y_scale)
-                    px_width = int(region["width"] * x_scale)
-                    px_height = int(region["height"] * y_scale)
-
-                    # Draw highlight outline with red color and thick stroke
-                    # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
-                    overlay_draw.rectangle(
-                        [(px_left, px_top), (px_left + px_width, px_top + px_height)],
-                        outline=(255, 0, 0, 255),  # Bright red, fully opaque
-                        width=stroke_width,
-                    )
-
-                # Composite the overlay onto the image using alpha blending
-                img = Image.alpha_composite(img, overlay)
-                # Convert back to RGB for JPEG saving
-                img = img.convert("RGB")
-
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            w, h = img.size
-            tx = x + (width - w) // 2
-            ty = y_thumbnail + (height - h) // 2
-            grid.paste(img, (tx, ty))
-
-            # Add border
-            if BORDER_WIDTH > 0:
-                draw.rectangle(
-                    [
-                        (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
-                        (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
-                    ],
-                    outline="gray",
-                    width=BORDER_WIDTH,
-                )
+        regions = placeholder_regions.get(slide_num) if placeholder_regions else None
+        img = load_thumbnail(img_path, width, height, regions, slide_dimensions)
+        w, h = img.size
+        tx = x + (width - w) // 2
+        ty = y_thumbnail + (height - h) // 2
+        grid.paste(img, (tx, ty))
+        img.close()
+
+        # Add border
+        if BORDER_WIDTH > 0:
+            draw.rectangle(
+                [
+                    (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
+                    (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
+                ],
+                outline="gray",
+                width=BORDER_WIDTH,
+            )
 
     return grid
 
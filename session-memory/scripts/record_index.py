@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+记录索引
+基于 SQLite FTS5 的增量全文索引，供 search_records.py 使用
+
+每次搜索前只重新读取修改时间或大小变化过的记录文件，已删除的记录同时从索引中移除。
+索引使用 trigram 分词器，可以按子串查找（不区分大小写），中文不需要分词。
+索引只负责筛选候选记录并按相关度排序，候选记录由调用方用与扫描相同的子串匹配
+再确认一次，所以有无索引的搜索结果一致：
+
+- 3 个字符以上的关键词用 MATCH 查找，可以计算相关度和摘要
+- 更短的关键词用 LIKE 在索引内容中查找（LIKE 只忽略 ASCII 字母的大小写，
+  含其他有大小写字符的短关键词不参与筛选）
+"""
+
+import binascii
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+# 索引结构变化时递增，旧索引会被重建
+INDEX_VERSION = 2
+
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+# 文件名权重高于正文
+_RANK = "bm25(records_fts, 5.0, 1.0)"
+_SNIPPET = "snippet(records_fts, 1, '[', ']', '…', 16)"
+
+
+def parse_query(query: str) -> List[str]:
+    """拆分查询：双引号括起的部分为短语，其余按空白分隔，所有词都必须出现"""
+    terms = []
+    for phrase, word in _TERM.findall(query):
+        term = (phrase or word).strip()
+        if term:
+            terms.append(term)
+    return terms
+
+
+def _foldable(term: str) -> bool:
+    """大小写转换不改变长度的关键词（ß→SS 之类的字符 trigram 无法匹配）"""
+    return all(len(char.lower()) == 1 and len(char.upper()) == 1 for char in term)
+
+
+def _match_expression(terms: List[str]) -> Optional[str]:
+    """3 个字符以上的关键词组成的 MATCH 表达式，没有时返回 None"""
+    phrases = ['"' + term.replace('"', '""') + '"' for term in terms if len(term) >= 3 and _foldable(term)]
+    return " AND ".join(phrases) if phrases else None
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def default_index_path(records_dir: Path) -> Path:
+    """索引文件默认放在缓存目录，每个记录目录一个"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    key = binascii.crc32(str(records_dir.resolve()).encode("utf-8"))
+    return Path(cache_home) / "session-memory" / f"index-v{INDEX_VERSION}-{key:08x}.sqlite"
+
+
+def fts5_available() -> bool:
+    """当前 SQLite 是否支持 FTS5 的 trigram 分词器（SQLite 3.34 起）"""
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+class RecordIndex:
+    """记录目录的全文索引"""
+
+    def __init__(self, records_dir: Path, index_path: Path = None):
+        self.records_dir = Path(records_dir)
+        self.index_path = Path(index_path) if index_path else default_index_path(self.records_dir)
+        self._conn = None
+        # 最近一次 sync() 中新增、更新、删除和未变的记录数
+        self.counts = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.index_path), timeout=30)
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS records (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(name, body, tokenize='trigram');
+            """)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def rebuild(self) -> Dict[str, Tuple[int, int]]:
+        """删除索引后重新建立"""
+        self.close()
+        if self.index_path.exists():
+            self.index_path.unlink()
+        return self.sync()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """记录目录中的 {文件名: (mtime_ns, size)}"""
+        files = {}
+        try:
+            entries = os.scandir(self.records_dir)
+        except OSError:
+            return files
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(".md") and not entry.name.startswith(".") and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def sync(self) -> Dict[str, Tuple[int, int]]:
+        """只为新增、修改过和已删除的记录更新索引
+
+        返回扫描到的 {文件名: (mtime_ns, size)}，各类记录数保存在 self.counts。
+        """
+        conn = self._connect()
+        files = self._scan()
+        indexed = {name: (row_id, mtime_ns, size)
+                   for row_id, name, mtime_ns, size in conn.execute("SELECT id, name, mtime_ns, size FROM records")}
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        with conn:
+            for name, (row_id, _, _) in indexed.items():
+                if name not in files:
+                    conn.execute("DELETE FROM records_fts WHERE rowid = ?", (row_id,))
+                    conn.execute("DELETE FROM records WHERE id = ?", (row_id,))
+                    counts["removed"] += 1
+
+            for name, (mtime_ns, size) in files.items():
+                old = indexed.get(name)
+                if old and old[1:] == (mtime_ns, size):
+                    counts["unchanged"] += 1
+                    continue
+                try:
+                    body = (self.records_dir / name).read_text(encoding="utf-8", errors="replace")
+                except OSError:
+                    continue  # 扫描后被删除，下次同步时处理
+                if old:
+                    row_id = old[0]
+                    conn.execute("DELETE FROM records_fts WHERE rowid = ?", (row_id,))
+                    conn.execute("UPDATE records SET mtime_ns = ?, size = ? WHERE id = ?", (mtime_ns, size, row_id))
+                    counts["updated"] += 1
+                else:
+                    row_id = conn.execute("INSERT INTO records (name, mtime_ns, size) VALUES (?, ?, ?)",
+                                          (name, mtime_ns, size)).lastrowid
+                    counts["added"] += 1
+                conn.execute("INSERT INTO records_fts (rowid, name, body) VALUES (?, ?, ?)",
+                             (row_id, name, body))
+        self.counts = counts
+        return files
+
+    def candidates(self, terms: List[str]) -> Iterator[Dict[str, Any]]:
+        """可能包含全部关键词的记录，按相关度排序（没有可用 MATCH 的关键词时按修改时间）
+
+        每项包含 id、name 和 score（越大越相关，没有时为 None）。
+        结果可能多于真正匹配的记录，需要调用方确认。
+        """
+        match = _match_expression(terms)
+        conditions = []
+        params = []
+        for term in terms:
+            if _foldable(term) and len(term) < 3 and all(char.isascii() or char.lower() == char.upper() for char in term):
+                conditions.append("records_fts.body LIKE ? ESCAPE '\\'")
+                params.append(_like_pattern(term))
+
+        if match:
+            rank = _RANK
+            conditions.insert(0, "records_fts MATCH ?")
+            params.insert(0, match)
+            order = f"{_RANK}, records.mtime_ns DESC"
+        else:
+            rank = "NULL"
+            order = "records.mtime_ns DESC"
+        sql = (f"SELECT records.id, records.name, {rank} "
+               f"FROM records_fts JOIN records ON records.id = records_fts.rowid "
+               f"WHERE {' AND '.join(conditions) or '1'} ORDER BY {order}")
+
+        for row_id, name, rank in self._connect().execute(sql, params):
+            yield {"id": row_id, "name": name, "score": None if rank is None else -rank}
+
+    def snippet(self, terms: List[str], row_id: int) -> Optional[str]:
+        """记录中关键词附近的摘要，关键词都短于 3 个字符时返回 None"""
+        match = _match_expression(terms)
+        if not match:
+            return None
+        row = self._connect().execute(
+            f"SELECT {_SNIPPET} FROM records_fts WHERE records_fts MATCH ? AND rowid = ?", (match, row_id)).fetchone()
+        return " ".join(row[0].split()) if row else None
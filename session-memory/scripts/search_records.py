@@ -4,24 +4,160 @@
 搜索历史会话记录
 """
 
+import mmap
 import os
 import re
+import sqlite3
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import List, Dict, Any
 
+from record_index import RecordIndex, fts5_available, parse_query
+
+# 关键词扫描时并发读取的文件数
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+# 每个扫描任务最多处理的文件数，减少线程池的调度开销
+SCAN_CHUNK = 8
+# 匹配行前后各显示的行数
+CONTEXT_LINES = 2
+
+
+def _folded_pattern(term: str) -> bytes:
+    """term 的 UTF-8 字节正则，用于匹配 ASCII 字母已转为小写的内容
+
+    非 ASCII 的有大小写字符（如 É/é）同时匹配大写和小写形式。
+    """
+    parts = []
+    for char in term:
+        if char.isascii():
+            parts.append(re.escape(char.lower().encode("utf-8")))
+            continue
+        variants = sorted({char, char.lower(), char.upper()})
+        if len(variants) == 1:
+            parts.append(re.escape(char.encode("utf-8")))
+        else:
+            parts.append(b"(?:" + b"|".join(re.escape(v.encode("utf-8")) for v in variants) + b")")
+    return b"".join(parts)
+
+
+class KeywordScanner:
+    """在内存映射的记录文件中查找关键词（不区分大小写），只解码匹配行及其上下文
+
+    带大小写标志的正则在字节上很慢，所以关键词含 ASCII 字母时先用 bytes.lower()
+    转换一次内容（长度不变，匹配位置与原文一致），再用普通字节正则查找；
+    不含 ASCII 字母的关键词（如中文）直接在映射的文件上查找，不复制内容。
+    """
+
+    def __init__(self, terms: List[str]):
+        self.patterns = [re.compile(_folded_pattern(term)) for term in terms]
+        # 匹配包含任一关键词的整行，匹配位置即行的起止
+        any_term = b"|".join(pattern.pattern for pattern in self.patterns)
+        self.any_line = re.compile(b"(?m)^.*?(?:" + any_term + b").*$") if terms else None
+        self.fold = any(char.isascii() and char.lower() != char.upper() for term in terms for char in term)
+
+    def scan(self, path: str, require_all: bool = True) -> List[Dict[str, Any]]:
+        """文件中包含任一关键词的行；require_all 时缺少任一关键词即返回空列表"""
+        if self.any_line is None:
+            return []
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []  # 空文件无法映射
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                folded = data[:].lower() if self.fold else data
+                if require_all and not all(pattern.search(folded) for pattern in self.patterns):
+                    return []
+                return self._matches(data, folded)
+
+    def _matches(self, data, folded) -> List[Dict[str, Any]]:
+        crlf = data.find(b"\r\n") != -1
+        matches = []
+        cluster = []  # 上下文相连的匹配行 (行号, 起, 止)
+        line_num = 1
+        counted = 0  # 已统计换行符的位置
+        for match in self.any_line.finditer(folded):
+            start, end = match.span()
+            line_num += data[counted:start].count(b"\n")
+            counted = start
+            if cluster and line_num - cluster[-1][0] > 2 * CONTEXT_LINES + 1:
+                self._decode_cluster(data, cluster, crlf, matches)
+                cluster = []
+            cluster.append((line_num, start, end))
+        if cluster:
+            self._decode_cluster(data, cluster, crlf, matches)
+        return matches
+
+    @staticmethod
+    def _decode_cluster(data, cluster, crlf, matches):
+        """解码一组匹配行及其上下文（前后各 CONTEXT_LINES 行），每个字节只解码一次"""
+        first_line, start, _ = cluster[0]
+        end = cluster[-1][2]
+        size = len(data)
+        before = 0
+        while before < CONTEXT_LINES and start > 0:
+            start = data.rfind(b"\n", 0, start - 1) + 1
+            before += 1
+        for _ in range(CONTEXT_LINES):
+            if end >= size:
+                break
+            end = data.find(b"\n", end + 1)
+            if end == -1:
+                end = size
+
+        text = data[start:end].decode("utf-8", errors="replace")
+        if crlf:
+            # 片段止于换行符之前，末尾可能留下 \r
+            text = text.replace("\r\n", "\n").rstrip("\r")
+        lines = text.split("\n")
+        for line_num, _, _ in cluster:
+            i = before + line_num - first_line
+            matches.append({
+                "line_num": line_num,
+                "line": lines[i].strip(),
+                "context": lines[max(0, i - CONTEXT_LINES):i + CONTEXT_LINES + 1]
+            })
+
 
 class RecordSearcher:
     """搜索会话记录"""
 
-    def __init__(self, records_dir: str = None):
+    def __init__(self, records_dir: str = None, index_path: str = None):
         if records_dir is None:
             records_dir = Path.home() / "Downloads" / "claude记录"
         else:
             records_dir = Path(records_dir)
 
         self.records_dir = records_dir
+        # 全文索引文件，默认放在 ~/.cache/session-memory/
+        self.index_path = Path(index_path) if index_path else None
+
+    def _record_info(self, file_path: Path, mtime: float, size: int) -> Dict[str, Any]:
+        """记录文件的基本信息"""
+        # 解析文件名
+        name = file_path.stem  # 去掉 .md
+        parts = name.split("-")
+
+        record = {
+            "path": str(file_path),
+            "name": file_path.name,
+            "mtime": mtime,
+            "size": size,
+            "date_str": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
+        }
+
+        # 尝试解析日期和项目名
+        if len(parts) >= 3:
+            try:
+                record["date"] = f"{parts[0]}-{parts[1]}-{parts[2]}"
+                record["project"] = parts[3] if len(parts) > 3 else "unknown"
+            except ValueError:
+                record["date"] = "unknown"
+                record["project"] = "unknown"
+
+        return record
 
     def list_records(self) -> List[Dict[str, Any]]:
         """列出所有记录文件"""
@@ -29,68 +165,114 @@ class RecordSearcher:
             return []
 
         records = []
-        for file_path in self.records_dir.glob("*.md"):
-            stat = file_path.stat()
-
-            # 解析文件名
-            name = file_path.stem  # 去掉 .md
-            parts = name.split("-")
-
-            record = {
-                "path": str(file_path),
-                "name": file_path.name,
-                "mtime": stat.st_mtime,
-                "size": stat.st_size,
-                "date_str": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
-            }
-
-            # 尝试解析日期和项目名
-            if len(parts) >= 3:
-                try:
-                    record["date"] = f"{parts[0]}-{parts[1]}-{parts[2]}"
-                    record["project"] = parts[3] if len(parts) > 3 else "unknown"
-                except ValueError:
-                    record["date"] = "unknown"
-                    record["project"] = "unknown"
+        with os.scandir(self.records_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".md") and not entry.name.startswith(".") and entry.is_file():
+                    stat = entry.stat()
+                    records.append(self._record_info(Path(entry.path), stat.st_mtime, stat.st_size))
+        return sorted(records, key=lambda x: x["mtime"], reverse=True)
 
-            records.append(record)
+    def sync_index(self, rebuild: bool = False) -> Dict[str, int]:
+        """更新全文索引（rebuild 时重新建立），返回新增、更新、删除和未变的记录数"""
+        with RecordIndex(self.records_dir, self.index_path) as index:
+            if rebuild:
+                index.rebuild()
+            else:
+                index.sync()
+            return index.counts
 
-        return sorted(records, key=lambda x: x["mtime"], reverse=True)
+    def search_by_keyword(self, keyword: str, limit: int = None, use_index: bool = True) -> List[Dict[str, Any]]:
+        """按关键词搜索记录内容（子串匹配，不区分大小写）
 
-    def search_by_keyword(self, keyword: str) -> List[Dict[str, Any]]:
-        """按关键词搜索记录内容"""
+        支持 FTS5 trigram 时使用增量更新的全文索引，按相关度排序并附带摘要；
+        否则（或 use_index 为 False 时）逐个扫描记录文件，按修改时间排序。
+        两种方式找到的记录相同。多个词时要求全部出现，双引号括起的部分作为短语。
+        """
+        if use_index and fts5_available():
+            try:
+                return self._search_index(keyword, limit)
+            except (sqlite3.Error, OSError) as e:
+                print(f"Warning: 索引不可用，改为逐个扫描: {e}", file=sys.stderr)
+        return self._search_scan(keyword, limit)
+
+    def _search_index(self, keyword: str, limit: int = None) -> List[Dict[str, Any]]:
+        """使用全文索引筛选候选记录，再用扫描确认"""
+        terms = parse_query(keyword)
+        if not terms:
+            return []
+        scanner = KeywordScanner(terms)
         results = []
-        keyword_lower = keyword.lower()
+        with RecordIndex(self.records_dir, self.index_path) as index:
+            files = index.sync()
+            for hit in index.candidates(terms):
+                file_path = self.records_dir / hit["name"]
+                try:
+                    matches = scanner.scan(str(file_path))
+                except OSError:
+                    continue  # 同步后被删除
+                if not matches:
+                    continue  # 索引的候选多于真正匹配的记录
+                mtime_ns, size = files[hit["name"]]
+                record = self._record_info(file_path, mtime_ns / 1e9, size)
+                record["score"] = hit["score"]
+                record["snippet"] = index.snippet(terms, hit["id"]) or matches[0]["line"]
+                record["matches"] = matches
+                results.append(record)
+                if limit and len(results) >= limit:
+                    break
+        return results
 
-        for record in self.list_records():
-            try:
-                content = Path(record["path"]).read_text(encoding="utf-8")
-
-                # 搜索关键词
-                if keyword_lower in content.lower():
-                    # 提取匹配行上下文
-                    lines = content.split("\n")
-                    matches = []
-
-                    for i, line in enumerate(lines):
-                        if keyword_lower in line.lower():
-                            # 获取上下文（前后各 2 行）
-                            start = max(0, i - 2)
-                            end = min(len(lines), i + 3)
-                            context = lines[start:end]
-                            matches.append({
-                                "line_num": i + 1,
-                                "line": line.strip(),
-                                "context": context
-                            })
-
-                    if matches:
+    def iter_keyword_matches(self, keyword: str):
+        """按修改时间顺序逐个产生包含全部关键词的记录
+
+        文件在线程池中并发扫描，结果仍按顺序产生；调用方取够所需数量后停止迭代，
+        尚未开始的扫描会被取消，不必等整个目录读完。
+        """
+        terms = parse_query(keyword)
+        if not terms:
+            return
+        scanner = KeywordScanner(terms)
+        records = iter(self.list_records())
+        executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+
+        def scan_chunk(chunk):
+            results = []
+            for record in chunk:
+                try:
+                    results.append((record, scanner.scan(record["path"])))
+                except Exception as e:
+                    results.append((record, e))
+            return results
+
+        def submit_next():
+            # 任务从单个文件开始逐步加大，尽早得到最前面的结果
+            chunk = list(islice(records, chunk_size[0]))
+            chunk_size[0] = min(chunk_size[0] * 2, SCAN_CHUNK)
+            if chunk:
+                pending.append(executor.submit(scan_chunk, chunk))
+
+        # 只提前提交有限数量的任务，提前停止时不会有大量任务排队
+        chunk_size = [1]
+        pending = deque()
+        for _ in range(SCAN_WORKERS):
+            submit_next()
+        try:
+            while pending:
+                for record, matches in pending.popleft().result():
+                    if isinstance(matches, Exception):
+                        print(f"Warning: Failed to read {record['path']}: {matches}", file=sys.stderr)
+                    elif matches:
                         record["matches"] = matches
-                        results.append(record)
-            except Exception as e:
-                print(f"Warning: Failed to read {record['path']}: {e}", file=sys.stderr)
+                        yield record
+                submit_next()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
 
-        return results
+    def _search_scan(self, keyword: str, limit: int = None) -> List[Dict[str, Any]]:
+        """逐个扫描记录文件搜索"""
+        return list(islice(self.iter_keyword_matches(keyword), limit))
 
     def search_by_date(self, date: str) -> List[Dict[str, Any]]:
         """按日期搜索记录"""
@@ -137,6 +319,11 @@ class RecordSearcher:
             lines.append(f"   路径: {record['path']}")
             lines.append(f"   修改时间: {record['date_str']}")
 
+            if record.get("score") is not None:
+                lines.append(f"   相关度: {record['score']:.3g}")
+            if "snippet" in record:
+                lines.append(f"   摘要: {record['snippet']}")
+
             if "matches" in record and show_content:
                 lines.append(f"   匹配数: {len(record['matches'])}")
                 lines.append("   匹配内容:")
@@ -175,10 +362,24 @@ def main():
     parser.add_argument("--load", help="加载指定记录的内容")
     parser.add_argument("--records-dir", help="记录目录路径")
     parser.add_argument("--show-content", "-c", action="store_true", help="显示匹配内容")
+    parser.add_argument("--limit", "-n", type=int, default=0, help="关键词搜索最多返回的记录数 (默认 0，表示不限)")
+    parser.add_argument("--no-index", action="store_true", help="不使用全文索引，逐个扫描记录文件")
+    parser.add_argument("--reindex", action="store_true", help="重新建立全文索引")
+    parser.add_argument("--index-path", help="全文索引文件路径")
 
     args = parser.parse_args()
 
-    searcher = RecordSearcher(records_dir=args.records_dir)
+    searcher = RecordSearcher(records_dir=args.records_dir, index_path=args.index_path)
+
+    # 重建索引
+    if args.reindex:
+        if not fts5_available():
+            print("错误: 当前 SQLite 不支持 FTS5，无法建立索引", file=sys.stderr)
+            sys.exit(1)
+        counts = searcher.sync_index(rebuild=True)
+        print(f"索引已重建: {counts['added']} 条记录", file=sys.stderr)
+        if not (args.keyword or args.date or args.project or args.list or args.load):
+            return
 
     # 加载记录
     if args.load:
@@ -200,7 +401,8 @@ def main():
     results = []
 
     if args.keyword:
-        results = searcher.search_by_keyword(args.keyword)
+        results = searcher.search_by_keyword(args.keyword, limit=args.limit or None,
+                                             use_index=not args.no_index)
     elif args.date:
         results = searcher.search_by_date(args.date)
     elif args.project:
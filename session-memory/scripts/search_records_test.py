@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from record_index import fts5_available
+from search_records import RecordSearcher
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+@unittest.skipUnless(fts5_available(), "SQLite has no FTS5 trigram tokenizer")
+class TestIndexMatchesScan(unittest.TestCase):
+
+    QUERIES = [
+        "x", "est", "fix", "Test", "内存优化", "内存", "é", "ÉCOLE", "straße",
+        '"foo bar"', '"bar foo"', "ab 数据", "50%", "a_b", "内存 fix", "zzz-not-there",
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.records_dir = Path(self.tmp.name) / "records"
+        self.records_dir.mkdir()
+        self.index_path = Path(self.tmp.name) / "index.sqlite"
+
+        rng = random.Random(42)
+        words = ["fix", "testing", "内存优化", "内存 优化", "École", "STRASSE", "foo bar",
+                 "ab", "数据", "50%", "a_b", "axb", "x", "Test", "\n", "\r\n", "内存\n优化"]
+        for i in range(60):
+            body = " ".join(rng.choice(words) for _ in range(rng.randint(0, 20)))
+            self.write(f"2026-01-{i % 28 + 1:02d}-proj{i % 5}-{i:04x}.md", body)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, body):
+        (self.records_dir / name).write_text(body, encoding="utf-8", newline="")
+
+    def names(self, query, use_index):
+        searcher = RecordSearcher(str(self.records_dir), index_path=str(self.index_path))
+        return {record["name"] for record in searcher.search_by_keyword(query, use_index=use_index)}
+
+    def assert_same_results(self):
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                self.assertEqual(self.names(query, True), self.names(query, False))
+
+    def test_index_and_scan_return_the_same_records(self):
+        self.assert_same_results()
+
+    def test_same_records_after_incremental_update(self):
+        self.names("x", True)  # 建立索引
+        self.write("2026-02-01-new-0001.md", "fix straße 内存优化 foo bar")
+        os.remove(next(self.records_dir.glob("*proj0*.md")))
+        self.assert_same_results()
+
+    def test_cjk_phrase_is_a_substring(self):
+        self.write("2026-02-02-gap-0002.md", "内存 优化")
+        self.assertNotIn("2026-02-02-gap-0002.md", self.names("内存优化", True))
+
+    def test_limit_keeps_matching_records(self):
+        searcher = RecordSearcher(str(self.records_dir), index_path=str(self.index_path))
+        results = searcher.search_by_keyword("x", limit=3)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(record["matches"] for record in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - tokenizer cost and BM25 query latency as the corpus grows
+Usage: python benchmark.py [--rows 1500 10000 100000] [--queries 200]
+
+Synthetic corpora are built by sampling rows of the bundled CSVs, so term
+statistics stay close to the real data at any size.
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+
+from core import CSV_CONFIG, DATA_DIR, MAX_RESULTS as MAX_K, BM25, Tokenizer, s_stem, _load_csv
+
+
+def load_documents():
+    """Search-column documents of every domain CSV"""
+    documents = []
+    for config in CSV_CONFIG.values():
+        filepath = os.path.join(DATA_DIR, config["file"])
+        if os.path.exists(filepath):
+            for row in _load_csv(filepath):
+                documents.append(" ".join(str(row.get(col, "")) for col in config["search_cols"]))
+    return documents
+
+
+def synthetic_corpus(documents, rows, rng):
+    """rows documents, each mixing words of two real documents"""
+    words = [doc.split() for doc in documents]
+    corpus = []
+    for _ in range(rows):
+        a, b = rng.choice(words), rng.choice(words)
+        corpus.append(" ".join(a[: len(a) // 2] + b[len(b) // 2:]))
+    return corpus
+
+
+def legacy_tokenize(text):
+    """The tokenizer before CJK segmentation and stop words, for comparison"""
+    text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+    return [w for w in text.split() if len(w) > 2]
+
+
+def time_tokenizers(documents, queries):
+    """Microseconds per document, per query and per CJK query of each tokenizer"""
+    tokenizers = {"legacy": legacy_tokenize, "default": Tokenizer(), "stemmed": Tokenizer(stemmer=s_stem)}
+    cjk_queries = ["仪表盘 深色模式", "电商 奢侈品 极简风格", "SaaS 仪表盘 dark mode", "ダッシュボード"]
+
+    def per_call(tokenize, texts):
+        start = time.perf_counter()
+        for text in texts:
+            tokenize(text)
+        return (time.perf_counter() - start) / len(texts) * 1e6
+
+    print(f"{'tokenizer':<10} {'doc (us)':>9} {'query (us)':>11} {'CJK query (us)':>15}")
+    for name, tokenize in tokenizers.items():
+        print(f"{name:<10} {per_call(tokenize, documents):>9.1f} {per_call(tokenize, queries):>11.1f} "
+              f"{per_call(tokenize, cjk_queries * 50):>15.1f}")
+    print()
+
+
+def time_queries(fn, queries):
+    """Mean latency in milliseconds"""
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UI Pro Max BM25 benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1500, 10000, 100000], help="Corpus sizes")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per corpus size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    documents = load_documents()
+    vocabulary = sorted({w for doc in documents for w in BM25().tokenize(doc)})
+    queries = [" ".join(rng.sample(vocabulary, rng.randint(1, 4))) for _ in range(args.queries)]
+
+    time_tokenizers(documents, queries)
+
+    try:
+        import numpy  # noqa: F401
+        has_numpy = True
+    except ImportError:
+        has_numpy = False
+
+    print(f"{'rows':>8} {'fit (s)':>8} {'full sort (ms)':>14} {'top-k (ms)':>11} {'numpy (ms)':>11}")
+    for rows in args.rows:
+        corpus = synthetic_corpus(documents, rows, rng)
+        bm25 = BM25()
+        start = time.perf_counter()
+        bm25.fit(corpus)
+        fit_seconds = time.perf_counter() - start
+
+        full = time_queries(lambda q: bm25.score(q)[:MAX_K], queries)
+        top_k = time_queries(lambda q: bm25.top_k(q, MAX_K), queries)
+        vectorized = "n/a"
+        if has_numpy:
+            bm25.top_k(queries[0], MAX_K, vectorized=True)  # build the matrix columns
+            vectorized = f"{time_queries(lambda q: bm25.top_k(q, MAX_K, vectorized=True), queries):.2f}"
+        print(f"{rows:>8} {fit_seconds:>8.2f} {full:>14.2f} {top_k:>11.2f} {vectorized:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Startup Benchmark - cold-start latency of search.py
+Usage: python benchmark_startup.py [--runs 20] [--target-ms 50] [--imports]
+
+Each command runs in a fresh interpreter (with the index snapshot and the
+scripts' bytecode already built), so the timings include interpreter
+startup, imports, loading the snapshot and the search itself. Exits with status 1 if a search is slower
+than the target. --imports also lists the slowest imports of a search.
+"""
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from core import build_snapshot
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SEARCH = os.path.join(SCRIPTS_DIR, "search.py")
+
+COMMANDS = {
+    "domain search": [SEARCH, "glassmorphism", "--domain", "style"],
+    "stack search": [SEARCH, "form validation", "--stack", "react"],
+    "design system": [SEARCH, "saas dashboard", "--design-system"],
+}
+
+
+def time_command(args, runs, env):
+    """Median wall-clock milliseconds of running args with Python"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, stdout=subprocess.DEVNULL, env=env, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def slowest_imports(args, env, count=10):
+    """(cumulative microseconds, module) of the slowest top-level imports"""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            imports.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UI Pro Max startup benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="Runs per command")
+    parser.add_argument("--target-ms", type=float, default=50, help="Cold-start target for a search")
+    parser.add_argument("--imports", action="store_true", help="List the slowest imports of a domain search")
+    args = parser.parse_args()
+
+    build_snapshot()
+    # As for an installed package, even with PYTHONDONTWRITEBYTECODE set
+    compileall.compile_dir(SCRIPTS_DIR, maxlevels=0, quiet=1)
+    # Searches must not be answered by a running daemon
+    env = dict(os.environ, UI_UX_PRO_MAX_SOCKET=os.devnull + ".no-daemon")
+
+    baseline = time_command(["-c", "pass"], args.runs, env)
+    print(f"{'command':<16} {'median (ms)':>12}")
+    print(f"{'python -c pass':<16} {baseline:>12.1f}")
+    too_slow = []
+    for name, command in COMMANDS.items():
+        elapsed = time_command(command, args.runs, env)
+        print(f"{name:<16} {elapsed:>12.1f}")
+        if name != "design system" and elapsed > args.target_ms:
+            too_slow.append(name)
+
+    if args.imports:
+        print("\nSlowest imports (domain search):")
+        for micros, module in slowest_imports(COMMANDS["domain search"], env):
+            print(f"{micros / 1000:>8.1f} ms  {module}")
+
+    if too_slow:
+        print(f"\nSlower than {args.target_ms:.0f} ms: {', '.join(too_slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
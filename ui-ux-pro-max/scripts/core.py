@@ -2,18 +2,45 @@
 # -*- coding: utf-8 -*-
 """
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
+
+Imported by every search, so module-level work is kept to a minimum:
+paths are plain strings (pathlib is slow to import), and csv and hashlib
+are only imported when an index has to be (re)built.
 """
 
-import csv
+import binascii
+import heapq
+import marshal
+import os
 import re
-from pathlib import Path
+import sys
 from math import log
 from collections import defaultdict
 
+from query_cache import QueryCache
+
 # ============ CONFIGURATION ============
-DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
 MAX_RESULTS = 3
 
+# Built indexes are persisted here and reused until the CSV changes
+CACHE_DIR = os.environ.get("UI_UX_PRO_MAX_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "ui-ux-pro-max"))
+# Bump when the index format changes so persisted indexes are rebuilt
+INDEX_VERSION = 4
+# All indexes in one file, read with a single read; the marshal format is
+# only guaranteed to be stable within a Python version
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, f"snapshot-v{INDEX_VERSION}-py{sys.version_info[0]}{sys.version_info[1]}.bin")
+# Score with NumPy (UI_UX_PRO_MAX_NUMPY=1) instead of pure Python
+USE_NUMPY = os.environ.get("UI_UX_PRO_MAX_NUMPY") == "1"
+# Stem English words (UI_UX_PRO_MAX_STEM=1), e.g. "buttons" -> "button"
+USE_STEMMING = os.environ.get("UI_UX_PRO_MAX_STEM") == "1"
+# Optional file of stop words (one per line) replacing the built-in list
+STOP_WORDS_FILE = os.environ.get("UI_UX_PRO_MAX_STOP_WORDS")
+# Results of recent searches are reused for this many seconds (0 disables)
+QUERY_CACHE_TTL = float(os.environ.get("UI_UX_PRO_MAX_QUERY_CACHE_TTL", 3600))
+# Most recently used searches kept in the query cache
+QUERY_CACHE_SIZE = int(os.environ.get("UI_UX_PRO_MAX_QUERY_CACHE_SIZE", 256))
+
 CSV_CONFIG = {
     "style": {
         "file": "styles.csv",
@@ -92,98 +119,395 @@ _STACK_COLS = {
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
+# ============ TOKENIZER ============
+# Han, Hiragana/Katakana and Hangul syllables: scripts written without spaces
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+# Compiling this class takes milliseconds, so it is left to re's pattern
+# cache and only compiled once text that is not ASCII is tokenized
+_CJK_RUN = f"[{_CJK}]+"
+_WORD_RE = re.compile(r"\w+")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+的 了 和 是 在 与 及 或 等
+""".split())
+
+
+def s_stem(word):
+    """Harman's S-stemmer: strip English plural endings only"""
+    if word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        return word[:-1]
+    if word.endswith("s") and not word.endswith(("us", "ss")):
+        return word[:-1]
+    return word
+
+
+class Tokenizer:
+    """Splits text into BM25 terms
+
+    Text is lowercased and split into runs of word characters. CJK runs,
+    which have no spaces between words, become overlapping character
+    bigrams ("仪表盘" -> "仪表", "表盘"). Words shorter than min_length and
+    stop words are dropped; stemmer, if given, is applied to the rest.
+    """
+
+    def __init__(self, min_length=2, stop_words=STOP_WORDS, stemmer=None):
+        self.min_length = min_length
+        self.stop_words = frozenset(stop_words)
+        self.stemmer = stemmer
+        self._stems = {}
+
+    def __call__(self, text):
+        # Term order does not matter to BM25, so words and CJK bigrams are collected separately
+        text = str(text).lower()
+        cjk_runs = ()
+        if not text.isascii():
+            cjk_runs = re.findall(_CJK_RUN, text)
+            if cjk_runs:
+                text = re.sub(_CJK_RUN, " ", text)
+        min_length, stop_words = self.min_length, self.stop_words
+        tokens = [w for w in _WORD_RE.findall(text) if len(w) >= min_length and w not in stop_words]
+        if self.stemmer is not None:
+            stems = self._stems
+            for i, word in enumerate(tokens):
+                stem = stems.get(word)
+                if stem is None:
+                    stem = stems[word] = self.stemmer(word)
+                tokens[i] = stem
+        for run in cjk_runs:
+            if len(run) > 1:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            elif run not in stop_words:
+                tokens.append(run)
+        return tokens
+
+    def signature(self):
+        """Settings that change the terms, for keying persisted indexes"""
+        stemmer = getattr(self.stemmer, "__name__", repr(self.stemmer))
+        return (self.min_length, sorted(self.stop_words), stemmer)
+
+
+def _default_tokenizer():
+    stop_words = STOP_WORDS
+    if STOP_WORDS_FILE:
+        with open(STOP_WORDS_FILE, encoding="utf-8") as f:
+            stop_words = [line.strip().lower() for line in f if line.strip()]
+    return Tokenizer(stop_words=stop_words, stemmer=s_stem if USE_STEMMING else None)
+
+
+TOKENIZER = _default_tokenizer()
+# Queries with the same terms share cached results, so each tokenizer
+# configuration has its own query cache directory
+QUERY_CACHE = QueryCache(
+    os.path.join(CACHE_DIR, f"queries-v{INDEX_VERSION}-{binascii.crc32(repr(TOKENIZER.signature()).encode()):08x}"),
+    QUERY_CACHE_TTL, QUERY_CACHE_SIZE,
+)
+
+
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search
+
+    Each term's postings list holds (document index, term frequency, weight),
+    where weight is the term's BM25 contribution to that document, so a query
+    only touches documents that contain one of its terms. Documents and
+    queries are split into terms by tokenizer (TOKENIZER by default).
+    """
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, tokenizer=None):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.tokenizer = tokenizer or TOKENIZER
+        self.postings = {}
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
         self.N = 0
+        self._columns = None
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Terms of text, as split by the tokenizer"""
+        return self.tokenizer(text)
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        corpus = [self.tokenize(doc) for doc in documents]
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
+        term_freqs = defaultdict(list)
+        for idx, doc in enumerate(corpus):
+            counts = defaultdict(int)
             for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+                counts[word] += 1
+            for word, tf in counts.items():
+                term_freqs[word].append((idx, tf))
+
+        for word, docs in term_freqs.items():
+            self.doc_freqs[word] = len(docs)
+            self.idf[word] = log((self.N - len(docs) + 0.5) / (len(docs) + 0.5) + 1)
+
+        for word, docs in term_freqs.items():
+            idf = self.idf[word]
+            postings = []
+            for idx, tf in docs:
+                doc_len = self.doc_lengths[idx]
+                numerator = tf * (self.k1 + 1)
+                denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
+                postings.append((idx, tf, idf * numerator / denominator))
+            self.postings[word] = postings
+
+    def _accumulate(self, query_tokens):
+        """Scores of the documents containing at least one query token"""
+        scores = {}
+        for token in query_tokens:
+            for idx, _, weight in self.postings.get(token, ()):
+                scores[idx] = scores.get(idx, 0) + weight
+        return scores
 
     def score(self, query):
         """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+        scores = self._accumulate(self.tokenize(query))
+        ranked = [(idx, scores.get(idx, 0)) for idx in range(self.N)]
+        return sorted(ranked, key=lambda x: x[1], reverse=True)
 
-            scores.append((idx, score))
+    def top_k(self, query, k, vectorized=False):
+        """Top k (index, score) pairs with score > 0, best first
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        Ties keep document order, as with score(). vectorized=True scores
+        with NumPy over a sparse doc-term matrix.
+        """
+        query_tokens = self.tokenize(query)
+        if vectorized:
+            return self._top_k_numpy(query_tokens, k)
+        scores = self._accumulate(query_tokens)
+        return heapq.nsmallest(k, scores.items(), key=lambda x: (-x[1], x[0]))
+
+    def _top_k_numpy(self, query_tokens, k):
+        import numpy as np
+
+        if self._columns is None:
+            # Column per term of the doc-term weight matrix (CSC layout)
+            self._columns = {
+                word: (
+                    np.fromiter((p[0] for p in postings), dtype=np.int64, count=len(postings)),
+                    np.fromiter((p[2] for p in postings), dtype=np.float64, count=len(postings)),
+                )
+                for word, postings in self.postings.items()
+            }
+        columns = [self._columns[t] for t in query_tokens if t in self._columns]
+        if not columns or k <= 0:
+            return []
+        indices = np.concatenate([c[0] for c in columns])
+        weights = np.concatenate([c[1] for c in columns])
+        scores = np.bincount(indices, weights=weights, minlength=self.N)
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            # Keep every candidate tied with the k-th best so ties resolve by index
+            kth = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[scores[candidates] >= kth]
+        order = np.lexsort((candidates, -scores[candidates]))[:k]
+        return [(int(candidates[i]), float(scores[candidates[i]])) for i in order]
+
+    def state(self):
+        """Fitted index as plain values that marshal can serialize"""
+        return (self.k1, self.b, self.N, self.avgdl, self.doc_lengths, self.idf, dict(self.doc_freqs), self.postings)
+
+    @classmethod
+    def from_state(cls, state, tokenizer=None):
+        """BM25 rebuilt from state(); tokenizer must be the one it was fitted with"""
+        k1, b, N, avgdl, doc_lengths, idf, doc_freqs, postings = state
+        bm25 = cls(k1, b, tokenizer)
+        bm25.N = N
+        bm25.avgdl = avgdl
+        bm25.doc_lengths = doc_lengths
+        bm25.idf = idf
+        bm25.doc_freqs = defaultdict(int, doc_freqs)
+        bm25.postings = postings
+        return bm25
+
+
+# ============ SEARCH INDEX ============
+class SearchIndex:
+    """BM25 index over one CSV file, with the output columns of each row"""
+
+    def __init__(self, bm25, rows, stamp, digest):
+        self.bm25 = bm25
+        self.rows = rows
+        self.stamp = stamp
+        self.digest = digest
+
+    @classmethod
+    def build(cls, filepath, search_cols, output_cols):
+        """Read the CSV and fit BM25 over its search columns"""
+        data = _load_csv(filepath)
+        documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+        bm25 = BM25()
+        bm25.fit(documents)
+        rows = [{col: row.get(col, "") for col in output_cols if col in row} for row in data]
+        return cls(bm25, rows, _file_stamp(filepath), _file_digest(filepath))
+
+    def search(self, query, max_results):
+        """Top results with score > 0"""
+        ranked = self.bm25.top_k(query, max_results, vectorized=USE_NUMPY)
+        return [dict(self.rows[idx]) for idx, _ in ranked]
+
+    def dumps(self):
+        """Serialized index for the snapshot"""
+        return marshal.dumps((self.stamp, self.digest, self.bm25.state(), self.rows))
+
+    @classmethod
+    def loads(cls, data):
+        """Index from dumps()"""
+        stamp, digest, state, rows = marshal.loads(data)
+        return cls(BM25.from_state(state), rows, stamp, digest)
+
+
+# Indexes built or loaded by this process, by (file, search columns, output columns)
+_INDEXES = {}
+# Snapshot contents (serialized index by snapshot key), read on first use;
+# each index is only deserialized when it is searched
+_SNAPSHOT = None
+
+
+def _file_stamp(filepath):
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _file_digest(filepath):
+    import hashlib
+    with open(filepath, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _snapshot_key(filepath, search_cols, output_cols):
+    # Documents are tokenized when the index is built, so the tokenizer settings are part of the key
+    return repr((os.path.realpath(filepath), list(search_cols), list(output_cols), TOKENIZER.signature()))
+
+
+def _read_snapshot():
+    try:
+        with open(SNAPSHOT_PATH, "rb") as f:
+            snapshot = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    return snapshot if isinstance(snapshot, dict) else {}
+
+
+def _load_snapshot_index(snapshot_key, filepath, stamp):
+    """Snapshot index if it was built from the current CSV contents, else None"""
+    global _SNAPSHOT
+    if _SNAPSHOT is None:
+        _SNAPSHOT = _read_snapshot()
+    data = _SNAPSHOT.get(snapshot_key)
+    if data is None:
+        return None
+    try:
+        index = SearchIndex.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if index.stamp == stamp:
+        return index
+    # Touched but possibly unchanged (e.g. checkout): compare contents
+    if index.digest == _file_digest(filepath):
+        index.stamp = stamp
+        _store_snapshot_index(snapshot_key, index)
+        return index
+    return None
+
+
+def _store_snapshot_index(snapshot_key, index):
+    """Add an index to the snapshot file, written atomically; a read-only cache
+    directory is not an error"""
+    global _SNAPSHOT
+    # Merge into the file as it is now, in case another process updated it
+    snapshot = _read_snapshot()
+    snapshot[snapshot_key] = index.dumps()
+    _SNAPSHOT = snapshot
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{SNAPSHOT_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(snapshot, f)
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except OSError:
+        pass
+
+
+def get_index(filepath, search_cols, output_cols):
+    """Index for a CSV, built once per process and persisted across processes"""
+    key = (filepath, tuple(search_cols), tuple(output_cols))
+    stamp = _file_stamp(filepath)
+    index = _INDEXES.get(key)
+    if index is not None and index.stamp == stamp:
+        return index
+
+    snapshot_key = _snapshot_key(filepath, search_cols, output_cols)
+    index = _load_snapshot_index(snapshot_key, filepath, stamp)
+    if index is None:
+        index = SearchIndex.build(filepath, search_cols, output_cols)
+        _store_snapshot_index(snapshot_key, index)
+    _INDEXES[key] = index
+    return index
+
+
+def build_snapshot():
+    """Build (or load) the index of every CSV, so all of them are in the snapshot"""
+    for config in CSV_CONFIG.values():
+        filepath = os.path.join(DATA_DIR, config["file"])
+        if os.path.exists(filepath):
+            get_index(filepath, config["search_cols"], config["output_cols"])
+    for config in STACK_CONFIG.values():
+        filepath = os.path.join(DATA_DIR, config["file"])
+        if os.path.exists(filepath):
+            get_index(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"])
 
 
 # ============ SEARCH FUNCTIONS ============
 def _load_csv(filepath):
     """Load CSV and return list of dicts"""
+    import csv
     with open(filepath, 'r', encoding='utf-8') as f:
         return list(csv.DictReader(f))
 
 
 def _search_csv(filepath, search_cols, output_cols, query, max_results):
     """Core search function using BM25"""
-    if not filepath.exists():
+    if not os.path.exists(filepath):
         return []
 
-    data = _load_csv(filepath)
+    return _search_cached([(filepath, search_cols, output_cols, query, max_results)])[0]
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+def _search_cached(searches):
+    """Results of (filepath, search_cols, output_cols, query, max_results) searches,
+    answered from the query cache where possible
 
-    # Get top results with score > 0
+    The cache saves loading an index; once an index is loaded in this process
+    (e.g. in the daemon or a batch), searching it is cheaper than the cache.
+    """
     results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
+    with QUERY_CACHE.transaction() as cache:
+        for filepath, search_cols, output_cols, query, max_results in searches:
+            stamp = _file_stamp(filepath)
+            index = _INDEXES.get((filepath, tuple(search_cols), tuple(output_cols)))
+            if index is not None and index.stamp == stamp:
+                results.append(index.search(query, max_results))
+                continue
+            # Queries with the same terms get the same results
+            key = repr((os.path.relpath(filepath, DATA_DIR), sorted(TOKENIZER(query)), max_results))
+            rows = cache.get(key, stamp)
+            if rows is None:
+                rows = get_index(filepath, search_cols, output_cols).search(query, max_results)
+                cache.put(key, stamp, rows)
+            results.append(rows)
     return results
 
 
@@ -211,24 +535,53 @@ def detect_domain(query):
 
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
-    if domain is None:
-        domain = detect_domain(query)
-
-    config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
-    filepath = DATA_DIR / config["file"]
-
-    if not filepath.exists():
-        return {"error": f"File not found: {filepath}", "domain": domain}
+    return search_batch([(query, domain, max_results)])[0]
+
+
+def search_batch(requests):
+    """Run many searches against the shared indexes in one pass
+
+    Args:
+        requests: Iterable of (query, domain, max_results) tuples; a domain
+            of None is auto-detected as in search()
+
+    Returns:
+        List with one result dict per request, as returned by search()
+    """
+    requests = [(query, domain if domain is not None else detect_domain(query), k) for query, domain, k in requests]
+
+    # Each distinct (domain, query) is scored once, for the largest k asked;
+    # the results for a smaller k are a prefix of that ranking
+    needed = defaultdict(dict)
+    for query, domain, k in requests:
+        queries = needed[domain]
+        queries[query] = max(queries.get(query, 0), k)
+
+    searches = []
+    for domain, queries in needed.items():
+        config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+        filepath = os.path.join(DATA_DIR, config["file"])
+        if not os.path.exists(filepath):
+            continue
+        for query, k in queries.items():
+            searches.append(((domain, query), (filepath, config["search_cols"], config["output_cols"], query, k)))
+    ranked = dict(zip((key for key, _ in searches), _search_cached([search for _, search in searches])))
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
-
-    return {
-        "domain": domain,
-        "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+    results = []
+    for query, domain, k in requests:
+        config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+        if (domain, query) not in ranked:
+            results.append({"error": f"File not found: {os.path.join(DATA_DIR, config['file'])}", "domain": domain})
+            continue
+        rows = [dict(row) for row in ranked[domain, query][:k]]
+        results.append({
+            "domain": domain,
+            "query": query,
+            "file": config["file"],
+            "count": len(rows),
+            "results": rows
+        })
+    return results
 
 
 def search_stack(query, stack, max_results=MAX_RESULTS):
@@ -236,9 +589,9 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if stack not in STACK_CONFIG:
         return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
 
-    filepath = DATA_DIR / STACK_CONFIG[stack]["file"]
+    filepath = os.path.join(DATA_DIR, STACK_CONFIG[stack]["file"])
 
-    if not filepath.exists():
+    if not os.path.exists(filepath):
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
     results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
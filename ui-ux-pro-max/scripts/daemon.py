@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Daemon - keeps search indexes warm between queries
+Usage: python search.py --serve [--socket PATH]    Serve on a Unix socket
+       python search.py --serve --stdio            Serve JSON lines on stdin/stdout
+
+Protocol: one JSON object per line in each direction.
+  Request:  {"id": 1, "method": "search", "params": {"query": "saas", "domain": "style"}}
+  Response: {"id": 1, "result": {...}}  or  {"id": 1, "error": "..."}
+
+Methods: search, search_batch, search_stack, generate_design_system,
+generate_design_systems (keyword arguments as in core.py / design_system.py).
+
+call() is the client side: it returns None when no daemon is listening, so
+callers can fall back to running the query in-process. It is imported by
+every search, so the socket and server modules are only imported when used.
+"""
+
+import os
+import sys
+
+# Unix sockets only exist on POSIX, where this matches tempfile.gettempdir()
+# for the usual setups without the cost of importing tempfile
+DEFAULT_SOCKET = os.environ.get(
+    "UI_UX_PRO_MAX_SOCKET",
+    os.path.join(
+        os.environ.get("TMPDIR") or os.environ.get("TEMP") or os.environ.get("TMP") or "/tmp",
+        f"ui-ux-pro-max-{os.getuid() if hasattr(os, 'getuid') else 0}.sock",
+    ),
+)
+# Seconds the client waits for a response before falling back
+CLIENT_TIMEOUT = 30
+
+
+# ============ SERVER ============
+def _methods():
+    """Method table; imported lazily so the client never loads the indexes"""
+    from core import search, search_batch, search_stack
+    from design_system import generate_design_system, generate_design_systems
+    return {
+        "search": search,
+        "search_batch": search_batch,
+        "search_stack": search_stack,
+        "generate_design_system": generate_design_system,
+        "generate_design_systems": generate_design_systems,
+    }
+
+
+def warm_up():
+    """Build (or load) every index before the first request"""
+    from core import build_snapshot
+    build_snapshot()
+
+
+def handle_request(line, methods):
+    """Answer one JSON request line; returns the response object"""
+    import json
+    try:
+        request = json.loads(line)
+    except ValueError as e:  # JSONDecodeError, or UnicodeDecodeError for socket bytes
+        return {"id": None, "error": f"Invalid JSON: {e}"}
+    if not isinstance(request, dict):
+        return {"id": None, "error": "Invalid request: expected a JSON object"}
+    request_id = request.get("id")
+    name = request.get("method")
+    params = request.get("params", {})
+    if not isinstance(name, str) or name not in methods:
+        return {"id": request_id, "error": f"Unknown method: {name}. Available: {', '.join(methods)}"}
+    if not isinstance(params, dict):
+        return {"id": request_id, "error": "Invalid params: expected a JSON object"}
+    try:
+        return {"id": request_id, "result": methods[name](**params)}
+    except Exception as e:
+        return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+
+
+def serve_stdio():
+    """Answer JSON lines from stdin on stdout until EOF"""
+    import json
+    methods = _methods()
+    warm_up()
+    for line in sys.stdin:
+        if line.strip():
+            response = handle_request(line, methods)
+            sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+
+def serve_socket(path=DEFAULT_SOCKET):
+    """Serve on a Unix socket until interrupted"""
+    import json
+    import signal
+    import socket
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if line.strip():
+                    response = handle_request(line, self.server.methods)
+                    self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if not hasattr(socket, "AF_UNIX"):
+        sys.exit("Error: Unix sockets are not available on this platform; use --stdio")
+    if os.path.exists(path):
+        if _connect(path) is not None:
+            sys.exit(f"Error: a daemon is already listening on {path}")
+        os.unlink(path)  # stale socket from a daemon that did not shut down cleanly
+
+    methods = _methods()
+    warm_up()
+    server = Server(path, Handler)
+    server.methods = methods
+    print(f"UI Pro Max daemon listening on {path}", file=sys.stderr)
+    # Shut down cleanly (removing the socket) on kill as well as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+# ============ CLIENT ============
+def _connect(path):
+    """Connected socket, or None if no daemon is listening"""
+    if not os.path.exists(path):
+        return None
+    import socket
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CLIENT_TIMEOUT)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def call(method, params, path=DEFAULT_SOCKET):
+    """Result of a request to the daemon, or None if it is not reachable
+
+    Errors reported by the daemon are raised as RuntimeError.
+    """
+    sock = _connect(path)
+    if sock is None:
+        return None
+    import json
+    try:
+        with sock, sock.makefile("rwb") as stream:
+            stream.write((json.dumps({"id": 1, "method": method, "params": params}) + "\n").encode("utf-8"))
+            stream.flush()
+            line = stream.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["result"]
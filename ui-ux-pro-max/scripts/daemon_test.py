@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from daemon import handle_request
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestHandleRequest(unittest.TestCase):
+
+    def setUp(self):
+        self.methods = {"echo": lambda **params: params}
+
+    def test_valid_request(self):
+        response = handle_request('{"id": 1, "method": "echo", "params": {"query": "saas"}}', self.methods)
+        self.assertEqual(response, {"id": 1, "result": {"query": "saas"}})
+
+    def test_malformed_requests_get_error_responses(self):
+        cases = {
+            "not json": None,
+            b"\xff\xfe": None,
+            "[1, 2]": None,
+            '"echo"': None,
+            "null": None,
+            '{"id": 2}': 2,
+            '{"id": 3, "method": [1]}': 3,
+            '{"id": 4, "method": {"a": 1}}': 4,
+            '{"id": 5, "method": "nope"}': 5,
+            '{"id": 6, "method": "echo", "params": [1]}': 6,
+            '{"id": 7, "method": "echo", "params": "x"}': 7,
+        }
+        for line, request_id in cases.items():
+            with self.subTest(line=line):
+                response = handle_request(line, self.methods)
+                self.assertEqual(response["id"], request_id)
+                self.assertIn("error", response)
+                self.assertNotIn("result", response)
+
+    def test_method_errors_are_reported(self):
+        response = handle_request('{"id": 8, "method": "echo", "params": {}}', {"echo": lambda: 1 / 0})
+        self.assertEqual(response["id"], 8)
+        self.assertIn("ZeroDivisionError", response["error"])
+
+    def test_stdio_server_survives_malformed_lines(self):
+        lines = ["[1, 2]", '{"id": 1, "method": [1]}', '{"id": 2, "method": "search", "params": {"query": "glass", "domain": "style", "max_results": 1}}']
+        result = subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, "search.py"), "--serve", "--stdio"],
+            input="\n".join(lines) + "\n", capture_output=True, text=True, timeout=120,
+        )
+        responses = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual(len(responses), 3, result.stderr)
+        self.assertIn("error", responses[0])
+        self.assertIn("error", responses[1])
+        self.assertIn("result", responses[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,9 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Many projects at once (searches for all briefs are batched)
+    results = generate_design_systems([{"query": "SaaS dashboard", "project_name": "My Project"}])
 """
 
 import csv
@@ -18,7 +21,7 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search_batch, DATA_DIR
 
 
 # ============ CONFIGURATION ============
@@ -42,24 +45,28 @@ class DesignSystemGenerator:
 
     def _load_reasoning(self) -> list:
         """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
+        filepath = os.path.join(DATA_DIR, REASONING_FILE)
+        if not os.path.exists(filepath):
             return []
         with open(filepath, 'r', encoding='utf-8') as f:
             return list(csv.DictReader(f))
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def _domain_requests(self, query: str, style_priority: list = None) -> list:
+        """(query, domain, max_results) for each domain in SEARCH_CONFIG."""
+        requests = []
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                requests.append((combined_query, domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                requests.append((query, domain, config["max_results"]))
+        return requests
+
+    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
+        """Execute searches across multiple domains."""
+        return dict(zip(SEARCH_CONFIG, search_batch(self._domain_requests(query, style_priority))))
 
     def _find_reasoning_rule(self, category: str) -> dict:
         """Find matching reasoning rule for a category."""
@@ -162,21 +169,41 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
+        return self.generate_batch([(query, project_name)])[0]
+
+    def generate_batch(self, briefs: list) -> list:
+        """Generate design systems for many (query, project_name) briefs.
+
+        The searches of all briefs are scored in two batches: product
+        searches first (they decide each brief's category), then all the
+        other domains.
+        """
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
-        product_results = product_result.get("results", [])
-        category = "General"
-        if product_results:
-            category = product_results[0].get("Product Type", "General")
+        product_results = search_batch([(query, "product", 1) for query, _ in briefs])
+        categories = []
+        for product_result in product_results:
+            results = product_result.get("results", [])
+            categories.append(results[0].get("Product Type", "General") if results else "General")
 
         # Step 2: Get reasoning rules for this category
-        reasoning = self._apply_reasoning(category, {})
-        style_priority = reasoning.get("style_priority", [])
+        reasonings = [self._apply_reasoning(category, {}) for category in categories]
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
-
+        requests = []
+        for (query, _), reasoning in zip(briefs, reasonings):
+            requests.extend(self._domain_requests(query, reasoning.get("style_priority", [])))
+        domain_results = search_batch(requests)
+
+        design_systems = []
+        for i, ((query, project_name), category, reasoning) in enumerate(zip(briefs, categories, reasonings)):
+            start = i * len(SEARCH_CONFIG)
+            search_results = dict(zip(SEARCH_CONFIG, domain_results[start:start + len(SEARCH_CONFIG)]))
+            search_results["product"] = product_results[i]  # Reuse product search
+            design_systems.append(self._build(query, project_name, category, reasoning, search_results))
+        return design_systems
+
+    def _build(self, query: str, project_name: str, category: str, reasoning: dict, search_results: dict) -> dict:
+        """Build the recommendation from a brief's search results."""
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
         color_results = self._extract_results(search_results.get("color", {}))
@@ -469,7 +496,7 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         project_name: Optional project name for output header
         output_format: "ascii" (default) or "markdown"
         persist: If True, save design system to design-system/ folder
-        page: Optional page name for page-specific override file
+        page: Optional page name (or list of page names) for page-specific override files
         output_dir: Optional output directory (defaults to current working directory)
 
     Returns:
@@ -487,6 +514,54 @@ def generate_design_system(query: str, project_name: str = None, output_format:
     return format_ascii_box(design_system)
 
 
+def generate_design_systems(briefs: list, output_format: str = "ascii",
+                            persist: bool = False, output_dir: str = None) -> list:
+    """
+    Generate one design system per project brief, batching the searches of all briefs.
+
+    Args:
+        briefs: List of dicts with "query" and optional "project_name" and "pages"
+        output_format: "ascii" (default) or "markdown"
+        persist: If True, save each design system to design-system/<project>/
+        output_dir: Optional output directory (defaults to current working directory)
+
+    Returns:
+        List of formatted design system strings, in brief order
+    """
+    generator = DesignSystemGenerator()
+    design_systems = generator.generate_batch([(b["query"], b.get("project_name")) for b in briefs])
+
+    outputs = []
+    for brief, design_system in zip(briefs, design_systems):
+        if persist:
+            persist_design_system(design_system, brief.get("pages"), output_dir, brief["query"])
+        outputs.append(format_markdown(design_system) if output_format == "markdown" else format_ascii_box(design_system))
+    return outputs
+
+
+def load_briefs(filepath: str) -> list:
+    """
+    Read project briefs from a file.
+
+    JSON lines ({"query": ..., "project_name": ..., "pages": [...]}) or one
+    plain-text query per line; blank lines and lines starting with # are skipped.
+    """
+    briefs = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if not line.startswith("{"):
+                briefs.append({"query": line})
+                continue
+            brief = json.loads(line)
+            if not brief.get("query"):
+                raise ValueError(f"{filepath}:{n}: brief has no query")
+            briefs.append(brief)
+    return briefs
+
+
 # ============ PERSISTENCE FUNCTIONS ============
 def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
     """
@@ -494,7 +569,7 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     
     Args:
         design_system: The generated design system dictionary
-        page: Optional page name for page-specific override file
+        page: Optional page name (or list of page names) for page-specific override files
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
     
@@ -524,10 +599,15 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         f.write(master_content)
     created_files.append(str(master_file))
     
-    # If page is specified, create page override file with intelligent content
-    if page:
+    # If pages are specified, create page override files with intelligent content
+    pages = [page] if isinstance(page, str) else list(page or [])
+    # The override searches of all pages are scored in one batch
+    requests = [r for p in pages for r in _override_requests(p, page_query)]
+    results = search_batch(requests)
+    for i, page in enumerate(pages):
         page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
+        page_searches = results[i * len(OVERRIDE_SEARCHES):(i + 1) * len(OVERRIDE_SEARCHES)]
+        page_content = format_page_override_md(design_system, page, page_query, page_searches)
         with open(page_file, 'w', encoding='utf-8') as f:
             f.write(page_content)
         created_files.append(str(page_file))
@@ -802,14 +882,15 @@ def format_master_md(design_system: dict) -> str:
     return "\n".join(lines)
 
 
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None,
+                            searches: list = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
     project = design_system.get("project_name", "PROJECT")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
     
     # Detect page type and generate intelligent overrides
-    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
+    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system, searches)
     
     lines = []
     
@@ -911,23 +992,33 @@ def format_page_override_md(design_system: dict, page_name: str, page_query: str
     return "\n".join(lines)
 
 
-def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
+# Domains and result counts searched for each page override
+OVERRIDE_SEARCHES = [("style", 1), ("ux", 3), ("landing", 1)]
+
+
+def _override_requests(page_name: str, page_query: str) -> list:
+    """(query, domain, max_results) searched for a page's overrides."""
+    combined_context = f"{page_name.lower()} {(page_query or '').lower()}"
+    return [(combined_context, domain, max_results) for domain, max_results in OVERRIDE_SEARCHES]
+
+
+def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict,
+                                    searches: list = None) -> dict:
     """
     Generate intelligent overrides based on page type using layered search.
     
     Uses the existing search infrastructure to find relevant style, UX, and layout
-    data instead of hardcoded page types.
+    data instead of hardcoded page types. `searches` are the results of
+    _override_requests() when they have already been run in a batch.
     """
-    from core import search
-    
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
     combined_context = f"{page_lower} {query_lower}"
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    if searches is None:
+        searches = search_batch(_override_requests(page_name, page_query))
+    style_search, ux_search, landing_search = searches
     
     # Extract results from search response
     style_results = style_search.get("results", [])
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Query Cache - recent search results shared across processes
+
+Each result is kept in its own small marshal file, so a repeated query is
+answered by reading one file instead of loading an index. Entries are keyed
+by the caller (core.py uses the CSV file, the sorted query tokens and the
+number of results) and store the mtime and size of the CSV they were
+computed from; an entry is ignored once the CSV changes or it is older than
+the TTL. A file's mtime records when it was last used; beyond max_entries
+the least recently used files are removed, down to 7/8 of max_entries so
+that eviction does not run on every insertion. Hit and miss
+counters are kept in a stats file, updated once per transaction.
+
+Processes and threads never share a temporary file, and every file is
+replaced atomically. Concurrent counter updates can be lost, which only
+makes the statistics approximate.
+"""
+
+import _thread  # threading takes milliseconds to import
+import binascii
+import marshal
+import os
+import time
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_ENTRIES = 256
+
+_COUNTERS = ("hits", "misses", "stale", "evictions")
+_STATS_FILE = "stats.bin"
+
+
+def _read_marshal(path):
+    try:
+        with open(path, "rb") as f:
+            return marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_marshal(path, value):
+    """Replace the file atomically; a read-only cache directory is not an error"""
+    try:
+        tmp_path = f"{path}.{os.getpid()}.{_thread.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(value, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+class QueryCache:
+    """LRU + TTL store of search results in a directory of marshal files"""
+
+    def __init__(self, directory, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, f"{binascii.crc32(key.encode()):08x}.bin")
+
+    def _entry_files(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [os.path.join(self.directory, n) for n in names if n.endswith(".bin") and n != _STATS_FILE]
+
+    def _read_stats(self):
+        stats = _read_marshal(os.path.join(self.directory, _STATS_FILE))
+        if not isinstance(stats, dict):
+            stats = {}
+        return {counter: stats.get(counter, 0) for counter in _COUNTERS}
+
+    def transaction(self):
+        """Context manager that counts lookups and saves the counters once at the end"""
+        return _Transaction(self)
+
+    def stats(self):
+        """Counters and size of the store"""
+        stats = self._read_stats()
+        lookups = stats["hits"] + stats["misses"]
+        files = self._entry_files()
+        stats.update({
+            "entries": len(files),
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "path": self.directory,
+            "bytes": sum(os.path.getsize(f) for f in files if os.path.exists(f)),
+        })
+        return stats
+
+
+class _Transaction:
+    def __init__(self, cache):
+        self.cache = cache
+        self.counts = dict.fromkeys(_COUNTERS, 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if any(self.counts.values()):
+            stats = self.cache._read_stats()
+            for counter, count in self.counts.items():
+                stats[counter] += count
+            _write_marshal(os.path.join(self.cache.directory, _STATS_FILE), stats)
+
+    def get(self, key, stamp):
+        """Cached value for key if it is fresh and was computed from stamp, else None"""
+        if not self.cache.enabled:
+            return None
+        path = self.cache._entry_path(key)
+        entry = _read_marshal(path)
+        if isinstance(entry, tuple) and len(entry) == 4 and entry[0] == key:
+            _, entry_stamp, created, value = entry
+            if entry_stamp == stamp and time.time() - created <= self.cache.ttl:
+                try:
+                    os.utime(path)  # most recently used
+                except OSError:
+                    pass
+                self.counts["hits"] += 1
+                return value
+            self.counts["stale"] += 1
+        self.counts["misses"] += 1
+        return None
+
+    def put(self, key, stamp, value):
+        """Store value, evicting the least recently used entries beyond max_entries"""
+        if not self.cache.enabled:
+            return
+        try:
+            os.makedirs(self.cache.directory, exist_ok=True)
+        except OSError:
+            return
+        _write_marshal(self.cache._entry_path(key), (key, stamp, time.time(), value))
+        files = self.cache._entry_files()
+        if len(files) > self.cache.max_entries:
+            by_use = []
+            for f in files:
+                try:
+                    by_use.append((os.path.getmtime(f), f))
+                except OSError:
+                    pass
+            by_use.sort()
+            keep = self.cache.max_entries - self.cache.max_entries // 8
+            for _, f in by_use[:len(by_use) - keep]:
+                try:
+                    os.unlink(f)
+                    self.counts["evictions"] += 1
+                except OSError:
+                    pass